@@ -1,9 +1,42 @@
-from . import collection, model, rdf, shared
-from .commands import update_format, update_rdf, validate
-from .io_ import (
-    get_resource_package_content,
-    load_raw_resource_description,
-    serialize_raw_resource_description,
-    serialize_raw_resource_description_to_dict,
-)
+import importlib
+import typing
+
 from .v import __version__
+
+if typing.TYPE_CHECKING:
+    from . import collection, commands, dataset, io_, model, rdf, shared
+    from .commands import avalidate, update_format, update_rdf, validate
+    from .io_ import (
+        aload_raw_resource_description,
+        get_resource_package_content,
+        load_raw_resource_description,
+        serialize_raw_resource_description,
+        serialize_raw_resource_description_to_dict,
+    )
+
+# submodules and their members are imported lazily on first access (PEP 562) to keep `import bioimageio.spec` cheap
+_LAZY_SUBMODULES = ("collection", "commands", "dataset", "io_", "model", "rdf", "shared")
+_LAZY_MEMBERS = {
+    "avalidate": "commands",
+    "update_format": "commands",
+    "update_rdf": "commands",
+    "validate": "commands",
+    "aload_raw_resource_description": "io_",
+    "get_resource_package_content": "io_",
+    "load_raw_resource_description": "io_",
+    "serialize_raw_resource_description": "io_",
+    "serialize_raw_resource_description_to_dict": "io_",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_MEMBERS:
+        return getattr(importlib.import_module(f".{_LAZY_MEMBERS[name]}", __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_MEMBERS))
@@ -6,9 +6,10 @@ from typing import Any, Callable, Dict, Optional, Union
 import typer
 
 from bioimageio.spec import __version__, collection, commands, model, rdf
+from bioimageio.spec.shared import ZipPath
 from bioimageio.spec.shared.raw_nodes import URI
 
-enrich_partial_rdf_with_imjoy_plugin: Optional[Callable[[Dict[str, Any], Union[URI, Path]], Dict[str, Any]]]
+enrich_partial_rdf_with_imjoy_plugin: Optional[Callable[[Dict[str, Any], Union[URI, Path, ZipPath]], Dict[str, Any]]]
 try:
     from bioimageio.spec.partner.utils import enrich_partial_rdf_with_imjoy_plugin
 except ImportError:
@@ -45,8 +46,11 @@ def validate(
         None, help="For collection RDFs only. Defaults to value of 'update-format'."
     ),
     verbose: bool = typer.Option(False, help="show traceback of unexpected (no ValidationError) exceptions"),
+    check_file_hashes: bool = typer.Option(
+        False, help="For model RDFs only. Check the declared SHA-256 digests of local weights and architecture files."
+    ),
 ):
-    summary = commands.validate(rdf_source, update_format, update_format_inner)
+    summary = commands.validate(rdf_source, update_format, update_format_inner, check_file_hashes=check_file_hashes)
     if summary["error"] is not None:
         print(f"Error in {summary['name']}:")
         pprint(summary["error"])
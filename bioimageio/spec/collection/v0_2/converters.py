@@ -1,11 +1,11 @@
-import copy
 from typing import Any, Dict
 
 from bioimageio.spec.rdf.v0_2.converters import maybe_convert as maybe_convert_rdf
+from bioimageio.spec.shared._copy_on_write import copy_child, copy_dict
 
 
 def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
-    data = copy.deepcopy(data)
+    data = copy_dict(data)
     if data.get("format_version") in ("0.2.0", "0.2.1"):
         # move all type groups to the 'collection' field
         if "collection" not in data:
@@ -13,11 +13,16 @@ def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
 
         for group in ["application", "model", "dataset", "notebook"]:
             if group in data:
-                data["collection"] += data[group]
-                data["collection"][-1]["type"] = group
+                collection = copy_child(data, "collection")
+                collection += data[group]
+                if isinstance(collection[-1], dict):
+                    collection[-1] = copy_dict(collection[-1])
+
+                collection[-1]["type"] = group
 
         config = data.get("config")
         if config and isinstance(config, dict):
+            config = data["config"] = copy_dict(config)
             id_ = config.pop("id", data.get("id"))
             if id_ is not None:
                 data["id"] = id_
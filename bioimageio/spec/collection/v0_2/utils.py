@@ -1,12 +1,14 @@
 import os
 import pathlib
 import warnings
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from marshmallow import missing
 from marshmallow.utils import _Missing
 
 from . import raw_nodes, schema
+from bioimageio.spec.shared import ZipPath, resolve_rdf_source
+from bioimageio.spec.shared._resolve_source import _map_concurrently
 from bioimageio.spec.shared.raw_nodes import ResourceDescription as RawResourceDescription
 
 
@@ -14,7 +16,7 @@ def filter_resource_description(raw_rd: raw_nodes.RDF_Base) -> raw_nodes.RDF_Bas
     return raw_rd
 
 
-def default_enrich_partial_rdf(partial_rdf: dict, root: Union[raw_nodes.URI, pathlib.Path]) -> dict:
+def default_enrich_partial_rdf(partial_rdf: dict, root: Union[raw_nodes.URI, pathlib.Path, ZipPath]) -> dict:
     return partial_rdf
 
 
@@ -22,7 +24,9 @@ def resolve_collection_entries(
     collection: raw_nodes.Collection,
     collection_id: Optional[str] = None,
     update_to_format: Optional[str] = None,
-    enrich_partial_rdf: Callable[[dict, Union[raw_nodes.URI, pathlib.Path]], dict] = default_enrich_partial_rdf,
+    enrich_partial_rdf: Callable[
+        [dict, Union[raw_nodes.URI, pathlib.Path, ZipPath]], dict
+    ] = default_enrich_partial_rdf,
 ) -> List[Tuple[Optional[RawResourceDescription], Optional[str]]]:
     """
 
@@ -53,6 +57,21 @@ def resolve_collection_entries(
     rdf_data_base = enrich_partial_rdf(rdf_data_base, collection.root_path)  # enrich the rdf base
 
     root_id = rdf_data_base.pop("id", None) if collection_id is None else collection_id
+
+    rdf_sources: List[Any] = []
+    for entry in collection.collection:  # type: ignore
+        rdf_source = entry.rdf_source
+        if isinstance(rdf_source, str) and not rdf_source.startswith("http") or isinstance(rdf_source, os.PathLike):
+            # a relative rdf_source path is relative to collection.root_path
+            rdf_sources.append(collection.root_path / pathlib.Path(rdf_source))
+        else:
+            rdf_sources.append(rdf_source)
+
+    # resolve (e.g. download) the rdf sources of all entries concurrently
+    resolved_rdf_sources = _map_concurrently(
+        lambda rdf_source: None if rdf_source is missing else resolve_rdf_source(rdf_source),
+        [(rdf_source,) for rdf_source in rdf_sources],
+    )
     for idx, entry in enumerate(collection.collection):  # type: ignore
         rdf_data = dict(rdf_data_base)
 
@@ -62,13 +81,10 @@ def resolve_collection_entries(
         # update rdf entry with entry's rdf_source
         sub_id: Union[str, _Missing] = missing
         if entry.rdf_source is not missing:
-            rdf_source = entry.rdf_source
-            if isinstance(rdf_source, str) and not rdf_source.startswith("http") or isinstance(rdf_source, os.PathLike):
-                # a relative rdf_source path is relative to collection.root_path
-                rdf_source = collection.root_path / pathlib.Path(rdf_source)
-
             try:
-                source_entry_rd = load_raw_resource_description(rdf_source)
+                resolved_rdf_source = resolved_rdf_sources[idx].result()
+                assert resolved_rdf_source is not None
+                source_entry_rd = load_raw_resource_description(resolved_rdf_source)
             except Exception as e:
                 entry_error = f"collection[{idx}]: {id_info}Invalid rdf_source: {e}"
             else:
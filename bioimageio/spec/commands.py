@@ -13,7 +13,8 @@ from .io_ import (
     save_raw_resource_description,
     serialize_raw_resource_description_to_dict,
 )
-from .shared import update_nested
+from .shared import ZipPath, update_nested
+from .shared._resolve_source import RDF_Source
 from .shared.common import ValidationSummary, ValidationWarning, nested_default_dict_as_nested_dict, yaml
 from .shared.raw_nodes import ResourceDescription as RawResourceDescription, URI
 from .v import __version__
@@ -30,11 +31,12 @@ def update_format(
 
 
 def validate(
-    rdf_source: Union[RawResourceDescription, dict, os.PathLike, IO, str, bytes],
+    rdf_source: Union[RawResourceDescription, RDF_Source, dict, os.PathLike, IO, str, bytes],
     update_format: bool = False,
     update_format_inner: Optional[bool] = None,
     verbose: bool = "deprecated",  # type: ignore
-    enrich_partial_rdf: Callable[[dict, Union[URI, Path]], dict] = default_enrich_partial_rdf,
+    enrich_partial_rdf: Callable[[dict, Union[URI, Path, ZipPath]], dict] = default_enrich_partial_rdf,
+    check_file_hashes: bool = False,
 ) -> ValidationSummary:
     """Validate a BioImage.IO Resource Description File (RDF).
 
@@ -45,6 +47,8 @@ def validate(
         verbose: deprecated
         enrich_partial_rdf: (optional) callable to customize RDF data on the fly.
                             Don't use this if you don't know exactly what to do with it.
+        check_file_hashes: (applicable to `models` only) check the declared `sha256` and `architecture_sha256` of
+                           local weights and architecture files (digests of unchanged files are memoized).
 
     Returns:
         A summary dict with keys:
@@ -90,7 +94,10 @@ def validate(
     if not error:
         with warnings.catch_warnings(record=True) as warnings2:
             try:
-                raw_rd = load_raw_resource_description(rdf_source, update_to_format="latest" if update_format else None)
+                # packaged resources are validated without extracting them
+                raw_rd = load_raw_resource_description(
+                    rdf_source, update_to_format="latest" if update_format else None, extract_package=False
+                )
             except ValidationError as e:
                 error = nested_default_dict_as_nested_dict(e.normalized_messages())
             except Exception as e:
@@ -101,6 +108,21 @@ def validate(
                 format_version = raw_rd.format_version
                 resource_type = "general" if raw_rd.type == "rdf" else raw_rd.type
 
+            if check_file_hashes and raw_rd is not None and raw_rd.type == "model":
+                from .model.utils import get_model_file_errors
+
+                file_errors = get_model_file_errors(raw_rd, include_remote=False)  # type: ignore
+                if file_errors:
+                    error = {
+                        "weights": {
+                            wf: {
+                                "sha256" if name == "source" else "architecture_sha256": msg
+                                for name, msg in wf_errors.items()
+                            }
+                            for wf, wf_errors in file_errors.items()
+                        }
+                    }
+
             if raw_rd is not None and raw_rd.type == "collection":
                 assert hasattr(raw_rd, "collection")
                 for idx, (entry_rdf, entry_error) in enumerate(resolve_collection_entries(raw_rd, enrich_partial_rdf=enrich_partial_rdf)):  # type: ignore
@@ -145,6 +167,37 @@ def validate(
     }
 
 
+async def avalidate(
+    rdf_source: Union[RawResourceDescription, RDF_Source, dict, os.PathLike, IO, str, bytes],
+    update_format: bool = False,
+    update_format_inner: Optional[bool] = None,
+    verbose: bool = "deprecated",  # type: ignore
+    enrich_partial_rdf: Callable[[dict, Union[URI, Path, ZipPath]], dict] = default_enrich_partial_rdf,
+    check_file_hashes: bool = False,
+) -> ValidationSummary:
+    """async variant of `validate`.
+    A remote RDF is fetched without blocking the event loop, the fetched RDF is then validated with `validate`
+    in the default executor.
+    """
+    from .shared._async import _run_blocking, aresolve_rdf_source
+
+    if not isinstance(rdf_source, RawResourceDescription):
+        try:
+            rdf_source = await aresolve_rdf_source(rdf_source)
+        except Exception:
+            pass  # `validate` reports the error
+
+    return await _run_blocking(
+        validate,
+        rdf_source,
+        update_format=update_format,
+        update_format_inner=update_format_inner,
+        verbose=verbose,
+        enrich_partial_rdf=enrich_partial_rdf,
+        check_file_hashes=check_file_hashes,
+    )
+
+
 def update_rdf(
     source: Union[RawResourceDescription, dict, os.PathLike, IO, str, bytes],
     update: Union[RawResourceDescription, dict, os.PathLike, IO, str, bytes],
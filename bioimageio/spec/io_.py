@@ -2,28 +2,42 @@
 (in form of a dict, e.g. from yaml.load('rdf.yaml') to a raw_nodes.ResourceDescription raw node,
 which is a python dataclass
 """
+import copy
+import hashlib
+import json
 import os
 import pathlib
 import warnings
+import weakref
 import zipfile
-from hashlib import sha256
 from io import StringIO
-from tempfile import TemporaryDirectory
 from types import ModuleType
-from typing import Dict, IO, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Hashable, IO, Iterable, Optional, Sequence, Set, Tuple, Union
 
 from marshmallow import ValidationError, missing
 from packaging.version import Version
 
-from bioimageio.spec.shared import RDF_NAMES, raw_nodes, resolve_rdf_source, resolve_rdf_source_and_type, resolve_source
+from bioimageio.spec.shared import (
+    RDF_NAMES,
+    CachePolicy,
+    _cache,
+    _raw_rd_cache,
+    ZipPath,
+    raw_nodes,
+    resolve_rdf_source,
+    resolve_rdf_source_and_type,
+    resolve_source,
+)
+from bioimageio.spec.shared._memo import LRUMemo, MemoInfo
+from bioimageio.spec.shared._raw_rd_cache import RecordedWarnings
+from bioimageio.spec.shared._resolve_source import RDF_Source, _download_remote_package, _is_path, _open_remote_package
+from bioimageio.spec.shared._zip_path import extract_lazily, hold_lazily_extracted_package
 from bioimageio.spec.shared.common import (
-    BIOIMAGEIO_CACHE_PATH,
-    BIOIMAGEIO_USE_CACHE,
-    get_class_name_from_type,
+    BIOIMAGEIO_RD_MEMO_SIZE,
     get_format_version_module,
     get_latest_format_version,
     get_latest_format_version_module,
-    no_cache_tmp_list,
+    get_schema,
     yaml,
 )
 from bioimageio.spec.shared.node_transformer import (
@@ -44,6 +58,10 @@ except ImportError:
 
 LATEST = "latest"
 
+# raw resource descriptions loaded by `load_raw_resource_description` (and their warnings, re-emitted for memo hits)
+# keyed by the digest of their content, the requested format version and their root
+_rd_memo: "LRUMemo[Hashable, Tuple[RawResourceDescription, RecordedWarnings]]" = LRUMemo(BIOIMAGEIO_RD_MEMO_SIZE)
+
 
 class ConvertersModule(Protocol):
     def maybe_convert(self, data: dict) -> dict:
@@ -78,68 +96,249 @@ def _get_spec_submodule(type_: str, data_version: str = LATEST) -> SpecSubmodule
 
 
 def extract_resource_package(
-    source: Union[os.PathLike, IO, str, bytes, raw_nodes.URI]
+    source: Union[os.PathLike, IO, str, bytes, raw_nodes.URI],
+    *,
+    weights_priority_order: Optional[Sequence[str]] = None,  # model only
 ) -> Tuple[dict, str, pathlib.Path]:
-    """extract a zip source to BIOIMAGEIO_CACHE_PATH"""
+    """extract a zip source to BIOIMAGEIO_CACHE_PATH
+
+    Args:
+        source: packaged resource
+        # for model resources only:
+        weights_priority_order: If given only the RDF, the first weights format present in the model and the files
+                                included in the package (e.g. covers, test tensors, dependencies and attachments) are
+                                extracted. Other package members are not extracted (use
+                                `load_raw_resource_description(..., weights_priority_order=...)` to extract them when
+                                they are resolved with `resolve_source`).
+    """
     src, source_name, root = resolve_rdf_source(source)
     if isinstance(root, bytes):
         raise NotImplementedError("package source was bytes")
 
-    if BIOIMAGEIO_USE_CACHE:
-        package_path = BIOIMAGEIO_CACHE_PATH / "extracted_packages" / sha256(str(root).encode("utf-8")).hexdigest()
-        package_path.mkdir(exist_ok=True, parents=True)
+    package = _open_package(root)
+    if weights_priority_order is None:
+        members = None
     else:
-        tmp_dir = TemporaryDirectory()
-        no_cache_tmp_list.append(tmp_dir)
-        package_path = pathlib.Path(tmp_dir.name)
-
-    if isinstance(root, raw_nodes.URI):
-        for rdf_name in RDF_NAMES:
-            if (package_path / rdf_name).exists():
-                download = None
-                break
-        else:
-            download = resolve_source(root)
+        raw_rd = load_raw_resource_description(RDF_Source(src, source_name, package), extract_package=False)
+        members = _get_package_members(raw_rd, weights_priority_order)
+
+    return src, source_name, _extract_package(package, members)
+
 
-        local_source = download
+def _open_package(root: Union[pathlib.Path, raw_nodes.URI, ZipPath]) -> ZipPath:
+    """open a local or remote zip package (remote packages are read with range requests if possible)"""
+    if isinstance(root, ZipPath):
+        return root.package_root
+    elif isinstance(root, raw_nodes.URI):
+        remote_package = _open_remote_package(root, CachePolicy())
+        if remote_package is None:
+            return ZipPath(resolve_source(root))
+        else:
+            return remote_package
     else:
-        download = None
-        local_source = root
+        return ZipPath(root)
+
+
+def _get_package_members(raw_rd: RawResourceDescription, weights_priority_order: Sequence[str]) -> Set[str]:
+    """get the members of a zipped package (root_path is a ZipPath) that are needed for `weights_priority_order`"""
+    _, content = get_resource_package_content_wo_rdf(raw_rd, weights_priority_order=weights_priority_order)
+    return {resource.at for resource in content.values() if isinstance(resource, ZipPath)}
+
+
+def _extract_package(package: ZipPath, members: Optional[Iterable[str]] = None) -> pathlib.Path:
+    """extract the RDF and `members` (default: all members) of a zipped package to BIOIMAGEIO_CACHE_PATH
 
-    if local_source is not None:
-        with zipfile.ZipFile(local_source) as zf:
-            zf.extractall(package_path)
+    Packages are extracted atomically and only once (also by concurrent processes); extracted members are reused.
+    A remote package is downloaded to extract all of it, only single members are read with range requests.
+    """
+    if members is None:
+        package = _download_remote_package(package)
 
     for rdf_name in RDF_NAMES:
-        if (package_path / rdf_name).exists():
+        if (package / rdf_name).is_file():
             break
     else:
-        raise FileNotFoundError(f"Missing 'rdf.yaml' in {root} extracted from {download}")
+        raise FileNotFoundError(f"Missing 'rdf.yaml' in {package}")
 
-    if download is not None:
-        try:
-            os.remove(download)
-        except Exception as e:
-            warnings.warn(f"Could not remove download {download} due to {e}")
+    if members is not None:
+        members = {rdf_name, *members}
+
+    return package.extract(members)
+
+
+def set_rd_memo_size(maxsize: int) -> int:
+    """set the number of raw resource descriptions memoized by `load_raw_resource_description` (0 disables the memo)
+
+    Returns:
+        previous memo size
+    """
+    return _rd_memo.resize(maxsize)
+
+
+def get_rd_memo_info() -> MemoInfo:
+    """hits, misses, maxsize and current size of the memo of `load_raw_resource_description`"""
+    return _rd_memo.info()
+
+
+def clear_rd_memo() -> None:
+    """clear the memo of `load_raw_resource_description` and reset its statistics"""
+    _rd_memo.clear()
+
+
+def _get_rd_memo_key(
+    source: Union[dict, os.PathLike, IO, str, bytes, raw_nodes.URI, RDF_Source],
+    update_to_format: Optional[str],
+    extract_package: bool,
+    weights_priority_order: Optional[Sequence[str]],
+) -> Optional[Hashable]:
+    """memo key of a local RDF file by the digest of its bytes (without parsing it) or None for other sources"""
+    if isinstance(source, RDF_Source) or not _is_path(source):
+        return None
+
+    assert isinstance(source, (str, os.PathLike))
+    path = pathlib.Path(source).resolve()
+    if path.suffix.lower() not in (".yaml", ".yml", ".json") or not path.is_file():
+        return None
+
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    return _get_memo_key(digest, str(path.parent), update_to_format, extract_package, weights_priority_order)
+
+
+def _get_rd_memo_key_from_data(
+    data: dict,
+    root: Union[pathlib.Path, raw_nodes.URI, ZipPath, bytes],
+    update_to_format: Optional[str],
+    extract_package: bool,
+    weights_priority_order: Optional[Sequence[str]],
+) -> Optional[Hashable]:
+    """memo key by the digest of the canonical json dump of `data` or None if `data` cannot be dumped"""
+    try:
+        content = json.dumps(data, sort_keys=True, separators=(",", ":"), default=repr)
+    except (TypeError, ValueError):  # e.g. non-string keys of mixed types
+        return None
+
+    root_key: Any
+    if isinstance(root, ZipPath):
+        root_key = (root.fingerprint, root.at)
+    elif isinstance(root, pathlib.Path):
+        root_key = str(root.resolve())
+    elif isinstance(root, bytes):
+        root_key = str(pathlib.Path().resolve())
+    else:
+        root_key = str(root)
+
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return _get_memo_key(digest, root_key, update_to_format, extract_package, weights_priority_order)
+
+
+def _get_memo_key(
+    digest: str,
+    root_key: Any,
+    update_to_format: Optional[str],
+    extract_package: bool,
+    weights_priority_order: Optional[Sequence[str]],
+) -> Hashable:
+    wpo = None if weights_priority_order is None else tuple(weights_priority_order)
+    return digest, root_key, update_to_format, extract_package, wpo
 
-    assert isinstance(package_path, pathlib.Path)
-    return src, source_name, package_path
+
+def _is_memoizing() -> bool:
+    return _rd_memo.maxsize > 0 or _raw_rd_cache.is_enabled()
+
+
+def _get_memoized_rd(key: Hashable) -> Optional[RawResourceDescription]:
+    """get a copy of a raw resource description from the in-process memo or the persistent cache and re-emit the
+    warnings of loading it"""
+    memoized = _rd_memo.get(key) if _rd_memo.maxsize else None
+    in_memo = memoized is not None
+    if memoized is None and _raw_rd_cache.is_enabled():
+        memoized = _raw_rd_cache.get(key)
+
+    if memoized is None:
+        return None
+
+    raw_rd, rd_warnings = memoized
+    if isinstance(raw_rd.root_path, pathlib.Path) and not raw_rd.root_path.exists():
+        _rd_memo.discard(key)  # e.g. an evicted extracted package
+        return None
+
+    if in_memo:
+        raw_rd = copy.deepcopy(raw_rd)
+    else:  # freshly unpickled
+        _rd_memo.put(key, (copy.deepcopy(raw_rd), rd_warnings))
+
+    _warn(rd_warnings)
+    return raw_rd
+
+
+def _memoize_rd(key: Hashable, raw_rd: RawResourceDescription, rd_warnings: RecordedWarnings) -> None:
+    memoized = copy.deepcopy(raw_rd)
+    _hold_root(memoized)
+    _rd_memo.put(key, (memoized, rd_warnings))
+    if _raw_rd_cache.is_enabled():
+        _raw_rd_cache.put(key, raw_rd, rd_warnings)
+
+
+def _warn(rd_warnings: RecordedWarnings) -> None:
+    for category, message in rd_warnings:
+        warnings.warn(message, category=category)
+
+
+def _hold_root(raw_rd: RawResourceDescription) -> None:
+    """keep a lazily extracted package (root) open for the lifetime of `raw_rd`, see `extract_lazily`"""
+    if isinstance(raw_rd.root_path, pathlib.Path):
+        hold_lazily_extracted_package(raw_rd.root_path, raw_rd)
+
+
+def _pin_root(raw_rd: RawResourceDescription) -> RawResourceDescription:
+    """keep an extracted package (root) in BIOIMAGEIO_CACHE_PATH from being evicted (and a lazily extracted package
+    open) for the lifetime of `raw_rd`"""
+    root = raw_rd.root_path
+    if isinstance(root, pathlib.Path) and _cache.get_cache_entry_dir(root) is not None:
+        _cache.pin(root)
+        weakref.finalize(raw_rd, _cache.unpin, root)
+
+    _hold_root(raw_rd)
+    return raw_rd
 
 
 def load_raw_resource_description(
-    source: Union[dict, os.PathLike, IO, str, bytes, raw_nodes.URI, RawResourceDescription],
+    source: Union[dict, os.PathLike, IO, str, bytes, raw_nodes.URI, RDF_Source, RawResourceDescription],
     update_to_format: Optional[str] = None,
+    *,
+    extract_package: bool = True,
+    weights_priority_order: Optional[Sequence[str]] = None,  # model only
+    rdf_parser: Optional[str] = None,
 ) -> RawResourceDescription:
     """load a raw python representation from a BioImage.IO resource description.
     Use `bioimageio.core.load_resource_description` for a more convenient representation of the resource.
     and `bioimageio.core.load_raw_resource_description` to ensure the 'root_path' attribute of the returned object is
     a local file path.
 
+    If BIOIMAGEIO_RD_MEMO_SIZE (or `set_rd_memo_size()`) is positive, loaded resource descriptions are memoized
+    in-process by the digest of their content, `update_to_format` and their root. Each call returns a copy that may be
+    modified without affecting the memo (see also `get_rd_memo_info()` and `clear_rd_memo()`). Warnings of loading a
+    memoized resource description are emitted again for every memo hit.
+    Local RDF files are looked up by the digest of their bytes; other sources (urls, dois, packages, ...) are keyed by
+    the digest of their parsed content, i.e. they are still fetched (from the download cache if possible) and parsed,
+    and only conversion, deserialization and package extraction are skipped for a memo hit.
+    If BIOIMAGEIO_RD_DISK_CACHE is true, loaded resource descriptions are additionally persisted in
+    BIOIMAGEIO_CACHE_PATH, so that restarted processes skip parsing, conversion and validation of unchanged RDFs.
+
     Args:
         source: resource description or resource description file (RDF)
         update_to_format: update resource to specific major.minor format version; ignoring patch version.
+        extract_package: extract a zipped resource package to BIOIMAGEIO_CACHE_PATH. If False, 'root_path' is a
+            read-only virtual root in the zip file (see `bioimageio.spec.shared.ZipPath`); package members are read
+            lazily and only written to disk when resolved with `resolve_source`.
+        weights_priority_order: (for model packages only) if given, only the members of a package needed for the first
+            weights format present in the model are extracted, see `extract_resource_package`. Other members are
+            extracted when they are resolved with `resolve_source` (while the returned resource description is in use).
+        rdf_parser: parser backend for the RDF's yaml/json content (see `bioimageio.spec.shared.RDF_PARSERS`);
+            default: BIOIMAGEIO_RDF_PARSER
     Returns:
-        raw BioImage.IO resource
+        raw BioImage.IO resource; an extracted package in BIOIMAGEIO_CACHE_PATH is not evicted while it is referenced
+        (see `bioimageio.spec.shared.evict_cache()`)
     """
     root = None
     if isinstance(source, RawResourceDescription):
@@ -153,12 +352,47 @@ def load_raw_resource_description(
         else:
             return source
 
-    data, source_name, _root, type_ = resolve_rdf_source_and_type(source)
+    memo_key: Optional[Hashable] = None
+    if _is_memoizing() and root is None:
+        memo_key = _get_rd_memo_key(source, update_to_format, extract_package, weights_priority_order)
+        memoized = None if memo_key is None else _get_memoized_rd(memo_key)
+        if memoized is not None:
+            return _pin_root(memoized)
+
+    data, source_name, _root, type_ = resolve_rdf_source_and_type(source, rdf_parser=rdf_parser)
     if root is None:
         root = _root
 
-    class_name = get_class_name_from_type(type_)
+    if _is_memoizing() and memo_key is None:
+        memo_key = _get_rd_memo_key_from_data(data, root, update_to_format, extract_package, weights_priority_order)
+        memoized = None if memo_key is None else _get_memoized_rd(memo_key)
+        if memoized is not None:
+            return _pin_root(memoized)
+
+    if memo_key is None:
+        return _pin_root(
+            _load_raw_rd_from_data(data, root, type_, update_to_format, extract_package, weights_priority_order)
+        )
+
+    with warnings.catch_warnings(record=True) as recorded:
+        warnings.simplefilter("always")  # record all warnings to re-emit them for memo hits (with the active filters)
+        raw_rd = _load_raw_rd_from_data(data, root, type_, update_to_format, extract_package, weights_priority_order)
+
+    rd_warnings = [(w.category, str(w.message)) for w in recorded]
+    _memoize_rd(memo_key, raw_rd, rd_warnings)
+    _warn(rd_warnings)
+    return _pin_root(raw_rd)
 
+
+def _load_raw_rd_from_data(
+    data: dict,
+    root: Union[pathlib.Path, raw_nodes.URI, ZipPath, bytes],
+    type_: str,
+    update_to_format: Optional[str],
+    extract_package: bool,
+    weights_priority_order: Optional[Sequence[str]],
+) -> RawResourceDescription:
+    """convert, deserialize and (optionally) extract a resource description from its (resolved) RDF data"""
     # determine submodule's format version
     original_data_version = data.get("format_version")
     if original_data_version is None:
@@ -216,7 +450,7 @@ def load_raw_resource_description(
 
         data["config"]["bioimageio"]["original_format_version"] = original_data_version
 
-    schema: SharedBioImageIOSchema = getattr(sub_spec.schema, class_name)()
+    schema: SharedBioImageIOSchema = get_schema(type_, sub_spec.format_version)
 
     data = sub_spec.converters.maybe_convert(data)
     try:
@@ -233,17 +467,60 @@ def load_raw_resource_description(
     if isinstance(root, pathlib.Path):
         root = root.resolve()
         if zipfile.is_zipfile(root):
-            # set root to extracted zip package
-            _, _, root = extract_resource_package(root)
+            root = ZipPath(root)
     elif isinstance(root, bytes):
         root = pathlib.Path().resolve()
 
+    lazily_extracted_package: Optional[ZipPath] = None
+    if isinstance(root, ZipPath) and extract_package:
+        # set root to extracted zip package
+        if weights_priority_order is None:
+            members = None
+        else:
+            raw_rd.root_path = root
+            members = _get_package_members(RelativePathTransformer(root=root).transform(raw_rd), weights_priority_order)
+            lazily_extracted_package = root.package_root
+
+        root = _extract_package(root.package_root, members) / root.at
+
     raw_rd.root_path = root
     raw_rd = RelativePathTransformer(root=root).transform(raw_rd)
+    if lazily_extracted_package is not None:
+        # remaining members are extracted when they are resolved (while the resource description is in use)
+        extract_lazily(lazily_extracted_package, raw_rd)
 
     return raw_rd
 
 
+async def aload_raw_resource_description(
+    source: Union[dict, os.PathLike, IO, str, bytes, raw_nodes.URI, RDF_Source, RawResourceDescription],
+    update_to_format: Optional[str] = None,
+    *,
+    extract_package: bool = True,
+    weights_priority_order: Optional[Sequence[str]] = None,  # model only
+    rdf_parser: Optional[str] = None,
+) -> RawResourceDescription:
+    """async variant of `load_raw_resource_description`.
+    A remote RDF (and a remote package to extract all of it) is fetched without blocking the event loop (see
+    `bioimageio.spec.shared.aresolve_rdf_source`); deserialization, conversion and package extraction (shared with
+    `load_raw_resource_description`) run in the default executor.
+    """
+    from bioimageio.spec.shared._async import _adownload_remote_package, _run_blocking, aresolve_rdf_source
+
+    if not isinstance(source, RawResourceDescription):
+        source = await aresolve_rdf_source(source, rdf_parser=rdf_parser)
+        if extract_package and weights_priority_order is None and isinstance(source.root, ZipPath):
+            source = source._replace(root=await _adownload_remote_package(source.root))  # to extract all of it
+
+    return await _run_blocking(
+        load_raw_resource_description,
+        source,
+        update_to_format=update_to_format,
+        extract_package=extract_package,
+        weights_priority_order=weights_priority_order,
+    )
+
+
 def serialize_raw_resource_description_to_dict(
     raw_rd: RawResourceDescription, convert_absolute_paths: bool = False
 ) -> dict:
@@ -251,9 +528,7 @@ def serialize_raw_resource_description_to_dict(
     If 'convert_absolute_paths' all absolute paths are converted to paths relative to raw_rd.root_path before
     serialization.
     """
-    class_name = get_class_name_from_type(raw_rd.type)
-    sub_spec = _get_spec_submodule(raw_rd.type, raw_rd.format_version)
-    schema: SharedBioImageIOSchema = getattr(sub_spec.schema, class_name)()
+    schema: SharedBioImageIOSchema = get_schema(raw_rd.type, raw_rd.format_version)
 
     if convert_absolute_paths:
         raw_rd = AbsoluteToRelativePathTransformer(root=raw_rd.root_path).transform(raw_rd)
@@ -292,13 +567,16 @@ def get_resource_package_content_wo_rdf(
     raw_rd: Union[GenericRawRD, raw_nodes.URI, str, pathlib.Path],
     *,
     weights_priority_order: Optional[Sequence[str]] = None,  # model only
-) -> Tuple[raw_nodes.ResourceDescription, Dict[str, Union[pathlib.PurePath, raw_nodes.URI]]]:
+    download_remote: bool = False,
+) -> Tuple[raw_nodes.ResourceDescription, Dict[str, Union[pathlib.PurePath, raw_nodes.URI, ZipPath]]]:
     """
     Args:
         raw_rd: raw resource description
         # for model resources only:
         weights_priority_order: If given only the first weights format present in the model is included.
                                 If none of the prioritized weights formats is found all are included.
+        download_remote: download remote resources (concurrently, see `resolve_source`) and return their local paths
+                         instead of their URIs.
 
     Returns:
         Tuple of updated raw resource description and package content of remote URIs, local file paths or text content
@@ -318,9 +596,13 @@ def get_resource_package_content_wo_rdf(
 
     r_rd = sub_spec.utils.filter_resource_description(r_rd, **filter_kwargs)
 
-    content: Dict[str, Union[pathlib.PurePath, raw_nodes.URI]] = {}
+    content: Dict[str, Union[pathlib.PurePath, raw_nodes.URI, ZipPath]] = {}
     r_rd = RawNodePackageTransformer(content, r_rd.root_path).transform(r_rd)
     assert "rdf.yaml" not in content
+    if download_remote:
+        remote = [name for name, resource in content.items() if isinstance(resource, raw_nodes.URI)]
+        content.update(zip(remote, resolve_source([content[name] for name in remote])))
+
     return r_rd, content
 
 
@@ -328,13 +610,16 @@ def get_resource_package_content(
     raw_rd: Union[raw_nodes.ResourceDescription, raw_nodes.URI, str, pathlib.Path],
     *,
     weights_priority_order: Optional[Sequence[str]] = None,  # model only
-) -> Dict[str, Union[str, pathlib.PurePath, raw_nodes.URI]]:
+    download_remote: bool = False,
+) -> Dict[str, Union[str, pathlib.PurePath, raw_nodes.URI, ZipPath]]:
     """
     Args:
         raw_rd: raw resource description
         # for model resources only:
         weights_priority_order: If given only the first weights format present in the model is included.
                                 If none of the prioritized weights formats is found all are included.
+        download_remote: download remote resources (concurrently, see `resolve_source`) and return their local paths
+                         instead of their URIs.
 
     Returns:
         Package content of remote URIs, local file paths or text content keyed by file names.
@@ -345,5 +630,7 @@ def get_resource_package_content(
             "without yaml"
         )
 
-    r_rd, content = get_resource_package_content_wo_rdf(raw_rd, weights_priority_order=weights_priority_order)
+    r_rd, content = get_resource_package_content_wo_rdf(
+        raw_rd, weights_priority_order=weights_priority_order, download_remote=download_remote
+    )
     return {**content, **{"rdf.yaml": serialize_raw_resource_description(r_rd)}}
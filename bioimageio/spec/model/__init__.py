@@ -1,4 +1,4 @@
-from . import v0_3, v0_4
+import importlib
 
 # autogen: start
 from . import converters, raw_nodes, schema, utils
@@ -13,3 +13,11 @@ except ImportError:
 format_version = get_args(FormatVersion)[-1]
 
 # autogen: stop
+
+
+def __getattr__(name: str):
+    # import format version submodules lazily
+    if name in ("v0_3", "v0_4"):
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,9 @@
-import copy
 import pathlib
 from typing import Any, Dict, Union
 
 from marshmallow import Schema
 
+from bioimageio.spec.shared._copy_on_write import copy_child, copy_dict
 from . import raw_nodes, schema
 
 AUTO_CONVERTED_DOCUMENTATION_FILE_NAME = "auto_converted_documentation.md"
@@ -12,7 +12,11 @@ AUTO_CONVERTED_DOCUMENTATION_FILE_NAME = "auto_converted_documentation.md"
 def convert_model_v0_3_1_to_v0_3_2(data: Dict[str, Any]) -> Dict[str, Any]:
     data["type"] = "model"
     data["format_version"] = "0.3.2"
-    future = data.get("config", {}).get("future", {}).pop("0.3.2", {})
+    future = data.get("config", {}).get("future", {})
+    if "0.3.2" in future:
+        future = copy_child(copy_child(data, "config"), "future")
+
+    future = future.pop("0.3.2", {})
 
     authors = data.get("authors")
     if isinstance(authors, list):
@@ -34,10 +38,12 @@ def convert_model_v0_3_1_to_v0_3_2(data: Dict[str, Any]) -> Dict[str, Any]:
     # authors of weights
     weights = data.get("weights")
     if isinstance(weights, dict):
+        weights = copy_child(data, "weights")
         for weights_format, weights_entry in weights.items():
             if "authors" not in weights_entry:
                 continue
 
+            weights_entry = copy_child(weights, weights_format)
             weights_entry["authors"] = [{"name": name} for name in weights_entry["authors"]]
             authors_update = future.get("weights", {}).get(weights_format, {}).get("authors")
             if authors_update is not None:
@@ -56,7 +62,7 @@ def convert_model_v0_3_1_to_v0_3_2(data: Dict[str, Any]) -> Dict[str, Any]:
             # Having access only to the raw data dict, we cannot write the AUTO_CONVERTED_DOCUMENTATION_FILE_NAME file, but
             # save the original content of data["documentation"] in data["config"][AUTO_CONVERTED_DOCUMENTATION_FILE_NAME]
             # to be written to AUTO_CONVERTED_DOCUMENTATION_FILE_NAME at a later stage.
-            data["config"] = data.get("config", {})  # make sure config exists
+            data["config"] = copy_dict(data.get("config", {}))  # make sure config exists
             if AUTO_CONVERTED_DOCUMENTATION_FILE_NAME not in data["config"]:
                 orig_doc = data["documentation"]
                 assert isinstance(orig_doc, str)
@@ -73,7 +79,7 @@ def convert_model_v0_3_1_to_v0_3_2(data: Dict[str, Any]) -> Dict[str, Any]:
 
     # model version
     if "version" in future:
-        data["version"] = future.pop("version")
+        data["version"] = future["version"]
 
     return data
 
@@ -81,10 +87,13 @@ def convert_model_v0_3_1_to_v0_3_2(data: Dict[str, Any]) -> Dict[str, Any]:
 def convert_model_v0_3_2_to_v0_3_3(data: Dict[str, Any]) -> Dict[str, Any]:
     data["format_version"] = "0.3.3"
     if "outputs" in data:
-        for out in data["outputs"]:
+        outputs = copy_child(data, "outputs")
+        for i, out in enumerate(outputs):
             if "shape" in out:
                 shape = out["shape"]
                 if isinstance(shape, dict) and "reference_input" in shape:
+                    out = outputs[i] = copy_dict(out)
+                    shape = out["shape"] = copy_dict(shape)
                     shape["reference_tensor"] = shape.pop("reference_input")
 
     return data
@@ -93,7 +102,7 @@ def convert_model_v0_3_2_to_v0_3_3(data: Dict[str, Any]) -> Dict[str, Any]:
 def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
     """auto converts model 'data' to newest format"""
 
-    data = copy.deepcopy(data)
+    data = copy_dict(data)
 
     if data.get("format_version", "0.3.0") == "0.3.0":
         # no breaking change, bump to 0.3.1
@@ -109,9 +118,8 @@ def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
         data["format_version"] = "0.3.6"
 
     # remove 'future' from config if no other than the used future entries exist
-    config = data.get("config", {})
-    if config.get("future") == {}:
-        del config["future"]
+    if data.get("config", {}).get("future") == {}:
+        del copy_child(data, "config")["future"]
 
     # remove 'config' if now empty
     if data.get("config") == {}:
@@ -1,12 +1,12 @@
 import typing
 import warnings
-from copy import deepcopy
 from types import ModuleType
 
 from marshmallow import RAISE, ValidationError, missing as missing_, post_load, pre_dump, pre_load, validates_schema
 
 from bioimageio.spec.rdf import v0_2 as rdf
 from bioimageio.spec.shared import field_validators, fields
+from bioimageio.spec.shared._copy_on_write import copy_child, copy_dict
 from bioimageio.spec.shared.common import ValidationWarning, get_args, get_args_flat
 from bioimageio.spec.shared.schema import (
     ImplicitOutputShape,
@@ -634,15 +634,16 @@ is in an unsupported format version. The current format version described here i
 
     @pre_load
     def add_weights_format_key_to_weights_entry_value(self, data: dict, many=False, partial=False, **kwargs):
-        data = deepcopy(data)  # Schema.validate() calls pre_load methods, thus we should not modify the input data
+        data = copy_dict(data)  # Schema.validate() calls pre_load methods, thus we should not modify the input data
         if many or partial:
             raise NotImplementedError
 
-        for weights_format, weights_entry in data.get("weights", {}).items():
+        weights = copy_child(data, "weights") if "weights" in data else {}
+        for weights_format, weights_entry in weights.items():
             if "weights_format" in weights_entry:
                 raise ValidationError(f"Got unexpected key 'weights_format' in weights entry {weights_format}")
 
-            weights_entry["weights_format"] = weights_format
+            copy_child(weights, weights_format)["weights_format"] = weights_format
 
         return data
 
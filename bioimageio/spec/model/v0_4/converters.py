@@ -1,18 +1,17 @@
-import copy
 from typing import Any, Dict
 
 from marshmallow import missing
 
 from bioimageio.spec.rdf.v0_2.converters import remove_slash_from_names
+from bioimageio.spec.shared._copy_on_write import copy_child, copy_dict
+from bioimageio.spec.shared.common import get_schema
 
 
 def convert_model_from_v0_3_to_0_4_0(data: Dict[str, Any]) -> Dict[str, Any]:
     from bioimageio.spec.model import v0_3
 
-    data = copy.deepcopy(data)
-
     data = v0_3.converters.maybe_convert(data)
-    v0_3.schema.Model().validate(data)
+    get_schema("model", v0_3.format_version).validate(data)
 
     data.pop("language", None)
     data.pop("framework", None)
@@ -20,8 +19,13 @@ def convert_model_from_v0_3_to_0_4_0(data: Dict[str, Any]) -> Dict[str, Any]:
     architecture = data.pop("source", missing)
     architecture_sha256 = data.pop("sha256", missing)
     kwargs = data.pop("kwargs", missing)
-    pytorch_state_dict_weights_entry = data.get("weights", {}).get("pytorch_state_dict")
+    weights = data.get("weights", {})
+    if "pytorch_state_dict" in weights or "pytorch_script" in weights:
+        weights = copy_child(data, "weights")
+
+    pytorch_state_dict_weights_entry = weights.get("pytorch_state_dict")
     if pytorch_state_dict_weights_entry is not None:
+        pytorch_state_dict_weights_entry = copy_child(weights, "pytorch_state_dict")
         if architecture is not missing:
             pytorch_state_dict_weights_entry["architecture"] = architecture
 
@@ -31,9 +35,9 @@ def convert_model_from_v0_3_to_0_4_0(data: Dict[str, Any]) -> Dict[str, Any]:
         if kwargs is not missing:
             pytorch_state_dict_weights_entry["kwargs"] = kwargs
 
-    torchscript_weights_entry = data.get("weights", {}).pop("pytorch_script", None)
+    torchscript_weights_entry = weights.pop("pytorch_script", None)
     if torchscript_weights_entry is not None:
-        data["weights"]["torchscript"] = torchscript_weights_entry
+        weights["torchscript"] = torchscript_weights_entry
 
     data["format_version"] = "0.4.0"
 
@@ -41,7 +45,7 @@ def convert_model_from_v0_3_to_0_4_0(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def convert_model_from_v0_4_0_to_0_4_1(data: Dict[str, Any]) -> Dict[str, Any]:
-    data = dict(data)
+    data = copy_dict(data)
 
     # move dependencies from root to pytorch_state_dict weights entry
     deps = data.pop("dependencies", None)
@@ -49,14 +53,14 @@ def convert_model_from_v0_4_0_to_0_4_1(data: Dict[str, Any]) -> Dict[str, Any]:
     if deps and weights and isinstance(weights, dict):
         entry = weights.get("pytorch_state_dict")
         if entry and isinstance(entry, dict):
-            entry["dependencies"] = deps
+            copy_child(copy_child(data, "weights"), "pytorch_state_dict")["dependencies"] = deps
 
     data["format_version"] = "0.4.1"
     return data
 
 
 def convert_model_from_v0_4_4_to_0_4_5(data: Dict[str, Any]) -> Dict[str, Any]:
-    data = dict(data)
+    data = copy_dict(data)
 
     parent = data.pop("parent", None)
     if parent and "uri" in parent:
@@ -67,7 +71,7 @@ def convert_model_from_v0_4_4_to_0_4_5(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def convert_model_from_v0_4_6_to_0_4_7(data: Dict[str, Any]) -> Dict[str, Any]:
-    data = dict(data)
+    data = copy_dict(data)
 
     remove_slash_from_names(data)
 
@@ -77,6 +81,7 @@ def convert_model_from_v0_4_6_to_0_4_7(data: Dict[str, Any]) -> Dict[str, Any]:
 
 def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
     """auto converts model 'data' to newest format"""
+    data = copy_dict(data)
     major, minor, patch = map(int, data.get("format_version", "0.3.0").split("."))
     if major == 0 and minor < 4:
         data = convert_model_from_v0_3_to_0_4_0(data)
@@ -100,9 +105,8 @@ def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
         data["format_version"] = "0.4.8"
 
     # remove 'future' from config if no other than the used future entries exist
-    config = data.get("config", {})
-    if config.get("future") == {}:
-        del config["future"]
+    if data.get("config", {}).get("future") == {}:
+        del copy_child(data, "config")["future"]
 
     # remove 'config' if now empty
     if data.get("config") == {}:
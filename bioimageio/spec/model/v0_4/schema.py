@@ -1,5 +1,4 @@
 import typing
-from copy import deepcopy
 from types import ModuleType
 
 import numpy
@@ -18,6 +17,7 @@ from bioimageio.spec.model.v0_3.schema import (
 )
 from bioimageio.spec.rdf import v0_2 as rdf
 from bioimageio.spec.shared import LICENSES, field_validators, fields
+from bioimageio.spec.shared._copy_on_write import copy_child, copy_dict
 from bioimageio.spec.shared.common import get_args, get_args_flat
 from bioimageio.spec.shared.schema import ImplicitOutputShape, ParametrizedInputShape, SharedBioImageIOSchema
 from . import raw_nodes
@@ -591,15 +591,16 @@ is in an unsupported format version. The current format version described here i
 
     @pre_load
     def add_weights_format_key_to_weights_entry_value(self, data: dict, many=False, partial=False, **kwargs):
-        data = deepcopy(data)  # Schema.validate() calls pre_load methods, thus we should not modify the input data
+        data = copy_dict(data)  # Schema.validate() calls pre_load methods, thus we should not modify the input data
         if many or partial:
             raise NotImplementedError
 
-        for weights_format, weights_entry in data.get("weights", {}).items():
+        weights = copy_child(data, "weights") if "weights" in data else {}
+        for weights_format, weights_entry in weights.items():
             if "weights_format" in weights_entry:
                 raise ValidationError(f"Got unexpected key 'weights_format' in weights entry {weights_format}")
 
-            weights_entry["weights_format"] = weights_format
+            copy_child(weights, weights_format)["weights_format"] = weights_format
 
         return data
 
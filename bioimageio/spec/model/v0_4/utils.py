@@ -1 +1,101 @@
+from typing import Dict, List, Tuple, Union
+
+from marshmallow import missing
+
+from . import raw_nodes
 from ..v0_3.utils import filter_resource_description
+from ...shared import ZipPath, resolve_local_source, resolve_source
+from ...shared._hashing import compute_sha256, get_sha256s
+from ...shared._resolve_source import _map_concurrently
+
+
+def get_model_file_errors(raw_model: raw_nodes.Model, include_remote: bool = True) -> Dict[str, Dict[str, str]]:
+    """check the SHA-256 digests of all weights and architecture files of a model that declare one
+
+    Local files are hashed concurrently and their digests are memoized (see `bioimageio.spec.shared._hashing`).
+    Members of a zipped package (see `bioimageio.spec.shared.ZipPath`) are hashed without extracting them.
+
+    Args:
+        raw_model: model to check
+        include_remote: download (or take from the download cache) and check remote files; if False only local files
+            are checked.
+
+    Returns:
+        error messages by weights format and file ('source' or 'architecture')
+    """
+    files: List[Tuple[str, str, Union[raw_nodes.URI, raw_nodes.Path, ZipPath], str]] = []
+    for wf, entry in raw_model.weights.items():
+        if isinstance(entry.sha256, str):
+            files.append((wf, "source", entry.source, entry.sha256))
+
+        architecture_sha256 = getattr(entry, "architecture_sha256", missing)
+        architecture = getattr(entry, "architecture", missing)
+        if isinstance(architecture_sha256, str) and isinstance(architecture, raw_nodes.ImportableSourceFile):
+            files.append((wf, "architecture", architecture.source_file, architecture_sha256))
+
+    errors: Dict[str, Dict[str, str]] = {}
+    local_files: List[Tuple[str, str, raw_nodes.Path, str]] = []
+    remote_files: List[Tuple[str, str, raw_nodes.URI, str]] = []
+    zip_members: List[Tuple[str, str, ZipPath, str]] = []
+    for weights_format, name, source, sha256 in files:
+        if isinstance(source, raw_nodes.Path) and not source.is_absolute():
+            source = raw_model.root_path / source
+
+        if isinstance(source, ZipPath):
+            if source.is_file():
+                zip_members.append((weights_format, name, source, sha256))
+            else:
+                errors.setdefault(weights_format, {})[name] = f"Could not find {source}"
+
+            continue
+
+        try:
+            local_path_or_remote_uri = resolve_local_source(source, raw_model.root_path)
+        except Exception as e:
+            errors.setdefault(weights_format, {})[name] = str(e)
+            continue
+
+        if isinstance(local_path_or_remote_uri, raw_nodes.URI):
+            remote_files.append((weights_format, name, local_path_or_remote_uri, sha256))
+        else:
+            local_files.append((weights_format, name, local_path_or_remote_uri, sha256))
+
+    actual_digests = get_sha256s([path for _, _, path, _ in local_files])
+    checked_files: List[Tuple[str, str, Union[raw_nodes.Path, ZipPath], str, str]] = [
+        *[(wf, name, path, sha256, actual_digests[path.absolute()]) for wf, name, path, sha256 in local_files],
+        *[(wf, name, path, sha256, compute_sha256(path)) for wf, name, path, sha256 in zip_members],
+    ]
+    for weights_format, name, path, sha256, actual in checked_files:
+        if actual != sha256.lower():
+            errors.setdefault(weights_format, {})[name] = f"{path} has SHA-256 digest {actual}, but expected {sha256}"
+
+    if include_remote:
+        # the digest of a download is verified while streaming; a cache hit was verified when it was downloaded
+        downloads = _map_concurrently(
+            lambda uri, sha256: resolve_source(uri, sha256=sha256),
+            [(uri, sha256) for _, _, uri, sha256 in remote_files],
+        )
+        for (weights_format, name, _, _), download in zip(remote_files, downloads):
+            error = download.exception()
+            if error is not None:
+                errors.setdefault(weights_format, {})[name] = str(error)
+
+    return errors
+
+
+def verify_model_files(raw_model: raw_nodes.Model, include_remote: bool = True) -> None:
+    """verify the SHA-256 digests of all weights and architecture files of a model that declare one
+
+    See `get_model_file_errors`.
+
+    Raises:
+        ValueError: listing all files that could not be verified
+    """
+    errors = get_model_file_errors(raw_model, include_remote=include_remote)
+    if errors:
+        raise ValueError(
+            "Failed to verify model files:\n"
+            + "\n".join(
+                f"weights.{wf}.{name}: {msg}" for wf, wf_errors in errors.items() for name, msg in wf_errors.items()
+            )
+        )
@@ -4,10 +4,10 @@ import copy
 import json
 import uuid
 
-import requests
 from lxml import etree
 
 from bioimageio.spec.shared import yaml
+from bioimageio.spec.shared._http import get_session
 
 tag_types = ["config", "script", "link", "window", "style", "docs", "attachment"]
 
@@ -162,7 +162,7 @@ def convert_config_to_rdf(plugin_config, source_url=None) -> dict:
 
 def get_plugin_as_rdf(source_url) -> dict:
     """Get imjoy plugin config in RDF format."""
-    req = requests.get(source_url)
+    req = get_session().get(source_url)
     source = req.text
     plugin_config = parse_imjoy_plugin(source)
     rdf = convert_config_to_rdf(plugin_config, source_url)
@@ -1,22 +1,28 @@
-import copy
 from typing import Any, Dict
 
+from bioimageio.spec.shared._copy_on_write import copy_dict, copy_list
+
 
 def remove_slash_from_names(data: Dict[str, Any]) -> None:
+    """remove slashes from the name and the names of authors and maintainers (nested containers are copied on write)"""
     if "name" in data and isinstance(data["name"], str):
         data["name"] = data["name"].replace("/", "").replace("\\", "")
 
     # remove slashes in author/maintainer name
-    authors = data.get("authors")
-    maintainers = data.get("maintainers")
-    persons = (authors if isinstance(authors, list) else []) + (maintainers if isinstance(maintainers, list) else [])
-    for p in persons:
-        if isinstance(p, dict) and "name" in p:
-            p["name"] = p["name"].replace("/", "").replace("\\", "")
+    for field in ("authors", "maintainers"):
+        persons = data.get(field)
+        if not isinstance(persons, list):
+            continue
+
+        persons = data[field] = copy_list(persons)
+        for i, p in enumerate(persons):
+            if isinstance(p, dict) and "name" in p:
+                p = persons[i] = copy_dict(p)
+                p["name"] = p["name"].replace("/", "").replace("\\", "")
 
 
 def maybe_convert(data: Dict[str, Any]) -> Dict[str, Any]:
-    data = copy.deepcopy(data)
+    data = copy_dict(data)
 
     # we unofficially accept strings as author entries...
     authors = data.get("authors")
@@ -3,13 +3,7 @@ from typing import ClassVar
 
 from marshmallow import EXCLUDE, ValidationError, validates, validates_schema
 
-from bioimageio.spec.shared import (
-    BIOIMAGEIO_SITE_CONFIG,
-    BIOIMAGEIO_SITE_CONFIG_ERROR,
-    LICENSES,
-    field_validators,
-    fields,
-)
+from bioimageio.spec.shared import LICENSES, field_validators, fields, get_bioimageio_site_config
 from bioimageio.spec.shared.common import get_args, get_patched_format_version
 from bioimageio.spec.shared.schema import SharedBioImageIOSchema, WithUnknown
 from bioimageio.spec.shared.utils import is_valid_orcid_id
@@ -241,14 +235,13 @@ E.g. the citation for the model architecture and/or the training data used."""
 
     @validates("tags")
     def warn_about_tag_categories(self, value):
-        if BIOIMAGEIO_SITE_CONFIG is None:
-            error = BIOIMAGEIO_SITE_CONFIG_ERROR
-        else:
+        site_config, error = get_bioimageio_site_config()
+        if site_config is not None:
             missing_categories = []
             try:
-                categories = {
-                    c["type"]: c.get("tag_categories", {}) for c in BIOIMAGEIO_SITE_CONFIG["resource_categories"]
-                }.get(self.__class__.__name__.lower(), {})
+                categories = {c["type"]: c.get("tag_categories", {}) for c in site_config["resource_categories"]}.get(
+                    self.__class__.__name__.lower(), {}
+                )
                 for cat, entries in categories.items():
                     if not any(e in value for e in entries):
                         missing_categories.append({cat: entries})
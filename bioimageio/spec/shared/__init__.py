@@ -3,21 +3,27 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from . import _resolve_source
+from ._cache import CachePolicy, evict_cache
+from ._http import OfflineError, create_session, get_session, is_offline, set_offline, set_session
 from ._resolve_source import (
-    BIOIMAGEIO_COLLECTION,
-    BIOIMAGEIO_COLLECTION_ERROR,
-    BIOIMAGEIO_SITE_CONFIG,
-    BIOIMAGEIO_SITE_CONFIG_ERROR,
     RDF_NAMES,
     DownloadCancelled,
     _resolve_json_from_url,
+    get_bioimageio_collection,
+    get_bioimageio_collection_entries,
+    get_bioimageio_site_config,
     resolve_local_source,
     resolve_rdf_source,
     resolve_rdf_source_and_type,
     resolve_source,
     source_available,
+    sources_available,
 )
+from ._memo import MemoInfo
+from ._rdf_parsers import RDF_PARSERS, parse_rdf
 from ._update_nested import update_nested
+from ._zip_path import ZipPath
 from .common import get_args, yaml  # noqa
 
 _license_file = Path(__file__).parent.parent / "static" / "licenses.json"
@@ -25,3 +31,15 @@ _license_data = json.loads(_license_file.read_text(encoding="utf-8"))
 
 LICENSES = {x["licenseId"]: x for x in _license_data["licenses"]}
 LICENSE_DATA_VERSION = _license_data["licenseListVersion"]
+
+
+def __getattr__(name: str):
+    # resolve deprecated constants like BIOIMAGEIO_COLLECTION lazily to avoid network access at import time
+    if name in _resolve_source._LAZY_CONSTANTS:
+        return getattr(_resolve_source, name)
+    elif name in ("aresolve_rdf_source", "aresolve_source"):  # avoid importing asyncio eagerly
+        from . import _async
+
+        return getattr(_async, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
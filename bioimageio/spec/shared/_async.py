@@ -0,0 +1,362 @@
+"""asyncio variants of resolving sources
+
+With aiohttp installed, remote RDFs, packages and files are fetched without blocking the event loop: downloads run the
+download steps of the synchronous implementation (see `_resolve_source._fetch_steps`) with aiohttp, so they share its
+download cache, resumption and sha256 verification, and the RDF of a remote package is read with range requests.
+Blocking local work (parsing, hashing, extraction), waiting for a download of another process and uncommon network
+access (DOI resolution, the collection index) run in the default executor, as does all network access without aiohttp.
+"""
+import asyncio
+import contextlib
+import functools
+import os
+import pathlib
+import typing
+import warnings
+import weakref
+import zipfile
+
+from . import fields, raw_nodes
+from ._cache import CachePolicy
+from ._remote_file import TAIL_RANGE, MissingRange, RangeRequestsNotSupported, RemoteFile, check_tail_response
+from ._resolve_source import (
+    RDF_Source,
+    _ConnectionLost,
+    _download_url,
+    _fetch_steps,
+    _get_download_key,
+    _get_download_lock,
+    _is_path,
+    _is_remote_package,
+    _load_rdf_from_package,
+    _load_rdf_source,
+    _open_remote_package,
+    _prepare_rdf_source,
+    _ReadChunk,
+    _Request,
+    _resolve_rdf_source_id,
+    _Response,
+    _with_offline_mode,
+    resolve_local_source,
+    resolve_rdf_source,
+    resolve_source,
+)
+from ._zip_path import ZipPath
+from .common import BIOIMAGEIO_HTTP_TIMEOUT, BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST
+from .raw_nodes import URI
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore
+
+T = typing.TypeVar("T")
+
+CHUNK_SIZE = 64 * 1024  # maximum number of bytes read from a response at once
+Download = asyncio.Future  # (shared) download of a local path
+
+# state per event loop: aiohttp client session (while in use), per-host slots and downloads in flight
+_aiohttp_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+_aiohttp_session_users: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = weakref.WeakKeyDictionary()
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, typing.Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_downloads_in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, typing.Dict[typing.Hashable, Download]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _run_blocking(func: typing.Callable[..., T], *args, **kwargs) -> T:
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def _acquire_aiohttp_session() -> "aiohttp.ClientSession":
+    """pooled aiohttp client session of the running event loop; release it with _release_aiohttp_session()"""
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None:
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(sock_connect=BIOIMAGEIO_HTTP_TIMEOUT, sock_read=BIOIMAGEIO_HTTP_TIMEOUT),
+            trust_env=True,  # use proxies configured by environment variables (like requests)
+        )
+        _aiohttp_sessions[loop] = session
+        _aiohttp_session_users[loop] = 0
+
+    _aiohttp_session_users[loop] += 1
+    return session
+
+
+async def _release_aiohttp_session() -> None:
+    """the session of the running event loop is closed when its last user released it"""
+    loop = asyncio.get_running_loop()
+    _aiohttp_session_users[loop] -= 1
+    if _aiohttp_session_users[loop] == 0:
+        await _aiohttp_sessions.pop(loop).close()
+
+
+def _get_host_semaphore(host: str) -> asyncio.Semaphore:
+    """BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST slots for requests to `host` on the running event loop"""
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(max(1, BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST))
+
+    return semaphores[host]
+
+
+async def _afetch_url(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> pathlib.Path:
+    """async variant of _fetch_url: download `uri` with aiohttp (see _fetch_steps)"""
+    steps = _fetch_steps(uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+    host_slot: typing.Optional[asyncio.Semaphore] = None
+    session: typing.Optional[aiohttp.ClientSession] = None
+    response: typing.Optional[aiohttp.ClientResponse] = None
+    result: typing.Any = None
+    error: typing.Optional[Exception] = None
+    try:
+        while True:
+            try:
+                step = steps.send(result) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+
+            result, error = None, None
+            try:
+                if isinstance(step, _Request):
+                    if host_slot is None:
+                        host_slot = _get_host_semaphore(uri.authority)
+                        await host_slot.acquire()
+                        session = _acquire_aiohttp_session()
+
+                    if response is not None:
+                        response.release()
+
+                    assert session is not None
+                    response = await session.get(str(uri), headers=step.headers)
+                    result = _Response(response.status, response.headers)
+                elif isinstance(step, _ReadChunk):
+                    assert response is not None
+                    result = await response.content.read(CHUNK_SIZE)
+                else:
+                    result = await _run_blocking(step)
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                error = _ConnectionLost(e)
+            except Exception as e:
+                error = e
+    finally:
+        steps.close()
+        if response is not None:
+            response.release()  # return the connection to the pool
+
+        if session is not None:
+            await _release_aiohttp_session()
+
+        if host_slot is not None:
+            host_slot.release()
+
+
+async def _adownload_locked(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike],
+    pbar,
+    sha256: typing.Optional[str],
+    cache_policy: typing.Optional[CachePolicy],
+) -> pathlib.Path:
+    lock = _get_download_lock(uri, output, sha256, cache_policy)
+    if isinstance(lock, contextlib.nullcontext):  # e.g. a cache hit
+        return await _afetch_url(uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+
+    await _run_blocking(lock.__enter__)  # (waits for a download of another process)
+    try:
+        return await _afetch_url(uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+    finally:
+        await _run_blocking(lock.__exit__, None, None, None)
+
+
+async def _adownload_url(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> pathlib.Path:
+    """async variant of _download_url; concurrent calls (on an event loop) for the same download share a request"""
+    if aiohttp is None:
+        return await _run_blocking(_download_url, uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+
+    key = _get_download_key(uri, output, sha256, cache_policy)
+    in_flight = _downloads_in_flight.setdefault(asyncio.get_running_loop(), {})
+    download = in_flight.get(key)
+    if download is None:
+        download = asyncio.ensure_future(_adownload_locked(uri, output, pbar, sha256, cache_policy))
+        in_flight[key] = download
+        download.add_done_callback(lambda _: in_flight.pop(key, None))
+
+    # a cancelled caller does not cancel the download shared with other callers
+    return await asyncio.shield(download)
+
+
+async def aresolve_source(
+    source,
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
+    output=None,
+    pbar=None,
+    sha256=None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+):
+    """async variant of resolve_source; elements of a list are resolved concurrently
+
+    Remote sources are downloaded without blocking the event loop (with aiohttp), local sources and package members
+    are resolved in the default executor.
+    """
+    if isinstance(source, list):
+        assert output is None or len(output) == len(source)
+        assert sha256 is None or len(sha256) == len(source)
+        if pbar is None or callable(pbar):
+            pbar = [pbar] * len(source)
+
+        assert len(pbar) == len(source)
+        return list(
+            await asyncio.gather(
+                *[
+                    aresolve_source(el, root_path, out, pb, sha256=digest, cache_policy=cache_policy)
+                    for el, out, pb, digest in zip(
+                        source, output or [None] * len(source), pbar, sha256 or [None] * len(source)
+                    )
+                ]
+            )
+        )
+    elif isinstance(source, (raw_nodes.ImportableSourceFile, raw_nodes.ResolvedImportableSourceFile)):
+        return raw_nodes.ResolvedImportableSourceFile(
+            callable_name=source.callable_name,
+            source_file=await aresolve_source(
+                source.source_file, root_path, output, pbar, sha256=sha256, cache_policy=cache_policy
+            ),
+        )
+
+    if isinstance(source, str):
+        source = fields.Union([fields.URI(), fields.Path()]).deserialize(source)
+
+    if isinstance(source, pathlib.Path) and not os.path.isabs(source) and isinstance(root_path, raw_nodes.URI):
+        source = root_path / source
+
+    if isinstance(source, raw_nodes.URI):
+        path_or_remote_uri = resolve_local_source(source, root_path, output)
+        if isinstance(path_or_remote_uri, raw_nodes.URI):
+            return await _adownload_url(path_or_remote_uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+        else:
+            return path_or_remote_uri
+
+    # local paths and (lazily extracted) package members
+    return await _run_blocking(
+        resolve_source, source, root_path, output, pbar, sha256=sha256, cache_policy=cache_policy
+    )
+
+
+async def _aload_rdf_from_remote_package(
+    url: raw_nodes.URI, source_name: str, cache_policy: CachePolicy, rdf_parser: typing.Optional[str]
+) -> typing.Optional[RDF_Source]:
+    """async variant of `_load_rdf_from_package(_open_remote_package(url, cache_policy), ...)`
+
+    The zip file is read from the ranges received so far; missing ranges are requested with aiohttp until its central
+    directory and RDF can be read. Other members are read on demand (with blocking range requests) later.
+
+    Returns:
+        RDF of the remote package or None if the package should be downloaded instead
+    """
+    if aiohttp is None:
+        package = await _run_blocking(_open_remote_package, url, cache_policy)
+        if package is None:
+            return None
+
+        return await _run_blocking(_load_rdf_from_package, package, source_name, rdf_parser)
+
+    if not _is_remote_package(url, cache_policy):
+        return None
+
+    def load_rdf(remote_file: RemoteFile) -> RDF_Source:
+        package = ZipPath(zipfile.ZipFile(typing.cast(typing.IO[bytes], remote_file)))  # a seekable raw file
+        return _load_rdf_from_package(package, source_name, rdf_parser)
+
+    host_slot = _get_host_semaphore(url.authority)
+    await host_slot.acquire()
+    session = _acquire_aiohttp_session()
+    try:
+        async with session.get(str(url), headers={"Range": TAIL_RANGE}) as r:
+            check_tail_response(str(url), r.status, r.headers)  # (before reading the whole file)
+            remote_file = RemoteFile(str(url), tail=(r.status, r.headers, await r.read()))
+
+        remote_file.fetch_missing = False
+        while True:
+            try:
+                rdf_source = await _run_blocking(load_rdf, remote_file)
+            except MissingRange as missing:
+                headers = remote_file.get_range_headers(missing.start, missing.end)
+                async with session.get(str(url), headers=headers) as r:
+                    remote_file.check_range_response(missing.start, missing.end, r.status, r.headers)
+                    remote_file.add_range(missing.start, missing.end, await r.read())
+            else:
+                break
+    except RangeRequestsNotSupported:
+        return None
+    except (OSError, zipfile.BadZipFile, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        warnings.warn(f"Failed to read {url} with range requests ({e}). Downloading it instead.")
+        return None
+    finally:
+        await _release_aiohttp_session()
+        host_slot.release()
+
+    remote_file.fetch_missing = True
+    return rdf_source
+
+
+async def _adownload_remote_package(package: ZipPath) -> ZipPath:
+    """async variant of `_resolve_source._download_remote_package`"""
+    remote_file = package.zip_file.fp
+    if not isinstance(remote_file, RemoteFile):
+        return package
+
+    return ZipPath(await _adownload_url(raw_nodes.URI(uri_string=remote_file.name))) / package.at
+
+
+async def aresolve_rdf_source(
+    source: typing.Union[dict, os.PathLike, typing.IO, str, bytes, URI, raw_nodes.ResourceDescription, RDF_Source],
+    cache_policy: typing.Optional[CachePolicy] = None,
+    rdf_parser: typing.Optional[str] = None,
+) -> RDF_Source:
+    """async variant of resolve_rdf_source"""
+    if cache_policy is None:
+        cache_policy = CachePolicy(revalidate=True)
+
+    cache_policy = _with_offline_mode(cache_policy)
+    if not isinstance(source, (str, raw_nodes.URI)):
+        # no network access
+        return await _run_blocking(resolve_rdf_source, source, cache_policy=cache_policy, rdf_parser=rdf_parser)
+
+    source, source_name, root = _prepare_rdf_source(source)
+    if isinstance(source, str):
+        if not source.startswith("http"):
+            # bioimage.io ids and nicknames are looked up in the (memoized) collection index, dois are resolved online
+            source = await _run_blocking(_resolve_rdf_source_id, source, source_name)
+
+        if source.startswith("http"):
+            source_url = raw_nodes.URI(uri_string=source)
+            rdf_source = await _aload_rdf_from_remote_package(source_url, source_name, cache_policy, rdf_parser)
+            if rdf_source is not None:
+                return rdf_source
+
+            source = await _adownload_url(source_url, cache_policy=cache_policy)
+            root = source_url.parent
+
+        if _is_path(source):
+            source = pathlib.Path(source)
+
+    return await _run_blocking(_load_rdf_source, source, source_name, root, rdf_parser)
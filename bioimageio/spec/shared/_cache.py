@@ -0,0 +1,694 @@
+"""content-addressed download cache in BIOIMAGEIO_CACHE_PATH
+
+The cache is size bounded by BIOIMAGEIO_CACHE_MAX_BYTES and BIOIMAGEIO_CACHE_MAX_ENTRIES, see evict_cache().
+
+layout:
+    blobs/<sha256[:2]>/<sha256>/<file name>  downloaded content; alternative file names of identical content are
+                                             hard links to the same blob
+    urls/<sha256(url)[:2]>/<sha256(url)>.json  url index entry with sidecar metadata, see UrlEntry
+    dois/<sha256(doi)[:2]>/<sha256(doi)>.json  resolved dois, see get_resolved_doi()
+    extracted_packages/<fingerprint>/        extracted resource packages keyed by the content of the zip file (see
+                                             get_extracted_package_path())
+    raw_rds/<spec version>/<key[:2]>/<key>.pickle  loaded raw resource descriptions (if BIOIMAGEIO_RD_DISK_CACHE),
+                                             see get_raw_rd_path()
+    locks/<name>.lock                        inter-process locks (with stale lock detection), see lock()
+    tmp/                                     partial downloads (on the same file system as blobs/ for atomic moves);
+                                             resumable partial downloads are kept as <sha256(url)>.part with sidecar
+                                             metadata <sha256(url)>.part.json, see PartialDownload
+
+The last access of blobs and extracted packages is tracked by the modification time of their directory. Entries in use
+(see pin()) are touched periodically, so that they are not evicted while they are read.
+
+In offline mode cache misses are answered from a pre-seeded mirror directory BIOIMAGEIO_MIRROR_PATH, see
+lookup_mirror().
+"""
+import contextlib
+import json
+import os
+import pathlib
+import shutil
+import socket
+import threading
+import time
+import typing
+import uuid
+from hashlib import sha256 as _sha256
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from .common import (
+    BIOIMAGEIO_CACHE_MAX_BYTES,
+    BIOIMAGEIO_CACHE_MAX_ENTRIES,
+    BIOIMAGEIO_CACHE_PATH,
+    BIOIMAGEIO_LOCK_STALE_AFTER,
+    BIOIMAGEIO_MIRROR_PATH,
+)
+
+
+class UrlEntry(typing.NamedTuple):
+    url: str
+    sha256: str
+    size: int
+    name: str
+    etag: typing.Optional[str]
+    last_modified: typing.Optional[str]
+    fetched: float  # time of download (or last revalidation)
+
+
+def _url_key(url: str) -> str:
+    return _sha256(url.encode("utf-8")).hexdigest()
+
+
+def _get_url_entry_path(url: str) -> pathlib.Path:
+    key = _url_key(url)
+    return BIOIMAGEIO_CACHE_PATH / "urls" / key[:2] / f"{key}.json"
+
+
+def get_blob_dir(sha256: str) -> pathlib.Path:
+    return BIOIMAGEIO_CACHE_PATH / "blobs" / sha256[:2] / sha256
+
+
+def get_tmp_path() -> pathlib.Path:
+    """get a unique path for a partial download in the cache"""
+    tmp_dir = BIOIMAGEIO_CACHE_PATH / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    return tmp_dir / f"{uuid.uuid4().hex}.part"
+
+
+def get_extracted_package_path(fingerprint: str) -> pathlib.Path:
+    """directory of an extracted resource package with content `fingerprint`, see ZipPath.fingerprint"""
+    return BIOIMAGEIO_CACHE_PATH / "extracted_packages" / fingerprint
+
+
+def get_raw_rd_path(spec_version: str, key: str) -> pathlib.Path:
+    """path of a pickled raw resource description loaded with bioimageio.spec version `spec_version`"""
+    return get_raw_rds_dir() / spec_version / key[:2] / f"{key}.pickle"
+
+
+def get_raw_rds_dir() -> pathlib.Path:
+    return BIOIMAGEIO_CACHE_PATH / "raw_rds"
+
+
+class _LockHolder(typing.NamedTuple):
+    """content of a lock file"""
+
+    token: str
+    pid: int
+    host: str
+
+
+def _read_lock_holder(lock_path: pathlib.Path) -> typing.Optional[_LockHolder]:
+    try:
+        with lock_path.open(encoding="utf-8") as f:
+            return _LockHolder(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _is_process_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True  # unknown; stale locks of dead processes expire after BIOIMAGEIO_LOCK_STALE_AFTER
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # the process exists, but belongs to another user
+
+    return True
+
+
+def _is_stale_lock(lock_path: pathlib.Path, stale_after: float) -> typing.Optional[_LockHolder]:
+    """check if a lock is stale, i.e. its holder died on this host or did not refresh it for `stale_after` seconds
+
+    Returns:
+        the stale lock's holder (or an empty holder for an unreadable lock file) if the lock is stale else None
+    """
+    try:
+        age = time.time() - lock_path.stat().st_mtime
+    except OSError:
+        return None  # released in the meantime
+
+    holder = _read_lock_holder(lock_path)
+    if age > stale_after:
+        return holder or _LockHolder(token="", pid=-1, host="")
+    elif holder is not None and holder.host == socket.gethostname() and not _is_process_alive(holder.pid):
+        return holder
+    else:
+        return None
+
+
+def _break_stale_lock(lock_path: pathlib.Path, holder: _LockHolder) -> None:
+    # move the stale lock file out of place atomically, so that concurrent waiters break it only once
+    stale_path = lock_path.with_name(f"{lock_path.name}.{uuid.uuid4().hex}.stale")
+    try:
+        os.rename(lock_path, stale_path)
+    except OSError:
+        return  # broken or released in the meantime
+
+    broken = _read_lock_holder(stale_path)
+    if broken is not None and broken.token != holder.token:
+        # (unlikely) the stale lock was broken and acquired again in the meantime -> restore the new lock
+        try:
+            os.link(stale_path, lock_path)
+        except OSError:
+            pass
+
+    try:
+        stale_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@contextlib.contextmanager
+def lock(
+    name: str, poll_interval: float = 0.05, stale_after: typing.Optional[float] = None
+) -> typing.Iterator[pathlib.Path]:
+    """inter-process lock for `name`, e.g. to download a url or extract a package only once when multiple processes
+    share the cache
+
+    The lock is held by exclusively creating the lock file `locks/<name>.lock`. Its holder refreshes the lock file's
+    modification time while it holds the lock (heartbeat).
+
+    Args:
+        name: name of the lock
+        poll_interval: time in seconds between attempts to acquire a held lock
+        stale_after: a lock not refreshed for `stale_after` seconds (or held by a dead process on this host) is stale
+            and broken by the next process that waits for it; default: BIOIMAGEIO_LOCK_STALE_AFTER
+
+    Returns:
+        path of the lock file
+    """
+    stale_after = BIOIMAGEIO_LOCK_STALE_AFTER if stale_after is None else stale_after
+    lock_path = BIOIMAGEIO_CACHE_PATH / "locks" / f"{name}.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    holder = _LockHolder(token=uuid.uuid4().hex, pid=os.getpid(), host=socket.gethostname())
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            stale_holder = _is_stale_lock(lock_path, stale_after)
+            if stale_holder is None:
+                time.sleep(poll_interval)
+            else:
+                _break_stale_lock(lock_path, stale_holder)
+        else:
+            break
+
+    released = threading.Event()
+
+    def heartbeat():
+        while not released.wait(stale_after / 4):
+            touch(lock_path)
+
+    heartbeat_thread = threading.Thread(target=heartbeat, name=f"heartbeat of {lock_path}", daemon=True)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(holder._asdict(), f)
+
+        heartbeat_thread.start()
+        yield lock_path
+    finally:
+        released.set()
+        if heartbeat_thread.is_alive():
+            heartbeat_thread.join()
+
+        if _read_lock_holder(lock_path) == holder:  # do not release a lock that was broken (and acquired again)
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def get_partial_path(url: str) -> pathlib.Path:
+    """get the path of a (resumable) partial download of `url` in the cache"""
+    tmp_dir = BIOIMAGEIO_CACHE_PATH / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    return tmp_dir / f"{_url_key(url)}.part"
+
+
+class PartialDownload(typing.NamedTuple):
+    """sidecar metadata of a partial download `<file>.part` in `<file>.part.json`"""
+
+    url: str
+    validator: str  # (strong) ETag or Last-Modified of the partially downloaded content, see If-Range
+
+
+def _get_partial_download_meta_path(part_path: pathlib.Path) -> pathlib.Path:
+    return part_path.with_name(f"{part_path.name}.json")
+
+
+def get_partial_download(part_path: pathlib.Path, url: str) -> typing.Optional[PartialDownload]:
+    """get the metadata of a resumable partial download of `url` at `part_path`"""
+    try:
+        with _get_partial_download_meta_path(part_path).open(encoding="utf-8") as f:
+            partial = PartialDownload(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+    if partial.url != url or not part_path.exists():
+        return None
+
+    return partial
+
+
+def save_partial_download(
+    part_path: pathlib.Path, url: str, etag: typing.Optional[str], last_modified: typing.Optional[str]
+) -> typing.Optional[PartialDownload]:
+    """record a validator for a partial download to resume it later
+
+    Returns:
+        the partial download's metadata or None if there is no (strong) validator to resume the download with
+    """
+    validator = etag if etag and not etag.startswith("W/") else last_modified
+    if not validator:
+        discard_partial_download(part_path, keep_part=True)
+        return None
+
+    partial = PartialDownload(url=url, validator=validator)
+    _write_json_atomically(_get_partial_download_meta_path(part_path), partial._asdict())
+    return partial
+
+
+def discard_partial_download(part_path: pathlib.Path, keep_part: bool = False) -> None:
+    """remove a partial download (or only its metadata if `keep_part`)"""
+    for p in [_get_partial_download_meta_path(part_path)] + ([] if keep_part else [part_path]):
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def get_url_entry(url: str) -> typing.Optional[UrlEntry]:
+    try:
+        with _get_url_entry_path(url).open(encoding="utf-8") as f:
+            return UrlEntry(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_json_atomically(path: pathlib.Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    os.replace(tmp_path, path)
+
+
+class CachePolicy(typing.NamedTuple):
+    """freshness policy for cached downloads
+
+    Attributes:
+        max_age: cached downloads older than `max_age` seconds (since download or last revalidation) are revalidated
+            with a conditional request (If-None-Match/If-Modified-Since). None: cached downloads never become stale.
+        revalidate: always revalidate cached downloads (an unchanged resource costs a single '304 Not Modified').
+        offline: never access the network; cached downloads are used regardless of their age.
+    """
+
+    max_age: typing.Optional[float] = None
+    revalidate: bool = False
+    offline: bool = False
+
+    def is_stale(self, entry: UrlEntry) -> bool:
+        if self.offline:
+            return False
+        elif self.revalidate:
+            return True
+        elif self.max_age is None:
+            return False
+        else:
+            return time.time() - entry.fetched > self.max_age
+
+
+def lookup(url: str, sha256: typing.Optional[str] = None) -> typing.Optional[typing.Tuple[pathlib.Path, UrlEntry]]:
+    """look up a cached download
+
+    Args:
+        url: url of the download
+        sha256: expected SHA-256 digest of the content, e.g. from a weights entry
+
+    Returns:
+        path to the cached content and its url entry or None for cache misses and invalid (truncated or unexpected)
+        cache entries.
+    """
+    entry = get_url_entry(url)
+    if entry is None or (sha256 is not None and entry.sha256 != sha256.lower()):
+        return None
+
+    path = get_blob_dir(entry.sha256) / entry.name
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+
+    if size != entry.size:
+        return None  # truncated or otherwise corrupted
+
+    touch(path.parent)
+    return path, entry
+
+
+def lookup_mirror(url: str) -> typing.Optional[pathlib.Path]:
+    """look up `url` in the mirror directory BIOIMAGEIO_MIRROR_PATH (layout: <host>/<path>)
+
+    Returns:
+        path of the mirrored file or None if there is no mirror or it does not contain `url`
+    """
+    if BIOIMAGEIO_MIRROR_PATH is None:
+        return None
+
+    url_parts = urlsplit(url)
+    path = BIOIMAGEIO_MIRROR_PATH / url_parts.netloc / url2pathname(url_parts.path.lstrip("/"))
+    return path if path.is_file() else None
+
+
+def mark_revalidated(
+    entry: UrlEntry, etag: typing.Optional[str] = None, last_modified: typing.Optional[str] = None
+) -> None:
+    """update the fetch time (and validators) of a url entry after the server confirmed it is unchanged"""
+    _write_json_atomically(
+        _get_url_entry_path(entry.url),
+        entry._replace(
+            etag=etag or entry.etag, last_modified=last_modified or entry.last_modified, fetched=time.time()
+        )._asdict(),
+    )
+
+
+def get_conditional_headers(entry: UrlEntry) -> typing.Dict[str, str]:
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+
+    return headers
+
+
+def publish(
+    url: str,
+    tmp_path: pathlib.Path,
+    *,
+    sha256: str,
+    name: str,
+    etag: typing.Optional[str] = None,
+    last_modified: typing.Optional[str] = None,
+) -> pathlib.Path:
+    """move a complete download into the content-addressed store and index it by url
+
+    Identical content (of any url) is stored only once.
+
+    Returns:
+        path of the published content
+    """
+    size = tmp_path.stat().st_size
+    blob_dir = get_blob_dir(sha256)
+    blob_dir.mkdir(parents=True, exist_ok=True)
+    path = blob_dir / name
+    existing = [p for p in blob_dir.iterdir() if p.is_file() and p.stat().st_size == size]
+    if path in existing:
+        tmp_path.unlink()  # deduplicate
+    elif existing:
+        # identical content under a different name -> hard link to save space
+        try:
+            os.link(existing[0], path)
+        except OSError:
+            os.replace(tmp_path, path)
+        else:
+            tmp_path.unlink()
+    else:
+        os.replace(tmp_path, path)
+
+    touch(blob_dir)
+    _write_json_atomically(
+        _get_url_entry_path(url),
+        UrlEntry(
+            url=url,
+            sha256=sha256,
+            size=size,
+            name=name,
+            etag=etag,
+            last_modified=last_modified,
+            fetched=time.time(),
+        )._asdict(),
+    )
+    return path
+
+
+def _get_doi_entry_path(doi: str) -> pathlib.Path:
+    key = _url_key(doi)
+    return BIOIMAGEIO_CACHE_PATH / "dois" / key[:2] / f"{key}.json"
+
+
+def get_resolved_doi(doi: str, max_age: float) -> typing.Optional[str]:
+    """get the cached url a doi resolved to
+
+    Args:
+        doi: doi to look up
+        max_age: maximum age in seconds of the cached resolution of a (concept) doi that is not immutable
+
+    Returns:
+        url or None for cache misses and expired entries
+    """
+    try:
+        with _get_doi_entry_path(doi).open(encoding="utf-8") as f:
+            entry = json.load(f)
+
+        if entry["immutable"] or time.time() - entry["resolved"] <= max_age:
+            return entry["url"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    return None
+
+
+def set_resolved_doi(doi: str, url: str, *, immutable: bool) -> None:
+    """cache the url a doi resolved to; immutable (versioned) dois never expire"""
+    _write_json_atomically(_get_doi_entry_path(doi), dict(doi=doi, url=url, immutable=immutable, resolved=time.time()))
+
+
+def touch(path: pathlib.Path) -> None:
+    """mark a cache entry (blob or extracted package directory) as recently used"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# cache entries in use by this process (with reference counts), see pin()
+_pinned: typing.Dict[pathlib.Path, int] = {}
+_pinned_lock = threading.Lock()
+_pin_heartbeat: typing.Optional[threading.Thread] = None
+_PIN_TOUCH_INTERVAL = 15.0  # well below the default min_age of evict_cache()
+
+
+def get_cache_entry_dir(path: pathlib.Path) -> typing.Optional[pathlib.Path]:
+    """get the cache entry (blob or extracted package directory) containing `path` or None if `path` is not cached"""
+    try:
+        relative = path.relative_to(BIOIMAGEIO_CACHE_PATH)
+    except ValueError:
+        try:
+            relative = path.resolve().relative_to(BIOIMAGEIO_CACHE_PATH.resolve())
+        except (ValueError, OSError):
+            return None
+
+    if relative.parts[:1] == ("blobs",) and len(relative.parts) >= 3:
+        return BIOIMAGEIO_CACHE_PATH.joinpath(*relative.parts[:3])
+    elif relative.parts[:1] == ("extracted_packages",) and len(relative.parts) >= 2:
+        return BIOIMAGEIO_CACHE_PATH.joinpath(*relative.parts[:2])
+    else:
+        return None
+
+
+def pin(path: pathlib.Path) -> None:
+    """mark the cache entry containing `path` as in use until it is unpinned
+
+    Pinned entries are not evicted by this process and are touched every _PIN_TOUCH_INTERVAL seconds, so that other
+    processes do not evict them either (see `min_age` of evict_cache()).
+    """
+    global _pin_heartbeat
+    entry_dir = get_cache_entry_dir(path)
+    if entry_dir is None:
+        return
+
+    touch(entry_dir)
+    with _pinned_lock:
+        _pinned[entry_dir] = _pinned.get(entry_dir, 0) + 1
+        if _pin_heartbeat is None:
+            _pin_heartbeat = threading.Thread(target=_touch_pinned, name="touch pinned cache entries", daemon=True)
+            _pin_heartbeat.start()
+
+
+def unpin(path: pathlib.Path) -> None:
+    entry_dir = get_cache_entry_dir(path)
+    with _pinned_lock:
+        if entry_dir not in _pinned:
+            return
+
+        _pinned[entry_dir] -= 1
+        if not _pinned[entry_dir]:
+            del _pinned[entry_dir]
+
+
+@contextlib.contextmanager
+def in_use(path: pathlib.Path) -> typing.Iterator[pathlib.Path]:
+    """pin the cache entry containing `path` while the context is active"""
+    pin(path)
+    try:
+        yield path
+    finally:
+        unpin(path)
+
+
+def _is_pinned(entry_dir: pathlib.Path) -> bool:
+    with _pinned_lock:
+        return entry_dir in _pinned
+
+
+def _touch_pinned() -> None:
+    while True:
+        time.sleep(_PIN_TOUCH_INTERVAL)
+        with _pinned_lock:
+            pinned = list(_pinned)
+
+        for entry_dir in pinned:
+            touch(entry_dir)
+
+
+class CacheEntry(typing.NamedTuple):
+    path: pathlib.Path
+    size: int
+    last_access: float
+
+
+def get_dir_size(path: pathlib.Path) -> int:
+    size = 0
+    seen_inodes = set()
+    for dirpath, _, filenames in os.walk(path):
+        for fn in filenames:
+            try:
+                stat = os.stat(os.path.join(dirpath, fn))
+            except OSError:
+                continue
+
+            if (stat.st_dev, stat.st_ino) not in seen_inodes:  # count hard links once
+                seen_inodes.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+
+    return size
+
+
+def iter_cache_entries() -> typing.Iterator[CacheEntry]:
+    """iterate over all downloaded blobs and extracted packages in the cache"""
+    for entry_dir in [*BIOIMAGEIO_CACHE_PATH.glob("blobs/*/*"), *BIOIMAGEIO_CACHE_PATH.glob("extracted_packages/*")]:
+        try:
+            last_access = entry_dir.stat().st_mtime
+        except OSError:
+            continue  # removed in the meantime
+
+        yield CacheEntry(entry_dir, get_dir_size(entry_dir), last_access)
+
+
+class _CacheTally(typing.NamedTuple):
+    """in-process estimate of the size of the cache at `cache_path`, see evict_cache_if_needed()"""
+
+    cache_path: pathlib.Path
+    size: int
+    n_entries: int
+    scanned: float  # time of the last full scan
+
+
+_tally: typing.Optional[_CacheTally] = None
+_tally_lock = threading.Lock()
+_RESCAN_INTERVAL = 60.0  # other processes may add to the cache, too
+_MIN_SCAN_INTERVAL = 1.0  # rescan interval while the cache cannot be evicted to within its budgets (entries in use)
+
+
+def _is_within_budgets(size: int, n_entries: int, max_bytes: int, max_entries: int) -> bool:
+    return (not max_bytes or size <= max_bytes) and (not max_entries or n_entries <= max_entries)
+
+
+def evict_cache_if_needed(added_bytes: int, added_entries: int = 1) -> typing.List[pathlib.Path]:
+    """evict_cache() after adding a download or an extracted package of `added_bytes` to the cache
+
+    Instead of scanning the whole cache after every addition, additions are tallied; the cache is only scanned (and
+    evicted) if the tally exceeds the budgets or the last scan is older than _RESCAN_INTERVAL seconds.
+
+    Returns:
+        evicted entries
+    """
+    global _tally
+    if not BIOIMAGEIO_CACHE_MAX_BYTES and not BIOIMAGEIO_CACHE_MAX_ENTRIES:
+        return []
+
+    now = time.time()
+    with _tally_lock:
+        if (
+            _tally is not None
+            and _tally.cache_path == BIOIMAGEIO_CACHE_PATH
+            and now - _tally.scanned < _RESCAN_INTERVAL
+        ):
+            _tally = _tally._replace(size=_tally.size + added_bytes, n_entries=_tally.n_entries + added_entries)
+            if now - _tally.scanned < _MIN_SCAN_INTERVAL or _is_within_budgets(
+                _tally.size, _tally.n_entries, BIOIMAGEIO_CACHE_MAX_BYTES, BIOIMAGEIO_CACHE_MAX_ENTRIES
+            ):
+                return []
+
+    return evict_cache()
+
+
+def evict_cache(
+    max_bytes: typing.Optional[int] = None, max_entries: typing.Optional[int] = None, min_age: float = 60.0
+) -> typing.List[pathlib.Path]:
+    """evict least recently used downloads and extracted packages from BIOIMAGEIO_CACHE_PATH
+
+    Args:
+        max_bytes: byte budget of the cache; defaults to BIOIMAGEIO_CACHE_MAX_BYTES (0: unlimited)
+        max_entries: maximum number of downloads and extracted packages; defaults to BIOIMAGEIO_CACHE_MAX_ENTRIES
+            (0: unlimited)
+        min_age: entries used within the last `min_age` seconds are not evicted, as they might be in use (by another
+            process). Entries pinned by this process (see pin()) are never evicted.
+
+    Evicted entries are atomically moved out of place before they are deleted, so other processes either find a
+    complete entry or none at all (and download/extract it again). Files already opened remain readable.
+
+    Returns:
+        evicted entries
+    """
+    max_bytes = BIOIMAGEIO_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    max_entries = BIOIMAGEIO_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    if not max_bytes and not max_entries:
+        return []
+
+    global _tally
+    entries = sorted(iter_cache_entries(), key=lambda e: e.last_access)
+    total_size = sum(e.size for e in entries)
+    n_entries = len(entries)
+    evicted = []
+    now = time.time()
+    for entry in entries:
+        if _is_within_budgets(total_size, n_entries, max_bytes, max_entries):
+            break
+
+        if now - entry.last_access < min_age:
+            break  # all remaining entries have been used even more recently
+
+        if _is_pinned(entry.path):
+            continue
+
+        trash = get_tmp_path().with_suffix(".evicted")
+        try:
+            os.replace(entry.path, trash)
+        except OSError:
+            continue  # evicted by another process
+
+        shutil.rmtree(trash, ignore_errors=True)
+        total_size -= entry.size
+        n_entries -= 1
+        evicted.append(entry.path)
+
+    with _tally_lock:
+        _tally = _CacheTally(BIOIMAGEIO_CACHE_PATH, total_size, n_entries, scanned=now)
+
+    return evicted
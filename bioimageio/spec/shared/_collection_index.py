@@ -0,0 +1,153 @@
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+from collections.abc import Mapping
+
+try:
+    import sqlite3
+except ImportError:  # sqlite3 may not be available, e.g. in pyodide
+    sqlite3 = None  # type: ignore
+
+CollectionEntry = typing.Tuple[str, str]  # (type, rdf_source)
+
+
+def iter_collection_entries(collection: dict) -> typing.Iterator[typing.Tuple[str, CollectionEntry]]:
+    """yield (key, (type, rdf_source)) for all ids, nicknames and versioned ids of the bioimage.io collection"""
+    for cr in collection.get("collection", []):
+        if "id" in cr and "rdf_source" in cr and "type" in cr:
+            entry = (cr["type"], cr["rdf_source"])
+            yield cr["id"], entry
+
+            if "nickname" in cr:
+                yield cr["nickname"], entry
+
+        # add resource versions explicitly
+        for cv in cr.get("versions", []):
+            yield f"{cr['id']}/{cv}", (
+                cr["type"],
+                cr["rdf_source"].replace(
+                    f"/{cr['versions'][0]}", f"/{cv}"
+                ),  # todo: improve this replace-version-monkeypatch
+            )
+
+
+class CollectionIndex(Mapping):
+    """Persistent (SQLite) index of the bioimage.io collection.
+
+    Maps bioimage.io ids, nicknames and versioned ids '<id>/<version>' to (type, rdf_source).
+    The index is refreshed by a conditional request (ETag/If-Modified-Since) against the collection url,
+    such that an unchanged collection is neither downloaded nor parsed again.
+    Lookups are answered from the database without loading the whole collection into memory.
+    """
+
+    def __init__(self, db_path: typing.Union[os.PathLike, str], url: str, timeout: float = 30.0):
+        if sqlite3 is None:
+            raise RuntimeError("CollectionIndex requires sqlite3")
+
+        if db_path != ":memory:":
+            pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.url = url
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, type TEXT NOT NULL, rdf_source TEXT NOT NULL)"
+            )
+            self._con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _get_meta(self, key: str) -> typing.Optional[str]:
+        with self._lock:
+            row = self._con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+
+        return None if row is None else row[0]
+
+    def _set_meta(self, **kwargs: str) -> None:
+        with self._lock:
+            self._con.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(kwargs.items()))
+
+    def refresh(self) -> typing.Optional[str]:
+        """conditionally update the index from `self.url`
+
+        Returns:
+            An error message if the collection could not be fetched, None otherwise.
+        """
+        from ._http import get_session
+
+        headers = {}
+        if self._get_meta("url") == self.url:
+            etag = self._get_meta("etag")
+            last_modified = self._get_meta("last_modified")
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = get_session().get(self.url, headers=headers)
+            if response.status_code == 304:
+                self._set_meta(checked=str(time.time()))
+                return None
+
+            response.raise_for_status()
+            collection = json.loads(response.content.decode("utf-8"))
+            assert isinstance(collection, dict)
+        except Exception as e:
+            return str(e)
+
+        self.update(
+            collection,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return None
+
+    def update(
+        self, collection: dict, *, etag: typing.Optional[str] = None, last_modified: typing.Optional[str] = None
+    ) -> None:
+        """replace the indexed entries with the entries of `collection`"""
+        entries = dict(iter_collection_entries(collection))
+        with self._lock:
+            self._con.execute("BEGIN IMMEDIATE")
+            try:
+                self._con.execute("DELETE FROM entries")
+                self._con.executemany(
+                    "INSERT INTO entries (key, type, rdf_source) VALUES (?, ?, ?)",
+                    [(k, t, s) for k, (t, s) in entries.items()],
+                )
+                self._con.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("url", self.url),
+                        ("etag", etag),
+                        ("last_modified", last_modified),
+                        ("checked", str(time.time())),
+                    ],
+                )
+            except Exception:
+                self._con.execute("ROLLBACK")
+                raise
+            else:
+                self._con.execute("COMMIT")
+
+    def __getitem__(self, key: str) -> CollectionEntry:
+        with self._lock:
+            row = self._con.execute("SELECT type, rdf_source FROM entries WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return row[0], row[1]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        with self._lock:
+            keys = [row[0] for row in self._con.execute("SELECT key FROM entries")]
+
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,71 @@
+"""copy-on-write editing of RDF data for the format converters (and schema pre_load hooks)
+
+Converters must not modify their input. Instead of deep copying the whole (possibly large) RDF, they shallow copy only
+the containers they modify (and the containers leading to them) with `copy_dict()`, `copy_list()` and `copy_child()`.
+Untouched subtrees, e.g. a large `config` or `attachments`, are shared with the input.
+The copies made in a thread can be measured with `count_copies()`.
+"""
+import contextlib
+import threading
+import typing
+
+
+class CopyCount:
+    """number of shallow copies and of copied items (references)"""
+
+    def __init__(self):
+        self.copies = 0
+        self.items = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(copies={self.copies}, items={self.items})"
+
+
+_counts = threading.local()
+
+
+def _count(n_items: int) -> None:
+    for count in getattr(_counts, "active", ()):
+        count.copies += 1
+        count.items += n_items
+
+
+@contextlib.contextmanager
+def count_copies() -> typing.Iterator[CopyCount]:
+    """count the copies made with `copy_dict()` and `copy_list()` in the current thread"""
+    count = CopyCount()
+    if not hasattr(_counts, "active"):
+        _counts.active = []
+
+    _counts.active.append(count)
+    try:
+        yield count
+    finally:
+        _counts.active.remove(count)
+
+
+def copy_dict(data: typing.Mapping) -> dict:
+    """shallow copy of `data`"""
+    _count(len(data))
+    return dict(data)
+
+
+def copy_list(data: typing.Iterable) -> list:
+    """shallow copy of `data`"""
+    data = list(data)
+    _count(len(data))
+    return data
+
+
+def copy_child(parent: typing.MutableMapping, key: typing.Any) -> typing.Any:
+    """replace the dict or list `parent[key]` with a shallow copy (that may then be modified) and return it
+
+    Other values are returned as they are. `parent` itself has to be a copy already.
+    """
+    child = parent[key]
+    if isinstance(child, dict):
+        child = parent[key] = copy_dict(child)
+    elif isinstance(child, list):
+        child = parent[key] = copy_list(child)
+
+    return child
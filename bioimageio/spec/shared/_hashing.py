@@ -0,0 +1,138 @@
+"""parallel SHA-256 hashing of local files, memoized by (path, size, mtime_ns, inode)
+
+Digests are persisted in BIOIMAGEIO_CACHE_PATH/file_hashes.sqlite (if BIOIMAGEIO_USE_CACHE and sqlite3 is available),
+such that verifying an unchanged file again costs a single `stat`.
+"""
+import hashlib
+import mmap
+import os
+import pathlib
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from . import _cache
+from ._collection_index import sqlite3
+from ._zip_path import ZipPath
+from .common import BIOIMAGEIO_USE_CACHE
+
+# files of at least this size are memory mapped (and hashed without copying them into python buffers)
+MMAP_THRESHOLD = 64 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+FileKey = typing.Tuple[str, int, int, int]  # (path, size, mtime_ns, inode)
+
+
+def compute_sha256(path: typing.Union[os.PathLike, str, ZipPath]) -> str:
+    """compute the SHA-256 digest of a file or zip package member (without memoization)"""
+    digest = hashlib.sha256()
+    if isinstance(path, ZipPath):  # streamed from the zip file without extracting it
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(BUFFER_SIZE), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)  # hashlib releases the GIL for large buffers
+        else:
+            buffer = bytearray(BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+
+                digest.update(view[:n])
+
+    return digest.hexdigest()
+
+
+class FileHashCache:
+    """persistent (SQLite) or in-memory map of (path, size, mtime_ns, inode) to SHA-256 digests"""
+
+    def __init__(self, db_path: typing.Optional[pathlib.Path] = None):
+        self._lock = threading.Lock()
+        self._memory: typing.Dict[FileKey, str] = {}
+        if db_path is None or sqlite3 is None:
+            self._con = None
+        else:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._con = sqlite3.connect(str(db_path), timeout=30.0, check_same_thread=False, isolation_level=None)
+            with self._lock:
+                self._con.execute(
+                    "CREATE TABLE IF NOT EXISTS hashes "
+                    "(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, sha256 TEXT NOT NULL)"
+                )
+
+    def get(self, key: FileKey) -> typing.Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            elif self._con is None:
+                return None
+
+            row = self._con.execute(
+                "SELECT sha256 FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?", key
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def update(self, digests: typing.Dict[FileKey, str]) -> None:
+        with self._lock:
+            self._memory.update(digests)
+            if self._con is not None and digests:
+                self._con.executemany(
+                    "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, inode, sha256) VALUES (?, ?, ?, ?, ?)",
+                    [(*key, sha256) for key, sha256 in digests.items()],
+                )
+
+
+_file_hash_caches: typing.Dict[typing.Optional[pathlib.Path], FileHashCache] = {}
+_file_hash_caches_lock = threading.Lock()
+
+
+def get_file_hash_cache() -> FileHashCache:
+    db_path = _cache.BIOIMAGEIO_CACHE_PATH / "file_hashes.sqlite" if BIOIMAGEIO_USE_CACHE else None
+    with _file_hash_caches_lock:
+        if db_path not in _file_hash_caches:
+            _file_hash_caches[db_path] = FileHashCache(db_path)
+
+        return _file_hash_caches[db_path]
+
+
+def _get_file_key(path: pathlib.Path) -> FileKey:
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def get_sha256s(
+    paths: typing.Iterable[typing.Union[os.PathLike, str]], max_workers: typing.Optional[int] = None
+) -> typing.Dict[pathlib.Path, str]:
+    """get the SHA-256 digests of local files
+
+    Files are hashed concurrently on a thread pool of `max_workers` threads; unchanged files (same path, size,
+    modification time and inode) are not hashed again.
+
+    Returns:
+        mapping of the absolute file paths to their SHA-256 digests
+    """
+    keys = {}
+    for p in paths:
+        path = pathlib.Path(p).absolute()
+        keys[path] = _get_file_key(path)
+
+    hash_cache = get_file_hash_cache()
+    digests = {path: hash_cache.get(key) for path, key in keys.items()}
+    missing = [path for path, digest in digests.items() if digest is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            computed = dict(zip(missing, executor.map(compute_sha256, missing)))
+
+        hash_cache.update({keys[path]: digest for path, digest in computed.items()})
+        digests.update(computed)
+
+    return typing.cast(typing.Dict[pathlib.Path, str], digests)
@@ -0,0 +1,126 @@
+"""shared HTTP session for all network access of bioimageio.spec
+
+A single `requests.Session` keeps connections alive (per host pools of BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST connections),
+applies a default timeout (BIOIMAGEIO_HTTP_TIMEOUT) and retries failed idempotent requests (BIOIMAGEIO_HTTP_RETRIES).
+Callers may inject their own session with set_session(), e.g. to use a proxy or a local stand-in server in tests.
+In offline mode (see set_offline()) no session is handed out at all.
+"""
+import threading
+import typing
+
+from .common import (
+    BIOIMAGEIO_HTTP_RETRIES,
+    BIOIMAGEIO_HTTP_TIMEOUT,
+    BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST,
+    BIOIMAGEIO_OFFLINE,
+)
+
+if typing.TYPE_CHECKING:
+    import requests
+
+_session: typing.Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+_offline = BIOIMAGEIO_OFFLINE
+
+
+class OfflineError(ConnectionError):
+    """network access in offline mode"""
+
+
+def is_offline() -> bool:
+    """check if the offline mode is enabled, see set_offline()"""
+    return _offline
+
+
+def set_offline(offline: bool) -> bool:
+    """enable or disable the offline mode (default: BIOIMAGEIO_OFFLINE)
+
+    In offline mode network access is forbidden (get_session() raises an OfflineError). Remote sources are resolved
+    from the download cache and the mirror directory BIOIMAGEIO_MIRROR_PATH only, cached downloads are never
+    revalidated and validation steps that require network access are skipped with a warning.
+
+    Returns:
+        previous mode
+    """
+    global _offline
+
+    previous = _offline
+    _offline = offline
+    return previous
+
+
+def create_session(
+    *,
+    timeout: typing.Optional[float] = None,
+    retries: typing.Optional[int] = None,
+    pool_maxsize: typing.Optional[int] = None,
+) -> "requests.Session":
+    """create a session with connection pooling, a default timeout and a retry policy
+
+    Args:
+        timeout: default timeout in seconds (for connecting and between received bytes) of requests without an explicit
+            timeout; defaults to BIOIMAGEIO_HTTP_TIMEOUT
+        retries: number of retries of failed GET/HEAD requests (connection errors, 429 and 5xx responses) with
+            exponential backoff; defaults to BIOIMAGEIO_HTTP_RETRIES
+        pool_maxsize: number of connections kept alive per host; defaults to BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST
+    """
+    import requests  # not available in pyodide
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class _Session(requests.Session):
+        default_timeout: typing.Optional[float] = None
+
+        def request(self, *args, **kwargs):
+            kwargs.setdefault("timeout", self.default_timeout)
+            return super().request(*args, **kwargs)
+
+    session = _Session()
+    session.default_timeout = BIOIMAGEIO_HTTP_TIMEOUT if timeout is None else timeout
+    retry = Retry(
+        total=BIOIMAGEIO_HTTP_RETRIES if retries is None else retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,  # return the last response; callers check its status
+    )
+    pool_maxsize = max(1, BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST if pool_maxsize is None else pool_maxsize)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> "requests.Session":
+    """get the session used for all network access (a default session is created on first use)
+
+    Raises:
+        OfflineError: in offline mode
+    """
+    global _session
+
+    if _offline:
+        raise OfflineError("Network access is not allowed in offline mode (BIOIMAGEIO_OFFLINE)")
+
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+
+        return _session
+
+
+def set_session(session: typing.Optional["requests.Session"]) -> typing.Optional["requests.Session"]:
+    """set the session used for all network access
+
+    Args:
+        session: session to use; None resets to a default session (created on next use)
+
+    Returns:
+        previously set session
+    """
+    global _session
+
+    with _session_lock:
+        previous = _session
+        _session = session
+
+    return previous
@@ -0,0 +1,80 @@
+"""bounded, thread-safe in-process LRU memo with hit/miss statistics (like functools.lru_cache, but with explicit keys)"""
+import threading
+import typing
+from collections import OrderedDict
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class MemoInfo(typing.NamedTuple):
+    """statistics of an `LRUMemo` (like `functools.lru_cache().cache_info()`)"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUMemo(typing.Generic[K, V]):
+    """map of up to `maxsize` least recently used entries; a `maxsize` of 0 disables the memo"""
+
+    def __init__(self, maxsize: int = 0):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._maxsize = max(0, maxsize)
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: K) -> typing.Optional[V]:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            if not self._maxsize:
+                return
+
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+
+    def resize(self, maxsize: int) -> int:
+        """set the maximum number of entries (evicting least recently used ones); returns the previous maxsize"""
+        with self._lock:
+            previous = self._maxsize
+            self._maxsize = max(0, maxsize)
+            self._evict()
+            return previous
+
+    def clear(self) -> None:
+        """remove all entries and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> MemoInfo:
+        with self._lock:
+            return MemoInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,114 @@
+"""persistent cache of loaded raw resource descriptions in BIOIMAGEIO_CACHE_PATH (if BIOIMAGEIO_RD_DISK_CACHE)
+
+Raw resource descriptions (with the warnings emitted while loading them) are pickled by the memo key of `load_raw_resource_description` (digest of the RDF content,
+root, update_to_format, ...) in a directory per bioimageio.spec version (see `_cache.get_raw_rd_path()`), so that
+entries written by another version of bioimageio.spec are never loaded (and are removed).
+
+Unpickling may execute arbitrary code; only enable this cache for a BIOIMAGEIO_CACHE_PATH that others cannot write to.
+"""
+import io
+import json
+import os
+import pathlib
+import pickle
+import shutil
+import threading
+import typing
+import uuid
+from hashlib import sha256
+
+from marshmallow import missing
+
+from bioimageio.spec.v import __version__
+from . import _cache
+from ._zip_path import ZipPath
+from .common import BIOIMAGEIO_RD_DISK_CACHE, BIOIMAGEIO_USE_CACHE
+from .raw_nodes import ResourceDescription
+
+_MISSING_ID = "marshmallow.missing"
+
+# categories and messages of the warnings emitted while loading a raw resource description
+RecordedWarnings = typing.List[typing.Tuple[typing.Type[Warning], str]]
+
+_purge_lock = threading.Lock()
+_purged = False
+
+
+class _Pickler(pickle.Pickler):
+    """pickles the `marshmallow.missing` singleton by reference (`is missing` checks fail for a copy of it)"""
+
+    def persistent_id(self, obj):
+        return _MISSING_ID if obj is missing else None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        if pid == _MISSING_ID:
+            return missing
+
+        raise pickle.UnpicklingError(f"Unsupported persistent id {pid}")
+
+
+def is_enabled() -> bool:
+    return BIOIMAGEIO_RD_DISK_CACHE and BIOIMAGEIO_USE_CACHE
+
+
+def _get_path(key: typing.Hashable) -> pathlib.Path:
+    digest = sha256(json.dumps(key).encode("utf-8")).hexdigest()
+    return _cache.get_raw_rd_path(__version__, digest)
+
+
+def get(key: typing.Hashable) -> typing.Optional[typing.Tuple[ResourceDescription, RecordedWarnings]]:
+    """load a cached raw resource description and its warnings or return None for cache misses (and invalid entries)"""
+    try:
+        with _get_path(key).open("rb") as f:
+            entry = _Unpickler(f).load()
+    except Exception:  # missing, truncated or pickled by code that has changed since (without a version bump)
+        return None
+
+    if not isinstance(entry, tuple) or len(entry) != 2 or not isinstance(entry[0], ResourceDescription):
+        return None
+
+    return typing.cast(typing.Tuple[ResourceDescription, RecordedWarnings], entry)
+
+
+def put(key: typing.Hashable, raw_rd: ResourceDescription, rd_warnings: RecordedWarnings) -> None:
+    """cache a raw resource description and its warnings
+    (unless it references members of an open zip package, which are not picklable)"""
+    if isinstance(raw_rd.root_path, ZipPath):
+        return
+
+    buffer = io.BytesIO()
+    try:
+        _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump((raw_rd, rd_warnings))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    path = _get_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(buffer.getvalue())
+    os.replace(tmp_path, path)  # concurrent readers never see a partial entry
+    _purge_other_versions()
+
+
+def _purge_other_versions() -> None:
+    """remove raw resource descriptions cached by other versions of bioimageio.spec (once per process)"""
+    global _purged
+    with _purge_lock:
+        if _purged:
+            return
+
+        _purged = True
+
+    for version_dir in _cache.get_raw_rds_dir().iterdir():
+        if version_dir.name == __version__:
+            continue
+
+        trash = _cache.get_tmp_path().with_suffix(".evicted")
+        try:
+            os.replace(version_dir, trash)
+        except OSError:
+            continue  # removed by another process
+
+        shutil.rmtree(trash, ignore_errors=True)
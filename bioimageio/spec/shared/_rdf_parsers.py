@@ -0,0 +1,168 @@
+"""parser backends for RDF content (yaml or json)
+
+backends:
+    json     JSON content (parsed with the C accelerated standard library parser)
+    libyaml  PyYAML with libyaml bindings (CSafeLoader), resolving plain scalars like ruamel.yaml (YAML 1.2 core schema),
+             e.g. 'yes' and 'on' remain strings
+    ruamel   pure python ruamel.yaml safe loader
+
+The default backend 'auto' parses JSON content (a mapping or list) with the json backend and yaml content with the
+libyaml backend if available, falling back to ruamel. The default may be changed with BIOIMAGEIO_RDF_PARSER.
+Like ruamel.yaml, all backends reject mappings with duplicate keys.
+"""
+import io
+import json
+import os
+import pathlib
+import re
+import typing
+
+from .common import BIOIMAGEIO_RDF_PARSER, yaml
+
+try:
+    import yaml as pyyaml
+    from yaml import CSafeLoader  # PyYAML with libyaml bindings
+except ImportError:
+    pyyaml = None  # type: ignore
+    CSafeLoader = None  # type: ignore
+
+RDF_PARSERS = ("auto", "json", "libyaml", "ruamel")
+
+RDF_Content = typing.Union[os.PathLike, str, bytes, typing.IO]
+
+if CSafeLoader is not None:
+
+    class _Yaml12SafeLoader(CSafeLoader):  # type: ignore
+        """CSafeLoader resolving booleans, integers and floats according to the YAML 1.2 core schema like ruamel.yaml"""
+
+        def construct_mapping(self, node, deep=False):
+            keys = set()
+            for key_node, _ in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue  # keys of merged mappings may be overwritten
+
+                key = self.construct_object(key_node, deep=True)
+                try:
+                    is_duplicate = key in keys
+                except TypeError:
+                    continue  # unhashable key; reported by CSafeLoader.construct_mapping
+
+                if is_duplicate:
+                    raise pyyaml.constructor.ConstructorError(
+                        "while constructing a mapping",
+                        node.start_mark,
+                        f"found duplicate key {key!r}",
+                        key_node.start_mark,
+                    )
+
+                keys.add(key)
+
+            return super().construct_mapping(node, deep=deep)
+
+    _Yaml12SafeLoader.yaml_implicit_resolvers = {
+        first: [
+            (tag, regexp)
+            for tag, regexp in resolvers
+            if tag not in ("tag:yaml.org,2002:bool", "tag:yaml.org,2002:int", "tag:yaml.org,2002:float")
+        ]
+        for first, resolvers in CSafeLoader.yaml_implicit_resolvers.items()
+    }
+    _Yaml12SafeLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF")
+    )
+    _Yaml12SafeLoader.add_implicit_resolver(  # added before floats to take precedence
+        "tag:yaml.org,2002:int",
+        re.compile(r"^[-+]?(?:[0-9][0-9_]*|0o[0-7_]+|0x[0-9a-fA-F_]+|0b[01_]+)$"),
+        list("-+0123456789"),
+    )
+    _Yaml12SafeLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:float",
+        re.compile(
+            r"^(?:[-+]?(?:[0-9][0-9_]*(?:\.[0-9_]*)?|\.[0-9_]+)(?:[eE][-+]?[0-9]+)?"
+            r"|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$"
+        ),
+        list("-+0123456789."),
+    )
+
+    def _construct_yaml12_int(loader, node) -> int:
+        value = loader.construct_scalar(node).replace("_", "")
+        return int(value, 0) if re.match(r"^[-+]?0[oxb]", value) else int(value)
+
+    _Yaml12SafeLoader.add_constructor("tag:yaml.org,2002:int", _construct_yaml12_int)
+
+
+def _read(content: RDF_Content) -> typing.Union[str, bytes]:
+    if isinstance(content, (str, bytes)):
+        return content
+    elif isinstance(content, os.PathLike):
+        return pathlib.Path(content).read_bytes()
+    else:
+        return content.read()
+
+
+def _looks_like_json(content: typing.Union[str, bytes]) -> bool:
+    start = content[:64].lstrip()
+    if isinstance(start, bytes):
+        start = start.lstrip(b"\xef\xbb\xbf")  # utf-8 byte order mark
+        return start[:1] in (b"{", b"[")
+    else:
+        return start.lstrip("\ufeff")[:1] in ("{", "[")
+
+
+def _dict_without_duplicate_keys(pairs: typing.List[typing.Tuple[str, typing.Any]]) -> dict:
+    ret = dict(pairs)
+    if len(ret) != len(pairs):
+        keys: typing.Set[str] = set()
+        for key, _ in pairs:
+            if key in keys:
+                raise ValueError(f"found duplicate key {key!r}")
+
+            keys.add(key)
+
+    return ret
+
+
+def _parse_json(content: typing.Union[str, bytes]) -> typing.Any:
+    return json.loads(content, object_pairs_hook=_dict_without_duplicate_keys)
+
+
+def get_rdf_parser(parser: typing.Optional[str] = None) -> str:
+    """validate the name of an RDF parser backend (default: BIOIMAGEIO_RDF_PARSER)"""
+    parser = BIOIMAGEIO_RDF_PARSER if parser is None else parser
+    if parser not in RDF_PARSERS:
+        raise ValueError(f"Unknown RDF parser '{parser}'; choose from {RDF_PARSERS}")
+    elif parser == "libyaml" and CSafeLoader is None:
+        raise ValueError("RDF parser 'libyaml' requires PyYAML with libyaml bindings")
+    elif parser == "ruamel" and yaml is None:
+        raise ValueError("RDF parser 'ruamel' requires ruamel.yaml")
+
+    return parser
+
+
+def parse_rdf(content: RDF_Content, parser: typing.Optional[str] = None) -> typing.Any:
+    """parse yaml or json RDF content
+
+    Args:
+        content: path to, yaml/json string or bytes of, or stream of the content
+        parser: parser backend, one of RDF_PARSERS; default: BIOIMAGEIO_RDF_PARSER
+    """
+    parser = get_rdf_parser(parser)
+    data = _read(content)
+    if parser == "auto":
+        if _looks_like_json(data):
+            try:
+                return _parse_json(data)
+            except ValueError:
+                pass  # e.g. a yaml flow mapping; json is a subset of yaml
+
+        parser = "ruamel" if CSafeLoader is None else "libyaml"
+
+    if parser == "json":
+        return _parse_json(data)
+    elif parser == "libyaml":
+        return pyyaml.load(data, Loader=_Yaml12SafeLoader)
+    else:
+        if yaml is None:
+            raise RuntimeError("Cannot parse yaml without ruamel.yaml dependency!")
+
+        return yaml.load(io.BytesIO(data) if isinstance(data, bytes) else data)
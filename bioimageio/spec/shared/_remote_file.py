@@ -0,0 +1,202 @@
+"""random access to remote files with HTTP range requests
+
+A RemoteFile is a read-only, seekable file object; e.g. `zipfile.ZipFile(RemoteFile(url))` reads the central directory
+and single members of a remote zip package without downloading all of it.
+"""
+import collections
+import io
+import re
+import threading
+import typing
+
+from ._http import get_session
+
+# the end of central directory record (22 bytes + a comment of up to 64 KiB) of a zip file is within its last bytes
+TAIL_SIZE = 64 * 1024
+TAIL_RANGE = f"bytes=-{TAIL_SIZE}"
+BLOCK_SIZE = 64 * 1024  # minimum number of bytes requested at once
+MAX_SEGMENTS = 16  # number of received byte ranges kept in memory (in addition to the tail)
+
+_CONTENT_RANGE_REGEX = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class RangeRequestsNotSupported(IOError):
+    pass
+
+
+class MissingRange(Exception):
+    """bytes [start, end) of a RemoteFile that does not fetch missing ranges itself (see `RemoteFile.fetch_missing`)
+
+    (not an OSError, so that it is not turned into a zipfile.BadZipFile while reading a zip file)
+    """
+
+    def __init__(self, start: int, end: int):
+        super().__init__(f"missing bytes {start}-{end - 1}")
+        self.start = start
+        self.end = end
+
+
+def check_tail_response(url: str, status_code: int, headers: typing.Mapping[str, str]) -> typing.Match:
+    """check the response to a request for the tail of a file (`Range: TAIL_RANGE`) before reading its content
+
+    Returns:
+        match of its Content-Range header
+
+    Raises:
+        RangeRequestsNotSupported: if the server does not respond to a range request with partial content
+    """
+    content_range = _CONTENT_RANGE_REGEX.match(headers.get("Content-Range", ""))
+    if status_code != 206 or content_range is None:
+        raise RangeRequestsNotSupported(f"{url} does not support range requests (status {status_code})")
+
+    return content_range
+
+
+class RemoteFile(io.RawIOBase):
+    """read-only file object that reads a remote file with HTTP range requests
+
+    Args:
+        url: url of the remote file
+        block_size: minimum number of bytes requested at once
+        tail: response to a request for the tail of the file (`Range: TAIL_RANGE`) as status code, headers and
+            content, e.g. received with another HTTP client; default: request the tail (with the requests session)
+
+    Raises:
+        RangeRequestsNotSupported: if the server does not respond to a range request with partial content
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        block_size: int = BLOCK_SIZE,
+        tail: typing.Optional[typing.Tuple[int, typing.Mapping[str, str], bytes]] = None,
+    ):
+        super().__init__()
+        self.name = url  # e.g. zipfile.ZipFile(RemoteFile(url)).filename
+        self.block_size = block_size
+        self.n_requests = 0
+        self.n_bytes_received = 0
+        # if False, reading bytes that have not been received raises MissingRange; they may be requested with another
+        # HTTP client (see `get_range_headers()`) and added with `add_range()`
+        self.fetch_missing = True
+        self._pos = 0
+        self._lock = threading.Lock()
+        self._validator: typing.Optional[str] = None  # (strong) ETag or Last-Modified, see If-Range
+
+        # the first request for the tail of the file determines its size
+        if tail is None:
+            r = get_session().get(url, headers={"Range": TAIL_RANGE}, stream=True)
+            try:
+                check_tail_response(url, r.status_code, r.headers)
+                tail = (r.status_code, r.headers, r.content)
+            finally:
+                r.close()
+
+        status_code, headers, content = tail
+        content_range = check_tail_response(url, status_code, headers)
+        self.size = int(content_range.group(3))
+        etag = headers.get("ETag")
+        self._validator = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+        self._count(len(content))
+        self._tail = (int(content_range.group(1)), content)
+        self._segments: typing.Deque[typing.Tuple[int, bytes]] = collections.deque(maxlen=MAX_SEGMENTS)
+
+    def _count(self, n_bytes: int) -> None:
+        self.n_requests += 1
+        self.n_bytes_received += n_bytes
+
+    def get_range_headers(self, start: int, end: int) -> typing.Dict[str, str]:
+        """headers of a request for bytes [start, end)"""
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        if self._validator is not None:
+            headers["If-Range"] = self._validator
+
+        return headers
+
+    def check_range_response(self, start: int, end: int, status_code: int, headers: typing.Mapping[str, str]) -> None:
+        """check the response to a request for bytes [start, end) before reading its content
+
+        A changed remote file is answered with the full content (status 200), which should not be read.
+        """
+        content_range = _CONTENT_RANGE_REGEX.match(headers.get("Content-Range", ""))
+        if (
+            status_code != 206
+            or content_range is None
+            or int(content_range.group(1)) != start
+            or int(content_range.group(3)) != self.size
+        ):
+            raise IOError(f"Failed to read bytes {start}-{end - 1} of {self.name} (status {status_code})")
+
+    def _check_received(self, start: int, end: int, data: bytes) -> None:
+        self._count(len(data))
+        if len(data) != end - start:
+            raise IOError(f"Failed to read bytes {start}-{end - 1} of {self.name} (received {len(data)} bytes)")
+
+    def add_range(self, start: int, end: int, data: bytes) -> None:
+        """add the received content of a (checked, see check_range_response()) response for bytes [start, end)"""
+        self._check_received(start, end, data)
+        with self._lock:
+            self._segments.append((start, data))
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """request bytes [start, end)"""
+        r = get_session().get(self.name, headers=self.get_range_headers(start, end), stream=True)
+        try:
+            self.check_range_response(start, end, r.status_code, r.headers)
+            data = r.content
+        finally:
+            r.close()
+
+        self._check_received(start, end, data)
+        return data
+
+    def _read_at(self, start: int, n: int) -> bytes:
+        end = min(self.size, start + n)
+        if start >= end:
+            return b""
+
+        for seg_start, data in [self._tail, *self._segments]:
+            if seg_start <= start and end <= seg_start + len(data):
+                return data[start - seg_start : end - seg_start]
+
+        fetch_end = min(self.size, max(end, start + self.block_size))
+        if not self.fetch_missing:
+            raise MissingRange(start, fetch_end)
+
+        data = self._fetch(start, fetch_end)
+        self._segments.append((start, data))
+        return data[: end - start]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+
+        self._pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        with self._lock:
+            data = self._read_at(self._pos, len(b))
+            b[: len(data)] = data
+            self._pos += len(data)
+
+        return len(data)
@@ -1,23 +1,39 @@
+import contextlib
+import hashlib
 import json
 import os
 import pathlib
 import re
 import shutil
+import threading
+import time
 import typing
 import warnings
 import zipfile
-from functools import singledispatch
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import singledispatch, wraps
 from io import BytesIO, StringIO
 from tempfile import TemporaryDirectory
-from urllib.request import url2pathname, urlopen
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
 
 from marshmallow import ValidationError
 
-from . import fields, raw_nodes
+from . import _cache, fields, raw_nodes
+from ._cache import CachePolicy
+from ._http import get_session, is_offline
+from ._rdf_parsers import parse_rdf
+from ._remote_file import RangeRequestsNotSupported, RemoteFile
+from ._zip_path import ZipPath, get_package_member
+from ._collection_index import CollectionIndex, iter_collection_entries, sqlite3
 from .common import (
     BIOIMAGEIO_CACHE_PATH,
     BIOIMAGEIO_CACHE_WARNINGS_LIMIT,
     BIOIMAGEIO_COLLECTION_URL,
+    BIOIMAGEIO_DOI_CACHE_TTL,
+    BIOIMAGEIO_HTTP_RETRIES,
+    BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST,
+    BIOIMAGEIO_MAX_DOWNLOAD_WORKERS,
     BIOIMAGEIO_SITE_CONFIG_URL,
     BIOIMAGEIO_USE_CACHE,
     DOI_REGEX,
@@ -26,11 +42,13 @@ from .common import (
     get_spec_type_from_type,
     no_cache_tmp_list,
     tqdm,
-    yaml,
 )
 from .raw_nodes import URI
 
 
+T = typing.TypeVar("T")
+
+
 class DownloadCancelled(Exception):
     # raise this exception to stop _download_url
     pass
@@ -49,12 +67,219 @@ def _is_path(s: typing.Any) -> bool:
 class RDF_Source(typing.NamedTuple):
     data: dict
     name: str
-    root: typing.Union[pathlib.Path, raw_nodes.URI]
+    root: typing.Union[pathlib.Path, raw_nodes.URI, ZipPath]
+
+
+# DOI prefixes of Zenodo records and the corresponding records API
+_ZENODO_RECORD_APIS = {
+    "10.5281/zenodo.": "https://zenodo.org/api/records",
+    "10.5072/zenodo.": "https://sandbox.zenodo.org/api/records",  # zenodo sandbox doi (which is not a valid doi)
+}
+
+
+def _resolve_rdf_source_id(source: str, source_name: str) -> str:
+    """resolve a bioimage.io id, nickname or doi to the url of its RDF; other strings are returned unchanged"""
+    collection_entries = get_bioimageio_collection_entries() or {}
+    bioimageio_rdf_source: typing.Optional[str] = collection_entries.get(source, (None, None))[1]
+
+    if bioimageio_rdf_source is not None:
+        # source is bioimageio id or bioimageio nickname
+        source = bioimageio_rdf_source
+    elif re.fullmatch(DOI_REGEX, source):  # turn doi into url
+        source = _resolve_doi(source, source_name)
+
+    return source
+
+
+def _resolve_doi(doi: str, source_name: str) -> str:
+    """resolve a doi to the url of its RDF (or packaged resource)
+
+    Resolved dois are cached (if BIOIMAGEIO_USE_CACHE): dois of a specific version (e.g. of a Zenodo record version)
+    indefinitely, other (concept) dois for BIOIMAGEIO_DOI_CACHE_TTL seconds.
+    """
+    if BIOIMAGEIO_USE_CACHE:
+        # in offline mode expired resolutions are used as well
+        url = _cache.get_resolved_doi(doi, max_age=float("inf") if is_offline() else BIOIMAGEIO_DOI_CACHE_TTL)
+        if url is not None:
+            return url
+
+    url, is_versioned = _resolve_doi_online(doi, source_name)
+    if BIOIMAGEIO_USE_CACHE:
+        _cache.set_resolved_doi(doi, url, immutable=is_versioned)
+
+    return url
+
+
+def _resolve_doi_online(doi: str, source_name: str) -> typing.Tuple[str, bool]:
+    """resolve a doi to the url of its RDF (or packaged resource)
+
+    Returns:
+        url and whether the doi refers to an immutable version of the resource
+    """
+    zenodo_prefix: typing.Optional[str] = None
+    for prefix, record_api in _ZENODO_RECORD_APIS.items():
+        if doi.startswith(prefix):
+            zenodo_prefix, zenodo_record_api = prefix, record_api
+            break
+
+    if zenodo_prefix is not None:
+        # source is a doi pointing to a zenodo record;
+        # we'll expect an rdf.yaml file in that record and use it as source...
+        record_id = doi[len(zenodo_prefix) :]
+        s_count = record_id.count("/")
+        if s_count:
+            # record_id/record_version_id
+            if s_count != 1:
+                warnings.warn(
+                    f"Unexpected Zenodo record ids: {record_id}. "
+                    f"Expected <concept id> or <concept id>/<version id>."
+                )
+
+            record_id = record_id.split("/")[-1]
+
+        response = get_session().get(f"{zenodo_record_api}/{record_id}")
+        if not response.ok:
+            raise RuntimeError(response.status_code)
+
+        zenodo_record = response.json()
+        for rdf_name in RDF_NAMES:
+            for f in zenodo_record["files"]:
+                if f["key"] == rdf_name:
+                    url = f["links"]["self"]
+                    break
+            else:
+                continue
+
+            break
+        else:
+            raise ValidationError(f"No RDF found; looked for {RDF_NAMES}")
+
+        # a concept record id resolves to its latest version record; a version record is immutable
+        is_versioned = str(zenodo_record.get("id")) == record_id and str(zenodo_record.get("conceptrecid")) != record_id
+        return url, is_versioned
+    else:
+        # resolve doi
+        # todo: make sure the resolved url points to a rdf.yaml or a zipped package
+        with get_session().get(f"https://doi.org/{doi}?type=URL", stream=True) as response:
+            url = response.url
+
+        assert isinstance(url, str)
+        if not (url.endswith(".yaml") or url.endswith(".zip")):
+            raise NotImplementedError(
+                f"Resolved doi {source_name} to {url}, but don't know where to find 'rdf.yaml' "
+                f"or a packaged resource zip file."
+            )
+
+        return url, False
 
 
 def resolve_rdf_source(
-    source: typing.Union[dict, os.PathLike, typing.IO, str, bytes, URI, raw_nodes.ResourceDescription]
+    source: typing.Union[
+        dict, os.PathLike, typing.IO, str, bytes, URI, ZipPath, raw_nodes.ResourceDescription, RDF_Source
+    ],
+    cache_policy: typing.Optional[CachePolicy] = None,
+    rdf_parser: typing.Optional[str] = None,
 ) -> RDF_Source:
+    """resolve an RDF source to its content, a name and its root
+
+    Args:
+        source: RDF source; e.g. a path, url, doi, bioimage.io id or nickname, yaml string, bytes or dict
+        cache_policy: freshness policy for a cached remote RDF; default: revalidate cached RDFs
+        rdf_parser: parser backend for yaml/json content (see `bioimageio.spec.shared.RDF_PARSERS`);
+            default: BIOIMAGEIO_RDF_PARSER
+    """
+    if cache_policy is None:
+        cache_policy = CachePolicy(revalidate=True)
+
+    cache_policy = _with_offline_mode(cache_policy)
+    if isinstance(source, RDF_Source):  # already resolved, e.g. by aresolve_rdf_source
+        return RDF_Source(dict(source.data), source.name, source.root)
+
+    source, source_name, root = _prepare_rdf_source(source)
+    if isinstance(source, str):
+        # source might be bioimageio nickname, id, doi, url or file path -> resolve to pathlib.Path
+        source = _resolve_rdf_source_id(source, source_name)
+        if source.startswith("http"):
+            source_url = raw_nodes.URI(uri_string=source)
+            remote_package = _open_remote_package(source_url, cache_policy)
+            if remote_package is not None:
+                return _load_rdf_from_package(remote_package, source_name, rdf_parser)
+
+            source = _download_url(source_url, cache_policy=cache_policy)
+            root = source_url.parent
+
+        if _is_path(source):
+            source = pathlib.Path(source)
+
+    return _load_rdf_source(source, source_name, root, rdf_parser)
+
+
+def _is_remote_package(url: raw_nodes.URI, cache_policy: CachePolicy) -> bool:
+    """whether `url` points to a zip package to read with range requests (see _open_remote_package)"""
+    if not url.path.endswith(".zip") or cache_policy.offline:
+        return False
+    elif BIOIMAGEIO_USE_CACHE and _cache.lookup(str(url)) is not None:
+        return False  # revalidate the cached package instead
+    else:
+        return True
+
+
+def _open_remote_package(url: raw_nodes.URI, cache_policy: CachePolicy) -> typing.Optional[ZipPath]:
+    """open a remote zip package with range requests, such that its RDF is read without downloading the package
+
+    Returns:
+        root of the remote package or None if the package should be downloaded instead (if `url` does not point to a
+        zip file, the package is already in the download cache or the server does not support range requests)
+    """
+    if not _is_remote_package(url, cache_policy):
+        return None
+
+    try:
+        return ZipPath(zipfile.ZipFile(typing.cast(typing.IO[bytes], RemoteFile(str(url)))))  # a seekable raw file
+    except RangeRequestsNotSupported:
+        return None
+    except (OSError, zipfile.BadZipFile) as e:  # (requests exceptions are OSErrors)
+        warnings.warn(f"Failed to read {url} with range requests ({e}). Downloading it instead.")
+        return None
+
+
+def _download_remote_package(package: ZipPath) -> ZipPath:
+    """download a remote package opened with range requests (see _open_remote_package), e.g. to extract all of it
+
+    Returns:
+        the same member of the package downloaded (with a single, resumable request) into the download cache or
+        `package` itself if it is not a remote package
+    """
+    remote_file = package.zip_file.fp
+    if not isinstance(remote_file, RemoteFile):
+        return package
+
+    return ZipPath(_download_url(raw_nodes.URI(uri_string=remote_file.name))) / package.at
+
+
+def _load_rdf_from_package(package: ZipPath, source_name: str, rdf_parser: typing.Optional[str] = None) -> RDF_Source:
+    for rdf_name in RDF_NAMES:
+        if (package / rdf_name).is_file():
+            break
+    else:
+        raise ValueError(f"Missing 'rdf.yaml' in package {source_name}")
+
+    data = parse_rdf((package / rdf_name).read_bytes(), rdf_parser)
+    if not isinstance(data, dict):
+        raise TypeError(f"Expected dict type for loaded source, but got: {type(data)}.")
+
+    return RDF_Source(data, source_name, package)
+
+
+def _prepare_rdf_source(
+    source: typing.Union[dict, os.PathLike, typing.IO, str, bytes, URI, ZipPath, raw_nodes.ResourceDescription]
+) -> typing.Tuple[
+    typing.Union[dict, pathlib.Path, str, bytes], str, typing.Union[pathlib.Path, raw_nodes.URI, ZipPath]
+]:
+    """reduce the possible RDF source types and determine a name and root of the source"""
+    if isinstance(source, ZipPath):  # RDF in a zipped package, e.g. a collection entry
+        return source.read_text(), str(source), source.parent
+
     # reduce possible source types
     if isinstance(source, (BytesIO, StringIO)):
         source = source.getvalue()
@@ -72,14 +297,14 @@ def resolve_rdf_source(
 
     if isinstance(source, pathlib.Path):
         source_name = str(source)
-        root: typing.Union[pathlib.Path, raw_nodes.URI] = source.parent
+        root: typing.Union[pathlib.Path, raw_nodes.URI, ZipPath] = source.parent
     elif isinstance(source, dict):
         source_name = f"{{name: {source.get('name', '<unknown>')}, ...}}"
         source = dict(source)
         given_root = source.pop("root_path", pathlib.Path())
         if _is_path(given_root):
             root = pathlib.Path(given_root)
-        elif isinstance(given_root, URI):
+        elif isinstance(given_root, (URI, ZipPath)):
             root = given_root
         elif isinstance(given_root, str):
             root = URI(uri_string=given_root)
@@ -90,99 +315,28 @@ def resolve_rdf_source(
         # string might be path or yaml string; for yaml string (or bytes) set root to cwd
 
         if _is_path(source):
-            assert isinstance(source, (str, os.PathLike))
+            assert isinstance(source, str)
             root = pathlib.Path(source).parent
         else:
             root = pathlib.Path()
     else:
         raise TypeError(source)
 
-    if isinstance(source, str):
-        # source might be bioimageio nickname, id, doi, url or file path -> resolve to pathlib.Path
+    return source, source_name, root
 
-        bioimageio_rdf_source: typing.Optional[str] = (BIOIMAGEIO_COLLECTION_ENTRIES or {}).get(source, (None, None))[1]
-
-        if bioimageio_rdf_source is not None:
-            # source is bioimageio id or bioimageio nickname
-            source = bioimageio_rdf_source
-        elif re.fullmatch(DOI_REGEX, source):  # turn doi into url
-            import requests  # not available in pyodide
-
-            zenodo_prefix = "10.5281/zenodo."
-            zenodo_record_api = "https://zenodo.org/api/records"
-            zenodo_sandbox_prefix = "10.5072/zenodo."
-            zenodo_sandbox_record_api = "https://sandbox.zenodo.org/api/records"
-            is_zenodo_doi = False
-            if source.startswith(zenodo_prefix):
-                is_zenodo_doi = True
-            elif source.startswith(zenodo_sandbox_prefix):
-                # zenodo sandbox doi (which is not a valid doi)
-                zenodo_prefix = zenodo_sandbox_prefix
-                zenodo_record_api = zenodo_sandbox_record_api
-                is_zenodo_doi = True
-
-            if is_zenodo_doi:
-                # source is a doi pointing to a zenodo record;
-                # we'll expect an rdf.yaml file in that record and use it as source...
-                record_id = source[len(zenodo_prefix) :]
-                s_count = record_id.count("/")
-                if s_count:
-                    # record_id/record_version_id
-                    if s_count != 1:
-                        warnings.warn(
-                            f"Unexpected Zenodo record ids: {record_id}. "
-                            f"Expected <concept id> or <concept id>/<version id>."
-                        )
-
-                    record_id = record_id.split("/")[-1]
-
-                response = requests.get(f"{zenodo_record_api}/{record_id}")
-                if not response.ok:
-                    raise RuntimeError(response.status_code)
-
-                zenodo_record = response.json()
-                for rdf_name in RDF_NAMES:
-                    for f in zenodo_record["files"]:
-                        if f["key"] == rdf_name:
-                            source = f["links"]["self"]
-                            break
-                    else:
-                        continue
-
-                    break
-                else:
-                    raise ValidationError(f"No RDF found; looked for {RDF_NAMES}")
-
-            else:
-                # resolve doi
-                # todo: make sure the resolved url points to a rdf.yaml or a zipped package
-                response = urlopen(f"https://doi.org/{source}?type=URL")
-                source = response.url
-                assert isinstance(source, str)
-                if not (source.endswith(".yaml") or source.endswith(".zip")):
-                    raise NotImplementedError(
-                        f"Resolved doi {source_name} to {source}, but don't know where to find 'rdf.yaml' "
-                        f"or a packaged resource zip file."
-                    )
-
-        assert isinstance(source, str)
-        if source.startswith("http"):
-            source_url = raw_nodes.URI(uri_string=source)
-            source = _download_url(source_url)
-            root = source_url.parent
-
-        if _is_path(source):
-            source = pathlib.Path(source)
 
+def _load_rdf_source(
+    source: typing.Union[dict, pathlib.Path, str, bytes],
+    source_name: str,
+    root: typing.Union[pathlib.Path, raw_nodes.URI, ZipPath],
+    rdf_parser: typing.Optional[str] = None,
+) -> RDF_Source:
+    """load RDF content from a local path, yaml string or bytes (of a yaml file or zip package)"""
     if isinstance(source, (pathlib.Path, str, bytes)):
         # source is either:
         #   - a file path (to a yaml or a packaged zip)
         #   - a yaml string,
         #   - or yaml file or zip package content as bytes
-
-        if yaml is None:
-            raise RuntimeError(f"Cannot read RDF from {source_name} without ruamel.yaml dependency!")
-
         if isinstance(source, bytes):
             potential_package: typing.Union[pathlib.Path, typing.IO, str] = BytesIO(source)
             potential_package.seek(0)  # type: ignore
@@ -203,9 +357,9 @@ def resolve_rdf_source(
                     root = pathlib.Path()
 
                 assert isinstance(source, (pathlib.Path, bytes))
-                source = BytesIO(zf.read(rdf_name))
+                source = zf.read(rdf_name)
 
-        source = yaml.load(source)
+        source = parse_rdf(source, rdf_parser)
 
     if not isinstance(source, dict):
         raise TypeError(
@@ -217,16 +371,25 @@ def resolve_rdf_source(
 
 
 def resolve_rdf_source_and_type(
-    source: typing.Union[os.PathLike, typing.IO, bytes, str, dict, raw_nodes.URI]
-) -> typing.Tuple[dict, str, typing.Union[pathlib.Path, raw_nodes.URI], str]:
-    data, source_name, root = resolve_rdf_source(source)
+    source: typing.Union[os.PathLike, typing.IO, bytes, str, dict, raw_nodes.URI, RDF_Source],
+    cache_policy: typing.Optional[CachePolicy] = None,
+    rdf_parser: typing.Optional[str] = None,
+) -> typing.Tuple[dict, str, typing.Union[pathlib.Path, raw_nodes.URI, ZipPath], str]:
+    data, source_name, root = resolve_rdf_source(source, cache_policy=cache_policy, rdf_parser=rdf_parser)
 
     type_ = get_spec_type_from_type(data.get("type"))
     return data, source_name, root, type_
 
 
 @singledispatch  # todo: fix type annotations
-def resolve_source(source, root_path: typing.Union[os.PathLike, URI] = pathlib.Path(), output=None, pbar=None):
+def resolve_source(
+    source,
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
+    output=None,
+    pbar=None,
+    sha256=None,
+    cache_policy=None,
+):
     """Resolve sources to local files
 
     Args:
@@ -237,6 +400,11 @@ def resolve_source(source, root_path: typing.Union[os.PathLike, URI] = pathlib.P
           pbar is only used in the case of downloading resources. Specifying a custom pbar here
           helps adding features like progress reporting (outside the cmd) and cancellation
           (by raising DownloadCancelled).
+        sha256: expected SHA-256 digest of a remote source (e.g. from a weights entry); cached downloads not
+          matching it are not reused. The digest is computed while downloading and a mismatch raises a RuntimeError
+          (the download is not cached).
+        cache_policy: freshness policy for cached downloads (see CachePolicy); default: use cached downloads without
+          revalidation.
     """
     raise TypeError(type(source))
 
@@ -244,13 +412,15 @@ def resolve_source(source, root_path: typing.Union[os.PathLike, URI] = pathlib.P
 @resolve_source.register
 def _resolve_source_uri_node(
     source: raw_nodes.URI,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[os.PathLike] = None,
     pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> pathlib.Path:
     path_or_remote_uri = resolve_local_source(source, root_path, output)
     if isinstance(path_or_remote_uri, raw_nodes.URI):
-        local_path = _download_url(path_or_remote_uri, output, pbar=pbar)
+        local_path = _download_url(path_or_remote_uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
     elif isinstance(path_or_remote_uri, pathlib.Path):
         local_path = path_or_remote_uri
     else:
@@ -262,26 +432,44 @@ def _resolve_source_uri_node(
 @resolve_source.register
 def _resolve_source_str(
     source: str,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[os.PathLike] = None,
     pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> pathlib.Path:
-    return resolve_source(fields.Union([fields.URI(), fields.Path()]).deserialize(source), root_path, output, pbar)
+    return resolve_source(
+        fields.Union([fields.URI(), fields.Path()]).deserialize(source),
+        root_path,
+        output,
+        pbar,
+        sha256=sha256,
+        cache_policy=cache_policy,
+    )
 
 
 @resolve_source.register
 def _resolve_source_path(
     source: pathlib.Path,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[os.PathLike] = None,
     pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> pathlib.Path:
     if not os.path.isabs(source):
         if isinstance(root_path, os.PathLike):
             root_path = pathlib.Path(root_path).resolve()
-        source = root_path / source
-        if isinstance(source, URI):
-            return resolve_source(source, output=output, pbar=pbar)
+        source_from_root = root_path / source
+        if isinstance(source_from_root, (URI, ZipPath)):
+            return resolve_source(source_from_root, output=output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+
+        source = source_from_root
+
+    if not source.exists():
+        member = get_package_member(source)
+        if member is not None:  # a package member that has not been extracted (yet)
+            return member.materialize(output)
 
     if output is None:
         return source
@@ -293,43 +481,105 @@ def _resolve_source_path(
         return pathlib.Path(output)
 
 
+@resolve_source.register
+def _resolve_source_zip_path(
+    source: ZipPath,
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> pathlib.Path:
+    return source.materialize(output)
+
+
 @resolve_source.register
 def _resolve_source_resolved_importable_path(
     source: raw_nodes.ResolvedImportableSourceFile,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[os.PathLike] = None,
     pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> raw_nodes.ResolvedImportableSourceFile:
     return raw_nodes.ResolvedImportableSourceFile(
-        callable_name=source.callable_name, source_file=resolve_source(source.source_file, root_path, output, pbar)
+        callable_name=source.callable_name,
+        source_file=resolve_source(
+            source.source_file, root_path, output, pbar, sha256=sha256, cache_policy=cache_policy
+        ),
     )
 
 
 @resolve_source.register
 def _resolve_source_importable_path(
     source: raw_nodes.ImportableSourceFile,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[os.PathLike] = None,
     pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> raw_nodes.ResolvedImportableSourceFile:
     return raw_nodes.ResolvedImportableSourceFile(
-        callable_name=source.callable_name, source_file=resolve_source(source.source_file, root_path, output, pbar)
+        callable_name=source.callable_name,
+        source_file=resolve_source(
+            source.source_file, root_path, output, pbar, sha256=sha256, cache_policy=cache_policy
+        ),
     )
 
 
 @resolve_source.register
 def _resolve_source_list(
     source: list,
-    root_path: typing.Union[os.PathLike, URI] = pathlib.Path(),
+    root_path: typing.Union[os.PathLike, URI, ZipPath] = pathlib.Path(),
     output: typing.Optional[typing.Sequence[typing.Optional[os.PathLike]]] = None,
-    pbar: typing.Optional[typing.Sequence] = None,
+    pbar=None,
+    sha256: typing.Optional[typing.Sequence[typing.Optional[str]]] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
 ) -> typing.List[pathlib.Path]:
+    """resolve all elements of `source` concurrently (see BIOIMAGEIO_MAX_DOWNLOAD_WORKERS)
+
+    `output`, `pbar` and `sha256` may be given per element; a single `pbar` is used for all downloads.
+    """
     assert output is None or len(output) == len(source)
-    assert pbar is None or len(pbar) == len(source)
-    return [
-        resolve_source(el, root_path, out, pb)
-        for el, out, pb in zip(source, output or [None] * len(source), pbar or [None] * len(source))
-    ]
+    assert sha256 is None or len(sha256) == len(source)
+    if pbar is None or callable(pbar):
+        pbar = [pbar] * len(source)
+
+    assert len(pbar) == len(source)
+
+    def resolve(el, out, pb, digest):
+        return resolve_source(el, root_path, out, pb, sha256=digest, cache_policy=cache_policy)
+
+    args = list(zip(source, output or [None] * len(source), pbar, sha256 or [None] * len(source)))
+    return [f.result() for f in _map_concurrently(resolve, args)]
+
+
+def _map_concurrently(
+    func: typing.Callable[..., T], args: typing.Sequence[typing.Sequence[typing.Any]]
+) -> typing.List["Future[T]"]:
+    """call `func(*a)` for all `a` in `args` concurrently (with up to BIOIMAGEIO_MAX_DOWNLOAD_WORKERS threads),
+    e.g. to download or resolve many sources at once
+
+    Returns:
+        the completed futures of the calls (in order of `args`); a failed call's future holds its exception
+    """
+    if len(args) <= 1 or BIOIMAGEIO_MAX_DOWNLOAD_WORKERS <= 1:
+        futures: typing.List["Future[T]"] = []
+        for a in args:
+            future: "Future[T]" = Future()
+            try:
+                future.set_result(func(*a))
+            except Exception as e:
+                future.set_exception(e)
+
+            futures.append(future)
+
+        return futures
+
+    # a pool per call (instead of a shared one) avoids deadlocks for nested calls;
+    # the total load on a single host is bounded by BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST
+    with ThreadPoolExecutor(max_workers=min(len(args), BIOIMAGEIO_MAX_DOWNLOAD_WORKERS)) as executor:
+        return [executor.submit(func, *a) for a in args]
 
 
 def resolve_local_sources(
@@ -347,7 +597,7 @@ def resolve_local_sources(
 
 def resolve_local_source(
     source: typing.Union[str, os.PathLike, raw_nodes.URI],
-    root_path: typing.Union[os.PathLike, URI],
+    root_path: typing.Union[os.PathLike, URI, ZipPath],
     output: typing.Optional[os.PathLike] = None,
 ) -> typing.Union[pathlib.Path, raw_nodes.URI]:
     if isinstance(source, os.PathLike) or isinstance(source, str):
@@ -382,7 +632,7 @@ def resolve_local_source(
     assert isinstance(uri, raw_nodes.URI), uri
     if uri.scheme == "file":
         local_path_or_remote_uri: typing.Union[pathlib.Path, raw_nodes.URI] = pathlib.Path(url2pathname(uri.path))
-    elif uri.scheme in ("https", "https"):
+    elif uri.scheme in ("http", "https"):
         local_path_or_remote_uri = uri
     else:
         raise ValueError(f"Unknown uri scheme {uri.scheme}")
@@ -390,23 +640,17 @@ def resolve_local_source(
     return local_path_or_remote_uri
 
 
-def source_available(source: typing.Union[pathlib.Path, raw_nodes.URI], root_path: pathlib.Path) -> bool:
+def source_available(
+    source: typing.Union[pathlib.Path, raw_nodes.URI, ZipPath], root_path: typing.Union[pathlib.Path, ZipPath]
+) -> bool:
+    if isinstance(source, ZipPath):
+        return source.exists()
+    elif isinstance(root_path, ZipPath) and isinstance(source, pathlib.PurePath) and not source.is_absolute():
+        return (root_path / source).exists()
+
     local_path_or_remote_uri = resolve_local_source(source, root_path)
     if isinstance(local_path_or_remote_uri, raw_nodes.URI):
-        import requests  # not available in pyodide
-
-        response = requests.head(str(local_path_or_remote_uri))
-        for n_redirect in range(100):
-            if (
-                response.status_code in (301, 302, 307, 308)
-                and response.next is not None
-                and response.next.url is not None
-            ):
-                response = requests.head(response.next.url)
-            else:
-                break
-
-        available = response.status_code == 200
+        available = _get_url_status(str(local_path_or_remote_uri)) == 200
     elif isinstance(local_path_or_remote_uri, pathlib.Path):
         available = local_path_or_remote_uri.exists()
     else:
@@ -415,73 +659,491 @@ def source_available(source: typing.Union[pathlib.Path, raw_nodes.URI], root_pat
     return available
 
 
+def sources_available(
+    sources: typing.Sequence[typing.Union[str, os.PathLike, raw_nodes.URI, ZipPath]],
+    root_path: typing.Union[os.PathLike, str, ZipPath] = pathlib.Path(),
+) -> typing.List[bool]:
+    """check if many sources are available
+
+    Local paths (relative to `root_path`) are checked with a single `stat` each. Remote URLs are checked with HEAD
+    requests that run concurrently (bounded by BIOIMAGEIO_MAX_DOWNLOAD_WORKERS and BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST);
+    redirect chains and final status codes are memoized for the lifetime of the process (except for transient errors:
+    server errors, request timeouts (408) and rate limits (429)).
+    Sources that cannot be checked (unknown URI schemes, failing requests) are reported as not available.
+    """
+    available: typing.List[typing.Optional[bool]] = [None] * len(sources)
+    urls: typing.Dict[str, typing.List[int]] = {}  # url -> indices into sources
+    for i, source in enumerate(sources):
+        if isinstance(source, str) and re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]+://", source):
+            source = fields.URI().deserialize(source)
+
+        if isinstance(source, raw_nodes.URI):
+            if source.scheme in ("http", "https"):
+                urls.setdefault(str(source), []).append(i)
+                continue
+            elif source.scheme == "file":
+                source = pathlib.Path(url2pathname(source.path))
+            else:
+                available[i] = False
+                continue
+
+        if isinstance(source, ZipPath):  # member of a virtual package root
+            available[i] = source.exists()
+            continue
+        elif isinstance(root_path, ZipPath):
+            available[i] = os.path.exists(source) if os.path.isabs(source) else (root_path / source).exists()
+            continue
+
+        try:
+            os.stat(pathlib.Path(root_path) / source)  # an absolute source path replaces root_path
+        except (OSError, ValueError):
+            available[i] = False
+        else:
+            available[i] = True
+
+    def url_available(url: str) -> bool:
+        import requests  # not available in pyodide
+
+        try:
+            return _get_url_status(url) == 200
+        except requests.RequestException:
+            return False
+
+    for indices, future in zip(urls.values(), _map_concurrently(url_available, [(url,) for url in urls])):
+        for i in indices:
+            available[i] = future.result()
+
+    return typing.cast(typing.List[bool], available)
+
+
+# HEAD request results (final url, status code) of urls and of all urls on their redirect chains
+_url_status_cache: typing.Dict[str, typing.Tuple[str, int]] = {}
+_url_status_cache_lock = threading.Lock()
+
+
+def _get_url_status(url: str) -> int:
+    """status code of a HEAD request to `url` after following up to 100 redirects (memoized)
+
+    In offline mode no request is sent: urls in the download cache or the mirror directory are reported with status
+    200, others with 404.
+    """
+    if is_offline():
+        return 200 if _cache.lookup(url) is not None or _cache.lookup_mirror(url) is not None else 404
+
+    with _url_status_cache_lock:
+        if url in _url_status_cache:
+            return _url_status_cache[url][1]
+
+    session = get_session()
+    chain = [url]
+    for n_redirect in range(100):
+        with _url_status_cache_lock:
+            cached = _url_status_cache.get(chain[-1])
+
+        if cached is not None:  # joined a known redirect chain
+            final_url, status = cached
+            break
+
+        with _get_host_semaphore(urlsplit(chain[-1]).netloc):
+            response = session.head(chain[-1])
+
+        final_url, status = chain[-1], response.status_code
+        if status in (301, 302, 303, 307, 308) and response.next is not None and response.next.url is not None:
+            chain.append(response.next.url)
+        else:
+            break
+
+    if status < 500 and status not in (408, 429):  # server errors, timeouts and rate limits may be transient
+        with _url_status_cache_lock:
+            for u in chain:
+                _url_status_cache[u] = (final_url, status)
+
+    return status
+
+
 cache_warnings_count = 0
 
 
-def _download_url(uri: raw_nodes.URI, output: typing.Optional[os.PathLike] = None, pbar=None) -> pathlib.Path:
+def _with_offline_mode(cache_policy: CachePolicy) -> CachePolicy:
+    """apply the offline mode (see set_offline()) to `cache_policy`"""
+    return cache_policy._replace(offline=True) if is_offline() else cache_policy
+
+
+def _warn_about_cache_hit(local_path: pathlib.Path, uri: raw_nodes.URI) -> None:
     global cache_warnings_count
 
-    if output is not None:
-        local_path = pathlib.Path(output)
-    elif BIOIMAGEIO_USE_CACHE:
-        # todo: proper caching
-        local_path = BIOIMAGEIO_CACHE_PATH / uri.scheme / uri.authority / uri.path.strip("/") / uri.query
+    cache_warnings_count += 1
+    if cache_warnings_count <= BIOIMAGEIO_CACHE_WARNINGS_LIMIT:
+        warnings.warn(f"found cached {local_path}. Skipping download of {uri}.", category=CacheWarning)
+        if cache_warnings_count == BIOIMAGEIO_CACHE_WARNINGS_LIMIT:
+            warnings.warn(
+                f"Reached cache warnings limit. No more warnings about cache hits will be issued.",
+                category=CacheWarning,
+            )
+
+
+# download engine state: downloads in flight (to share identical downloads between threads) and per-host slots
+_downloads_in_flight: typing.Dict[
+    typing.Tuple[str, typing.Optional[str], typing.Optional[str], CachePolicy], "Future[pathlib.Path]"
+] = {}
+_host_semaphores: typing.Dict[str, threading.BoundedSemaphore] = {}
+_download_engine_lock = threading.Lock()
+
+
+def _get_host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _download_engine_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(max(1, BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST))
+
+        return _host_semaphores[host]
+
+
+def _get_download_lock(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike],
+    sha256: typing.Optional[str],
+    cache_policy: typing.Optional[CachePolicy],
+) -> typing.ContextManager:
+    """inter-process lock of a download into the shared cache
+
+    Exactly one process downloads (or revalidates) a url, concurrent processes wait for it and reuse its download.
+    Cache hits and downloads to `output` or a temporary file are not locked.
+    """
+    if output is not None or not BIOIMAGEIO_USE_CACHE or is_offline() or (cache_policy and cache_policy.offline):
+        return contextlib.nullcontext()
+
+    cached = _cache.lookup(str(uri), sha256)
+    if cached is not None and not (cache_policy or CachePolicy()).is_stale(cached[1]):
+        return contextlib.nullcontext()
+
+    return _cache.lock(f"download-{hashlib.sha256(str(uri).encode('utf-8')).hexdigest()}")
+
+
+def _get_download_key(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike],
+    sha256: typing.Optional[str],
+    cache_policy: typing.Optional[CachePolicy],
+) -> typing.Tuple[str, typing.Optional[str], typing.Optional[str], CachePolicy]:
+    """identical downloads (with the same cache policy) have the same key, see _download_url"""
+    return (
+        str(uri),
+        None if output is None else str(output),
+        None if sha256 is None else sha256.lower(),
+        _with_offline_mode(cache_policy or CachePolicy()),
+    )
+
+
+def _download_url(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> pathlib.Path:
+    """download `uri` (see _fetch_url); concurrent calls for the same download (and cache policy) share a request"""
+    key = _get_download_key(uri, output, sha256, cache_policy)
+    with _download_engine_lock:
+        in_flight = _downloads_in_flight.get(key)
+        if in_flight is None:
+            future: "Future[pathlib.Path]" = Future()
+            _downloads_in_flight[key] = future
+
+    if in_flight is not None:
+        return in_flight.result()
+
+    try:
+        with _get_download_lock(uri, output, sha256, cache_policy):
+            local_path = _fetch_url(uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
     else:
-        tmp_dir = TemporaryDirectory()
-        no_cache_tmp_list.append(tmp_dir)  # keep temporary file until process ends
-        local_path = pathlib.Path(tmp_dir.name) / "file"
-
-    if local_path.exists():
-        cache_warnings_count += 1
-        if cache_warnings_count <= BIOIMAGEIO_CACHE_WARNINGS_LIMIT:
-            warnings.warn(f"found cached {local_path}. Skipping download of {uri}.", category=CacheWarning)
-            if cache_warnings_count == BIOIMAGEIO_CACHE_WARNINGS_LIMIT:
-                warnings.warn(
-                    f"Reached cache warnings limit. No more warnings about cache hits will be issued.",
-                    category=CacheWarning,
-                )
+        future.set_result(local_path)
+        return local_path
+    finally:
+        with _download_engine_lock:
+            del _downloads_in_flight[key]
+
+
+class _Request(typing.NamedTuple):
+    """step of a download (see _fetch_steps): GET the url with `headers` and send back its _Response"""
+
+    headers: typing.Dict[str, str]
+
+
+class _Response(typing.NamedTuple):
+    status_code: int
+    headers: typing.Mapping[str, str]  # case-insensitive
+
 
+class _ReadChunk(typing.NamedTuple):
+    """step of a download (see _fetch_steps): send back the next chunk of the response body (b"" at its end)"""
+
+
+class _ConnectionLost(ConnectionError):
+    """connection failure of an HTTP client, thrown into _fetch_steps"""
+
+
+# steps of a download; other steps are blocking local file operations, whose result is sent back
+_FetchStep = typing.Union[_Request, _ReadChunk, typing.Callable[[], typing.Any]]
+
+
+def _fetch_url(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> pathlib.Path:
+    """download `uri` with the pooled requests session (see get_session() and _fetch_steps)
+
+    At most BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST downloads from the same host run concurrently.
+    """
+    import requests  # not available in pyodide
+
+    steps = _fetch_steps(uri, output, pbar=pbar, sha256=sha256, cache_policy=cache_policy)
+    host_slot: typing.Optional[threading.BoundedSemaphore] = None
+    response: typing.Optional[requests.Response] = None
+    chunks: typing.Iterator[bytes] = iter([])
+    result: typing.Any = None
+    error: typing.Optional[Exception] = None
+    try:
+        while True:
+            try:
+                step = steps.send(result) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+
+            result, error = None, None
+            try:
+                if isinstance(step, _Request):
+                    if host_slot is None:
+                        host_slot = _get_host_semaphore(uri.authority)
+                        host_slot.acquire()
+
+                    if response is not None:
+                        response.close()
+
+                    # Streaming, so we can iterate over the response.
+                    response = get_session().get(str(uri), stream=True, headers=step.headers)
+                    chunks = response.iter_content(1024)  # 1 Kibibyte
+                    result = _Response(response.status_code, response.headers)
+                elif isinstance(step, _ReadChunk):
+                    result = next(chunks, b"")
+                else:
+                    result = step()
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                error = _ConnectionLost(e)
+            except Exception as e:
+                error = e
+    finally:
+        steps.close()
+        if response is not None:
+            response.close()  # return the connection to the pool
+
+        if host_slot is not None:
+            host_slot.release()
+
+
+def _fetch_steps(
+    uri: raw_nodes.URI,
+    output: typing.Optional[os.PathLike] = None,
+    pbar=None,
+    sha256: typing.Optional[str] = None,
+    cache_policy: typing.Optional[CachePolicy] = None,
+) -> typing.Generator[_FetchStep, typing.Any, pathlib.Path]:
+    """download `uri` to `output` or into the content-addressed cache (if BIOIMAGEIO_USE_CACHE) or a temporary file
+
+    The download logic (cache lookup and revalidation, resumption, sha256 verification and publishing) does not depend
+    on an HTTP client: the returned generator yields its requests, reads of the response body and blocking local file
+    operations as steps (see _FetchStep) for a driver to run; connection failures are thrown into it as
+    _ConnectionLost. _fetch_url drives it with requests, `_async._afetch_url` with aiohttp on an event loop.
+
+    Interrupted downloads are resumed with range requests (up to BIOIMAGEIO_HTTP_RETRIES times, or by a later call
+    with the same `uri` and `output`), if the server provides a validator (ETag or Last-Modified) for 'If-Range'.
+
+    Args:
+        uri: remote resource
+        output: optional file path to download to
+        pbar: progress bar, see resolve_source
+        sha256: expected SHA-256 digest of the content; cached content not matching it is downloaded again, downloaded
+            content not matching it is rejected (RuntimeError).
+        cache_policy: freshness policy for cached downloads; default: use cached downloads without revalidation
+    """
+    if cache_policy is None:
+        cache_policy = CachePolicy()
+
+    cache_policy = _with_offline_mode(cache_policy)
+    local_path: typing.Optional[pathlib.Path]
+    cached: typing.Optional[typing.Tuple[pathlib.Path, _cache.UrlEntry]] = None
+    headers: typing.Dict[str, str] = {}
+    if output is None and BIOIMAGEIO_USE_CACHE:
+        cached = _cache.lookup(str(uri), sha256)
+        if cached is not None:
+            if not cache_policy.is_stale(cached[1]):
+                _warn_about_cache_hit(cached[0], uri)
+                return cached[0]
+
+            headers = _cache.get_conditional_headers(cached[1])
+
+        local_path = None
+        tmp_path = _cache.get_partial_path(str(uri))
     else:
+        if output is None:
+            tmp_dir = TemporaryDirectory()
+            no_cache_tmp_list.append(tmp_dir)  # keep temporary file until process ends
+            local_path = pathlib.Path(tmp_dir.name) / "file"
+        else:
+            local_path = pathlib.Path(output)
+            if local_path.exists():
+                _warn_about_cache_hit(local_path, uri)
+                return local_path
+
         local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_suffix(f"{local_path.suffix}.part")
+
+    if cache_policy.offline:
+        mirrored = _cache.lookup_mirror(str(uri))
+        if mirrored is None:
+            raise RuntimeError(f"Failed to download {uri} (not available offline)")
+        elif local_path is None:
+            return mirrored
+        else:
+            shutil.copyfile(mirrored, local_path)
+            return local_path
 
-        import requests  # not available in pyodide
+    # resume a previously interrupted download (unless we are revalidating a cached download)
+    partial = None if cached is not None else _cache.get_partial_download(tmp_path, str(uri))
+    if partial is None:
+        _cache.discard_partial_download(tmp_path)
+
+    keep_partial = False
+    try:
+        for attempt in range(BIOIMAGEIO_HTTP_RETRIES + 1):
+            resume_from = tmp_path.stat().st_size if partial is not None and tmp_path.exists() else 0
+            request_headers = dict(headers)
+            if resume_from:
+                assert partial is not None
+                request_headers["Range"] = f"bytes={resume_from}-"
+                request_headers["If-Range"] = partial.validator
 
-        try:
             # download with tqdm adapted from:
             # https://github.com/shaypal5/tqdl/blob/189f7fd07f265d29af796bee28e0893e1396d237/tqdl/core.py
-            # Streaming, so we can iterate over the response.
-            r = requests.get(str(uri), stream=True)
-            r.raise_for_status()
+            r: _Response = yield _Request(request_headers)
+            if cached is not None and r.status_code == 304:  # cached download is still valid
+                _cache.mark_revalidated(
+                    cached[1], etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified")
+                )
+                return cached[0]
+
+            if resume_from and r.status_code == 416:  # partial download does not match anymore
+                _cache.discard_partial_download(tmp_path)
+                partial = None
+                continue
+
+            if r.status_code >= 400:
+                raise RuntimeError(f"Failed to download {uri} (status {r.status_code})")
+
+            if r.status_code != 206 or _get_content_range_start(r.headers.get("Content-Range")) != resume_from:
+                resume_from = 0  # server ignored the range request or the content changed -> full download
+
+            partial = _cache.save_partial_download(
+                tmp_path, str(uri), etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified")
+            )
             # Total size in bytes.
             total_size = int(r.headers.get("content-length", 0))
-            block_size = 1024  # 1 Kibibyte
+            if total_size:
+                total_size += resume_from
+
             if pbar:
                 t = pbar(total=total_size, unit="iB", unit_scale=True, desc=uri.path.split("/")[-1])
             else:
                 t = tqdm(total=total_size, unit="iB", unit_scale=True, desc=uri.path.split("/")[-1])
-            tmp_path = local_path.with_suffix(f"{local_path.suffix}.part")
-            with tmp_path.open("wb") as f:
-                for data in r.iter_content(block_size):
-                    t.update(len(data))
-                    f.write(data)
+
+            digest = hashlib.sha256()
+            if resume_from:
+                yield lambda: _update_digest(digest, tmp_path)  # (a large file may take a while)
+                t.update(resume_from)
+
+            try:
+                with tmp_path.open("ab" if resume_from else "wb") as f:
+                    while True:
+                        data = yield _ReadChunk()
+                        if not data:
+                            break
+
+                        t.update(len(data))
+                        f.write(data)
+                        digest.update(data)
+            except _ConnectionLost as e:
+                t.close()
+                if attempt == BIOIMAGEIO_HTTP_RETRIES:
+                    keep_partial = partial is not None
+                    raise RuntimeError(f"Failed to download {uri} ({e})") from e
+
+                continue  # resume (or restart) the interrupted download
 
             t.close()
-            if total_size != 0 and hasattr(t, "n") and t.n != total_size:
-                # todo: check more carefully and raise on real issue
-                warnings.warn(f"Download ({t.n}) does not have expected size ({total_size}).")
-
-            shutil.move(f.name, str(local_path))
-        except DownloadCancelled as e:
-            # let calling code handle this exception specifically -> allow for cancellation of
-            # long running downloads per user request
-            raise e
-        except Exception as e:
+            break
+        else:
+            raise RuntimeError(f"Failed to download {uri}")
+
+        if total_size != 0 and hasattr(t, "n") and t.n != total_size:
+            # todo: check more carefully and raise on real issue
+            warnings.warn(f"Download ({t.n}) does not have expected size ({total_size}).")
+
+        _check_sha256(uri, digest.hexdigest(), sha256)  # reject unexpected content before publishing it
+        if local_path is None:
+            local_path = _cache.publish(
+                str(uri),
+                tmp_path,
+                sha256=digest.hexdigest(),
+                name=uri.path.split("/")[-1] or "file",
+                etag=r.headers.get("ETag"),
+                last_modified=r.headers.get("Last-Modified"),
+            )
+            added_bytes = local_path.stat().st_size
+            yield lambda: _cache.evict_cache_if_needed(added_bytes)
+        else:
+            shutil.move(str(tmp_path), str(local_path))
+    except DownloadCancelled as e:
+        # let calling code handle this exception specifically -> allow for cancellation of
+        # long running downloads per user request
+        keep_partial = partial is not None
+        raise e
+    except _ConnectionLost as e:
+        if cached is None:
+            keep_partial = partial is not None
             raise RuntimeError(f"Failed to download {uri} ({e})") from e
 
+        warnings.warn(f"Failed to revalidate cached {cached[0]} ({e}). Using it anyway.", category=CacheWarning)
+        return cached[0]
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to download {uri} ({e})") from e
+    finally:
+        if not keep_partial:
+            _cache.discard_partial_download(tmp_path)
+
     return local_path
 
 
-T = typing.TypeVar("T")
+def _update_digest(digest: "hashlib._Hash", path: pathlib.Path) -> None:
+    with path.open("rb") as f:
+        for data in iter(lambda: f.read(1 << 20), b""):
+            digest.update(data)
+
+
+def _check_sha256(uri: raw_nodes.URI, actual: str, expected: typing.Optional[str]) -> None:
+    if expected is not None and actual != expected.lower():
+        raise RuntimeError(f"Downloaded {uri} has SHA-256 digest {actual}, but expected {expected}")
+
+
+def _get_content_range_start(content_range: typing.Optional[str]) -> typing.Optional[int]:
+    match = re.fullmatch(r"bytes (\d+)-\d+/(\d+|\*)", content_range or "")
+    return None if match is None else int(match.group(1))
 
 
 def _resolve_json_from_url(
@@ -507,29 +1169,107 @@ def _resolve_json_from_url(
     return data, error
 
 
-BIOIMAGEIO_SITE_CONFIG, BIOIMAGEIO_SITE_CONFIG_ERROR = _resolve_json_from_url(
-    BIOIMAGEIO_SITE_CONFIG_URL, encoding="utf-8", warning_msg=None
-)
-BIOIMAGEIO_COLLECTION, BIOIMAGEIO_COLLECTION_ERROR = _resolve_json_from_url(
-    BIOIMAGEIO_COLLECTION_URL, encoding="utf-8", warning_msg=None
-)
-if BIOIMAGEIO_COLLECTION is None:
-    BIOIMAGEIO_COLLECTION_ENTRIES: typing.Optional[typing.Dict[str, typing.Tuple[str, str]]] = None
-else:
-    BIOIMAGEIO_COLLECTION_ENTRIES = {}
-    for cr in BIOIMAGEIO_COLLECTION.get("collection", []):
-        if "id" in cr and "rdf_source" in cr and "type" in cr:
-            entry = (cr["type"], cr["rdf_source"])
-            BIOIMAGEIO_COLLECTION_ENTRIES[cr["id"]] = entry
-
-            if "nickname" in cr:
-                BIOIMAGEIO_COLLECTION_ENTRIES[cr["nickname"]] = entry
-
-        # add resource versions explicitly
-        for cv in cr.get("versions", []):
-            BIOIMAGEIO_COLLECTION_ENTRIES[f"{cr['id']}/{cv}"] = (
-                cr["type"],
-                cr["rdf_source"].replace(
-                    f"/{cr['versions'][0]}", f"/{cv}"
-                ),  # todo: improve this replace-version-monkeypatch
-            )
+_FAILED_FETCH_RETRY_INTERVAL = 60.0  # seconds
+
+
+def _cache_successful(is_successful: typing.Callable[[typing.Any], bool]):
+    """memoize the result of a function without arguments (like `lru_cache`), but an unsuccessful result only for
+    _FAILED_FETCH_RETRY_INTERVAL seconds
+
+    A fetch that failed, e.g. due to a transient network error, is thus retried by a later call (but not by every call,
+    which would be slow without network access).
+    """
+
+    def decorator(func):
+        lock = threading.Lock()
+        memo: typing.Dict[str, typing.Any] = {}
+
+        @wraps(func)
+        def wrapper():
+            with lock:
+                if "result" in memo and (
+                    memo["successful"] or time.time() - memo["time"] < _FAILED_FETCH_RETRY_INTERVAL
+                ):
+                    return memo["result"]
+
+                result = func()
+                memo.update(result=result, successful=is_successful(result), time=time.time())
+                return result
+
+        wrapper.cache_clear = memo.clear  # type: ignore
+        return wrapper
+
+    return decorator
+
+
+@_cache_successful(lambda result: result[0] is not None)
+def get_bioimageio_site_config() -> typing.Tuple[typing.Optional[dict], typing.Optional[str]]:
+    """fetch the bioimage.io site config (once per process; a failed fetch is retried after a minute)
+
+    Returns:
+        Tuple of site config (or None) and an error message (or None).
+    """
+    return _resolve_json_from_url(BIOIMAGEIO_SITE_CONFIG_URL, encoding="utf-8", warning_msg=None)
+
+
+@_cache_successful(lambda result: result[0] is not None)
+def get_bioimageio_collection() -> typing.Tuple[typing.Optional[dict], typing.Optional[str]]:
+    """fetch the bioimage.io collection (once per process; a failed fetch is retried after a minute)
+
+    Returns:
+        Tuple of collection (or None) and an error message (or None).
+    """
+    return _resolve_json_from_url(BIOIMAGEIO_COLLECTION_URL, encoding="utf-8", warning_msg=None)
+
+
+@_cache_successful(lambda result: result is not None)
+def get_bioimageio_collection_entries() -> typing.Optional[typing.Mapping[str, typing.Tuple[str, str]]]:
+    """map bioimage.io ids, nicknames and versioned ids to (type, rdf_source) of the bioimage.io collection
+
+    If available, a persistent index in BIOIMAGEIO_CACHE_PATH is used, which is refreshed (once per process)
+    by a conditional request.
+
+    Returns:
+        None if the bioimage.io collection is not available (retried after a minute).
+    """
+    if sqlite3 is None:
+        collection, _ = get_bioimageio_collection()
+        if collection is None:
+            return None
+
+        return dict(iter_collection_entries(collection))
+
+    index = CollectionIndex(
+        BIOIMAGEIO_CACHE_PATH / "collection_index.sqlite" if BIOIMAGEIO_USE_CACHE else ":memory:",
+        BIOIMAGEIO_COLLECTION_URL,
+    )
+    if is_offline():
+        if not index:  # seed the index from a cached or mirrored collection
+            collection, _ = get_bioimageio_collection()
+            if collection is None:
+                return None
+
+            index.update(collection)
+    else:
+        error = index.refresh()
+        if error is not None and not index:
+            return None
+
+    return index
+
+
+# deprecated module level constants, which are now resolved lazily (see module __getattr__ below)
+_LAZY_CONSTANTS: typing.Dict[str, typing.Callable[[], typing.Any]] = {
+    "BIOIMAGEIO_SITE_CONFIG": lambda: get_bioimageio_site_config()[0],
+    "BIOIMAGEIO_SITE_CONFIG_ERROR": lambda: get_bioimageio_site_config()[1],
+    "BIOIMAGEIO_COLLECTION": lambda: get_bioimageio_collection()[0],
+    "BIOIMAGEIO_COLLECTION_ERROR": lambda: get_bioimageio_collection()[1],
+    "BIOIMAGEIO_COLLECTION_ENTRIES": get_bioimageio_collection_entries,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CONSTANTS:
+        return _LAZY_CONSTANTS[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,356 @@
+"""read-only virtual root of a zipped resource package
+
+A ZipPath addresses a member (or the root) of an open (local or remote) zip file. Member bytes are only read when they
+are accessed, and a member is only written to disk (into the extracted package directory in BIOIMAGEIO_CACHE_PATH)
+when a caller asks for a real path with `materialize()` or `resolve_source()`.
+
+Extracted package directories are keyed by the content of the zip file (see `ZipPath.fingerprint`), so a changed
+package is extracted anew (even at the same path or URL) and identical packages are extracted only once.
+"""
+import collections
+import io
+import json
+import os
+import pathlib
+import posixpath
+import threading
+import typing
+import shutil
+import uuid
+import weakref
+import zipfile
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+
+from . import _cache
+from .common import BIOIMAGEIO_USE_CACHE, no_cache_tmp_list
+
+
+class _ZipPackage:
+    """open zip file shared by all ZipPath instances of one package"""
+
+    def __init__(self, zip_file: zipfile.ZipFile):
+        self.zip_file = zip_file
+        self.files = {info.filename for info in zip_file.infolist() if not info.is_dir()}
+        self.dirs = {""}
+        for name in zip_file.namelist():  # directories may be implicit
+            parts = name.rstrip("/").split("/")
+            n_dir_parts = len(parts) - 1 if name in self.files else len(parts)
+            self.dirs.update("/".join(parts[:i]) for i in range(1, n_dir_parts + 1))
+
+        self.lock = threading.Lock()
+        self._materialized_root: typing.Optional[pathlib.Path] = None
+        self._fingerprint: typing.Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """digest of the central directory, i.e. of the names, sizes, modification times and CRC-32s of all members"""
+        if self._fingerprint is None:
+            digest = sha256()
+            for info in self.zip_file.infolist():
+                digest.update(json.dumps([info.filename, info.file_size, info.date_time, info.CRC]).encode("utf-8"))
+
+            self._fingerprint = digest.hexdigest()
+
+        return self._fingerprint
+
+    @property
+    def materialized_root(self) -> pathlib.Path:
+        """directory to materialize members in"""
+        with self.lock:
+            if self._materialized_root is None:
+                if BIOIMAGEIO_USE_CACHE:
+                    self._materialized_root = _cache.get_extracted_package_path(self.fingerprint)
+                else:
+                    tmp_dir = TemporaryDirectory()
+                    no_cache_tmp_list.append(tmp_dir)
+                    self._materialized_root = pathlib.Path(tmp_dir.name)
+
+                with _materialized_packages_lock:
+                    _materialized_packages[self._materialized_root] = self
+
+            return self._materialized_root
+
+
+# packages by the directories their members are materialized in (as long as the package is in use)
+_materialized_packages: "weakref.WeakValueDictionary[pathlib.Path, _ZipPackage]" = weakref.WeakValueDictionary()
+# partially extracted packages are kept open to extract their remaining members on demand (as long as they are held)
+_lazily_extracted_packages: typing.Dict[pathlib.Path, _ZipPackage] = {}
+_lazily_extracted_package_holds: typing.Counter[pathlib.Path] = collections.Counter()
+# reentrant, as holds may be released by the garbage collector while the lock is held
+_materialized_packages_lock = threading.RLock()
+
+
+def extract_lazily(package: "ZipPath", holder: object) -> None:
+    """keep `package` open for the lifetime of `holder` (e.g. a resource description with the extracted package as
+    root) to extract members that have not been extracted when they are resolved"""
+    _hold(package._package.materialized_root, package._package, holder)
+
+
+def hold_lazily_extracted_package(path: pathlib.Path, holder: object) -> None:
+    """keep the lazily extracted package that `path` is in (if any) open for the lifetime of `holder` as well"""
+    with _materialized_packages_lock:
+        packages = list(_lazily_extracted_packages.items())
+
+    for materialized_root, package in packages:
+        if path == materialized_root or materialized_root in path.parents:
+            _hold(materialized_root, package, holder)
+            break
+
+
+def _hold(materialized_root: pathlib.Path, package: _ZipPackage, holder: object) -> None:
+    with _materialized_packages_lock:
+        _lazily_extracted_packages[materialized_root] = package
+        _lazily_extracted_package_holds[materialized_root] += 1
+
+    weakref.finalize(holder, _release, materialized_root)
+
+
+def _release(materialized_root: pathlib.Path) -> None:
+    with _materialized_packages_lock:
+        _lazily_extracted_package_holds[materialized_root] -= 1
+        if _lazily_extracted_package_holds[materialized_root] <= 0:
+            # the zip file is closed when the last ZipPath of the package is gone
+            del _lazily_extracted_package_holds[materialized_root]
+            del _lazily_extracted_packages[materialized_root]
+
+
+def get_package_member(path: pathlib.Path) -> typing.Optional["ZipPath"]:
+    """get the package member that is (or will be) materialized at `path`, e.g. a member that has not been extracted"""
+    with _materialized_packages_lock:
+        packages = list(_materialized_packages.items()) + list(_lazily_extracted_packages.items())
+
+    for materialized_root, package in packages:
+        try:
+            at = path.relative_to(materialized_root)
+        except ValueError:
+            continue
+
+        member = ZipPath._from_package(package, at.as_posix())
+        if member.is_file():
+            return member
+
+    return None
+
+
+class ZipPath:
+    """read-only path of a member of an open zip file
+
+    Args:
+        zip_file: open zip file or path to a zip file
+        at: posix path of the member within the zip file; default: root of the package
+    """
+
+    def __init__(self, zip_file: typing.Union[zipfile.ZipFile, os.PathLike, str], at: str = ""):
+        if not isinstance(zip_file, zipfile.ZipFile):
+            zip_file = zipfile.ZipFile(zip_file)
+
+        self._package = _ZipPackage(zip_file)
+        self.at = self._normalize(at)
+
+    @staticmethod
+    def _normalize(at: str) -> str:
+        at = posixpath.normpath(at).lstrip("/") if at else ""
+        return "" if at == "." else at
+
+    @classmethod
+    def _from_package(cls, package: _ZipPackage, at: str) -> "ZipPath":
+        path = cls.__new__(cls)
+        path._package = package
+        path.at = cls._normalize(at)
+        return path
+
+    def _next(self, at: str) -> "ZipPath":
+        # members of a package share its open zip file
+        return self._from_package(self._package, at)
+
+    def __copy__(self) -> "ZipPath":
+        return self
+
+    def __deepcopy__(self, memo) -> "ZipPath":
+        return self  # read-only; copies share the open zip file
+
+    @property
+    def zip_file(self) -> zipfile.ZipFile:
+        return self._package.zip_file
+
+    @property
+    def fingerprint(self) -> str:
+        """content fingerprint of the package (that keys its extraction directory)"""
+        return self._package.fingerprint
+
+    @property
+    def name(self) -> str:
+        return posixpath.basename(self.at)
+
+    @property
+    def suffix(self) -> str:
+        return pathlib.PurePosixPath(self.name).suffix
+
+    @property
+    def stem(self) -> str:
+        return pathlib.PurePosixPath(self.name).stem
+
+    @property
+    def package_root(self) -> "ZipPath":
+        """root of the package"""
+        return self._next("")
+
+    @property
+    def parent(self) -> "ZipPath":
+        return self.joinpath("..")
+
+    def joinpath(self, *other: typing.Union[os.PathLike, str]) -> "ZipPath":
+        return self._next(posixpath.join(self.at, *[pathlib.PurePath(o).as_posix() for o in other]))
+
+    def __truediv__(self, other: typing.Union[os.PathLike, str]) -> "ZipPath":
+        return self.joinpath(other)
+
+    @property
+    def materialized_path(self) -> pathlib.Path:
+        """path of this member (or directory) in the extraction directory of its package, see materialize()"""
+        return self._package.materialized_root / self.at
+
+    def exists(self) -> bool:
+        return self.is_file() or self.is_dir()
+
+    def is_file(self) -> bool:
+        return self.at in self._package.files
+
+    def is_dir(self) -> bool:
+        return self.at in self._package.dirs
+
+    def open(self, mode: str = "r", encoding: typing.Optional[str] = None) -> typing.IO:
+        if mode not in ("r", "rb"):
+            raise ValueError(f"{self} is read-only")
+
+        if not self.is_file():
+            raise FileNotFoundError(f"Could not find {self}")
+
+        f: typing.IO[bytes] = self.zip_file.open(self.at)
+        if mode == "rb":
+            return f
+
+        return io.TextIOWrapper(f, encoding=encoding or "utf-8")
+
+    def read_bytes(self) -> bytes:
+        with self.open("rb") as f:
+            return f.read()
+
+    def read_text(self, encoding: typing.Optional[str] = None) -> str:
+        with self.open("r", encoding=encoding) as f:
+            return f.read()
+
+    def materialize(self, output: typing.Optional[os.PathLike] = None) -> pathlib.Path:
+        """write this member to disk (if it is not there already)
+
+        Args:
+            output: file path to write the member to; default: the member's path in the extracted package directory
+        """
+        if not self.is_file():
+            raise FileNotFoundError(f"Could not find {self}")
+
+        if output is None:
+            path = self.materialized_path
+            if self._is_materialized():
+                _cache.touch(self._package.materialized_root)
+                return path
+        else:
+            path = pathlib.Path(output)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with self.open("rb") as src, tmp_path.open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+
+            os.replace(tmp_path, path)  # concurrent materializations of the same member do not see partial files
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        if output is None:
+            _cache.touch(self._package.materialized_root)
+
+        return path
+
+    def extract(self, members: typing.Optional[typing.Iterable[str]] = None) -> pathlib.Path:
+        """extract `members` (default: all members) of the package into its extraction directory
+
+        A package is extracted into a temporary directory that is renamed to the extraction directory, so that other
+        processes never see a partially extracted package. Processes sharing BIOIMAGEIO_CACHE_PATH extract a package
+        only once; already extracted members are reused.
+
+        Returns:
+            extraction directory of the package
+        """
+        package = self.package_root
+        if members is None:
+            members = package._package.files
+        else:
+            members = {package._normalize(m) for m in members}
+
+        for member in members:
+            if not package._next(member).is_file():
+                raise FileNotFoundError(f"Could not find {package / member}")
+
+        root = package.materialized_path
+        if not BIOIMAGEIO_USE_CACHE:  # private temporary directory
+            for member in members:
+                package._next(member).materialize()
+
+            return root
+
+        with _cache.lock(f"extract-{package.fingerprint}"):
+            missing = [m for m in members if not package._next(m)._is_materialized()]
+            if missing:
+                tmp_root = _cache.get_tmp_path().with_suffix(".extracting")
+                try:
+                    for member in missing:
+                        package._next(member).materialize(tmp_root / member)
+
+                    added_bytes = _cache.get_dir_size(tmp_root)
+                    added_entries = 0 if root.exists() else 1
+                    _move_tree(tmp_root, root)
+                finally:
+                    shutil.rmtree(tmp_root, ignore_errors=True)
+
+        _cache.touch(root)
+        if missing:
+            _cache.evict_cache_if_needed(added_bytes, added_entries)
+
+        return root
+
+    def _is_materialized(self) -> bool:
+        try:
+            return self.materialized_path.stat().st_size == self.zip_file.getinfo(self.at).file_size
+        except OSError:
+            return False
+
+    def __str__(self) -> str:
+        return posixpath.join(str(self.zip_file.filename or "<zip>"), self.at)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.zip_file.filename or '<zip>')!r}, {self.at!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ZipPath) and self._package is other._package and self.at == other.at
+
+    def __hash__(self) -> int:
+        return hash((id(self._package), self.at))
+
+
+def _move_tree(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """move the directory `src` to `dst`, or its files into `dst` if `dst` exists already (each file atomically)"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.rename(src, dst)
+    except OSError:
+        if not dst.is_dir():
+            raise
+
+        for dirpath, _, filenames in os.walk(src):
+            target_dir = dst / pathlib.Path(dirpath).relative_to(src)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for fn in filenames:
+                os.replace(os.path.join(dirpath, fn), target_dir / fn)
@@ -2,8 +2,9 @@ import getpass
 import os
 import pathlib
 import tempfile
+import threading
 import warnings
-from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Union
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Union
 
 try:
     from typing import Literal, get_args, get_origin, Protocol, TypedDict
@@ -61,6 +62,31 @@ BIOIMAGEIO_CACHE_PATH = pathlib.Path(
 )
 BIOIMAGEIO_USE_CACHE = os.getenv("BIOIMAGEIO_USE_CACHE", "true").lower() in ("true", "yes", "1")
 BIOIMAGEIO_CACHE_WARNINGS_LIMIT = int(os.getenv("BIOIMAGEIO_CACHE_WARNINGS_LIMIT", 3))
+# budgets of the download cache in bytes and in number of downloads/extracted packages; 0 means unlimited
+BIOIMAGEIO_CACHE_MAX_BYTES = int(os.getenv("BIOIMAGEIO_CACHE_MAX_BYTES", 0))
+BIOIMAGEIO_CACHE_MAX_ENTRIES = int(os.getenv("BIOIMAGEIO_CACHE_MAX_ENTRIES", 0))
+# time (in seconds) resolved concept DOIs are cached (DOIs of a specific version are cached indefinitely)
+BIOIMAGEIO_DOI_CACHE_TTL = float(os.getenv("BIOIMAGEIO_DOI_CACHE_TTL", 3600))
+# strict offline mode: no network access, remote sources are resolved from the cache and the mirror directory only
+BIOIMAGEIO_OFFLINE = os.getenv("BIOIMAGEIO_OFFLINE", "false").lower() in ("true", "yes", "1")
+# pre-seeded mirror of remote sources in offline mode with the layout <host>/<path> (e.g. as created by `wget --mirror`)
+BIOIMAGEIO_MIRROR_PATH = (
+    pathlib.Path(os.environ["BIOIMAGEIO_MIRROR_PATH"]) if "BIOIMAGEIO_MIRROR_PATH" in os.environ else None
+)
+# persist raw resource descriptions loaded by load_raw_resource_description in BIOIMAGEIO_CACHE_PATH across processes
+BIOIMAGEIO_RD_DISK_CACHE = os.getenv("BIOIMAGEIO_RD_DISK_CACHE", "false").lower() in ("true", "yes", "1")
+# default parser backend for RDF content, see bioimageio.spec.shared.RDF_PARSERS
+BIOIMAGEIO_RDF_PARSER = os.getenv("BIOIMAGEIO_RDF_PARSER", "auto")
+# number of raw resource descriptions memoized in-process by load_raw_resource_description; 0 disables the memo
+BIOIMAGEIO_RD_MEMO_SIZE = int(os.getenv("BIOIMAGEIO_RD_MEMO_SIZE", 0))
+# time (in seconds) after which a lock in BIOIMAGEIO_CACHE_PATH that is not refreshed by its holder is stale
+BIOIMAGEIO_LOCK_STALE_AFTER = float(os.getenv("BIOIMAGEIO_LOCK_STALE_AFTER", 60))
+# concurrent downloads of resolve_source(<list>) in total and per host
+BIOIMAGEIO_MAX_DOWNLOAD_WORKERS = int(os.getenv("BIOIMAGEIO_MAX_DOWNLOAD_WORKERS", 8))
+BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST = int(os.getenv("BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST", 4))
+# default timeout (in seconds) and number of retries of HTTP requests, see bioimageio.spec.shared.get_session()
+BIOIMAGEIO_HTTP_TIMEOUT = float(os.getenv("BIOIMAGEIO_HTTP_TIMEOUT", 30))
+BIOIMAGEIO_HTTP_RETRIES = int(os.getenv("BIOIMAGEIO_HTTP_RETRIES", 3))
 
 # keep a reference to temporary directories and files.
 # These temporary locations are used instead of paths in BIOIMAGEIO_CACHE_PATH if BIOIMAGEIO_USE_CACHE is true,
@@ -192,6 +218,37 @@ def get_class_name_from_type(type_: str):
         return type_.title()
 
 
+# prebuilt schema instances keyed by (type, format version module name); see get_schema()
+_schema_registry: Dict[Tuple[str, str], Any] = {}
+_schema_registry_lock = threading.Lock()
+
+
+def get_schema(type_: str, format_version: str):
+    """return a schema instance for the given RDF type and format version
+
+    Schema instances are stateless during load/dump and are thus built only once per process and shared (thread-safe).
+    Use clear_schema_registry() to drop them, e.g. after patching schema classes.
+    """
+    type_ = get_spec_type_from_type(type_)
+    key = (type_, "v" + "_".join(format_version.split(".")[:2]))
+    schema = _schema_registry.get(key)
+    if schema is None:
+        with _schema_registry_lock:
+            schema = _schema_registry.get(key)
+            if schema is None:
+                version_mod = get_format_version_module(type_, format_version)
+                schema = getattr(version_mod.schema, get_class_name_from_type(type_))()
+                _schema_registry[key] = schema
+
+    return schema
+
+
+def clear_schema_registry() -> None:
+    """reset the schema instances shared by get_schema()"""
+    with _schema_registry_lock:
+        _schema_registry.clear()
+
+
 def get_args_flat(tp):
     flat_args = []
     for a in get_args(tp):
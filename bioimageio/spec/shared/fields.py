@@ -407,6 +407,8 @@ class Path(String):
     def _serialize(self, value, attr, obj, **kwargs) -> typing.Optional[str]:
         if isinstance(value, pathlib.PurePath):
             value = value.as_posix()
+        elif isinstance(value, raw_nodes.ZipPath):  # member of a zipped package, relative to the package root
+            value = value.at
 
         return super()._serialize(value, attr, obj, **kwargs)
 
@@ -475,8 +477,6 @@ class BioImageIO_ID(String):
         ] = None,
         **super_kwargs,
     ):
-        from ._resolve_source import BIOIMAGEIO_COLLECTION_ENTRIES
-
         if validate is None:
             validate = []
 
@@ -485,24 +485,26 @@ class BioImageIO_ID(String):
         else:
             validate = [validate]
 
-        if BIOIMAGEIO_COLLECTION_ENTRIES is not None:
-            error_msg = "'{input}' is not a valid BioImage.IO ID"
-            if resource_type is not None:
-                error_msg += f" of type {resource_type}"
-
-            validate.append(
-                field_validators.OneOf(
-                    {
-                        k
-                        for k, (v_type, _) in BIOIMAGEIO_COLLECTION_ENTRIES.items()
-                        if resource_type is None or resource_type == v_type
-                    },
-                    error=error_msg,
-                )
-            )
-
+        self.resource_type = resource_type
+        validate.append(self._validate_bioimageio_id)
         super().__init__(*super_args, bioimageio_description=bioimageio_description, **super_kwargs)
 
+    def _validate_bioimageio_id(self, value: str) -> None:
+        # the bioimage.io collection is only fetched once an id is actually validated
+        from ._resolve_source import get_bioimageio_collection_entries
+
+        entries = get_bioimageio_collection_entries()
+        if entries is None:
+            return  # cannot validate id without bioimage.io collection
+
+        entry = entries.get(value)
+        if entry is None or (self.resource_type is not None and entry[0] != self.resource_type):
+            error_msg = f"'{value}' is not a valid BioImage.IO ID"
+            if self.resource_type is not None:
+                error_msg += f" of type {self.resource_type}"
+
+            raise ValidationError(error_msg)
+
 
 class ProcMode(String):
     all_modes = ("fixed", "per_dataset", "per_sample")
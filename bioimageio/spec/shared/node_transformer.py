@@ -1,13 +1,16 @@
 import dataclasses
 import os
 import pathlib
+import posixpath
 import typing
+from concurrent.futures import Future
 
 from marshmallow import missing
 from marshmallow.utils import _Missing
 
 from . import raw_nodes
-from ._resolve_source import resolve_source as _resolve_source
+from ._resolve_source import _map_concurrently, resolve_source as _resolve_source
+from ._zip_path import ZipPath
 from .raw_nodes import URI
 
 try:
@@ -170,15 +173,18 @@ class RawNodePackageTransformer(NodeTransformer):
 
     def __init__(
         self,
-        remote_resources: typing.Dict[str, typing.Union[pathlib.PurePath, URI]],
-        root: typing.Union[pathlib.Path, URI],
+        remote_resources: typing.Dict[str, typing.Union[pathlib.PurePath, URI, ZipPath]],
+        root: typing.Union[pathlib.Path, URI, ZipPath],
     ):
         super().__init__()
         self.remote_resources = remote_resources
         self.root = root
 
     def _transform_resource(
-        self, resource: typing.Union[typing.List[typing.Union[pathlib.PurePath, URI]], pathlib.PurePath, URI]
+        self,
+        resource: typing.Union[
+            typing.List[typing.Union[pathlib.PurePath, URI, ZipPath]], pathlib.PurePath, URI, ZipPath
+        ],
     ) -> typing.Union[typing.List[pathlib.Path], _Missing, pathlib.Path]:
         if isinstance(resource, list):
             return [self._transform_resource(r) for r in resource]
@@ -199,6 +205,9 @@ class RawNodePackageTransformer(NodeTransformer):
         elif isinstance(resource, URI):
             name_from = pathlib.PurePath(resource.path or "unknown")
             folder_in_package = ""
+        elif isinstance(resource, ZipPath):
+            name_from = pathlib.PurePath(resource.at or "unknown")
+            folder_in_package = "" if name_from.parent.as_posix() == "." else name_from.parent.as_posix() + "/"
         else:
             raise TypeError(f"Unexpected type {type(resource)} for {resource}")
 
@@ -235,9 +244,9 @@ class RawNodePackageTransformer(NodeTransformer):
 
 
 class AbsoluteToRelativePathTransformer(NodeTransformer):
-    def __init__(self, *, root: typing.Union[os.PathLike, URI]):
-        if isinstance(root, URI):
-            self.root: typing.Union[pathlib.Path, URI] = root
+    def __init__(self, *, root: typing.Union[os.PathLike, URI, ZipPath]):
+        if isinstance(root, (URI, ZipPath)):
+            self.root: typing.Union[pathlib.Path, URI, ZipPath] = root
         else:
             self.root = pathlib.Path(root).resolve()
 
@@ -249,6 +258,10 @@ class AbsoluteToRelativePathTransformer(NodeTransformer):
                 raise TypeError(f"Cannot convert absolute path '{node.source_file}' with URI root '{self.root}'")
             sf = node.source_file.relative_to(self.root)
             return raw_nodes.ImportableSourceFile(source_file=sf, callable_name=node.callable_name)
+        elif isinstance(node.source_file, ZipPath):
+            return raw_nodes.ImportableSourceFile(
+                source_file=self._transform_ZipPath(node.source_file), callable_name=node.callable_name
+            )
         else:
             return node
 
@@ -267,11 +280,20 @@ class AbsoluteToRelativePathTransformer(NodeTransformer):
     def transform_WindowsPath(self, leaf: pathlib.WindowsPath, **kwargs) -> pathlib.Path:
         return self._transform_Path(leaf)
 
+    def _transform_ZipPath(self, leaf: ZipPath) -> pathlib.Path:
+        if not isinstance(self.root, ZipPath) or self.root.zip_file is not leaf.zip_file:
+            raise TypeError(f"Cannot convert '{leaf}' with root '{self.root}' outside of its package")
+
+        return pathlib.Path(posixpath.relpath(leaf.at or ".", self.root.at or "."))
+
+    def transform_ZipPath(self, leaf: ZipPath, **kwargs) -> pathlib.Path:
+        return self._transform_ZipPath(leaf)
+
 
 class RelativePathTransformer(NodeTransformer):
-    def __init__(self, *, root: typing.Union[os.PathLike, URI]):
-        if isinstance(root, URI):
-            self.root: typing.Union[pathlib.Path, URI] = root
+    def __init__(self, *, root: typing.Union[os.PathLike, URI, ZipPath]):
+        if isinstance(root, (URI, ZipPath)):
+            self.root: typing.Union[pathlib.Path, URI, ZipPath] = root
         else:
             self.root = pathlib.Path(root).resolve()
 
@@ -285,6 +307,9 @@ class RelativePathTransformer(NodeTransformer):
         return node
 
     def _transform_Path(self, leaf: pathlib.PurePath):
+        if isinstance(self.root, ZipPath) and leaf.is_absolute():
+            return leaf  # analog to pathlib.Path() / <abs path>
+
         return self.root / leaf
 
     def transform_PurePath(self, leaf: pathlib.PurePath, **kwargs) -> typing.Union[URI, pathlib.Path]:
@@ -321,9 +346,87 @@ class RelativePathTransformer(NodeTransformer):
 
 
 class UriNodeTransformer(NodeTransformerKnownParent, RelativePathTransformer):
+    """resolves URIs and importable source files to local paths; remote sources are downloaded concurrently"""
+
     def __init__(self, *, root_path: os.PathLike, uri_only_if_in_package: bool = False):
         super().__init__(root=root_path)
         self.uri_only_if_in_package = uri_only_if_in_package
+        # downloads of remote sources (by url and expected SHA-256 digest) started by the current transform() call
+        self._downloads: typing.Optional[typing.Dict[typing.Tuple[str, typing.Optional[str]], Future]] = None
+
+    def transform(self, node: typing.Any, **kwargs) -> typing.Any:
+        if self._downloads is not None:  # nested call
+            return super().transform(node, **kwargs)
+
+        remote_sources = {
+            (str(uri), sha256): (uri, sha256) for uri, sha256 in self._iter_remote_sources(node, **kwargs)
+        }
+        futures = _map_concurrently(
+            lambda uri, sha256: _resolve_source(uri, sha256=sha256), list(remote_sources.values())
+        )
+        self._downloads = dict(zip(remote_sources, futures))
+        try:
+            return super().transform(node, **kwargs)
+        finally:
+            self._downloads = None
+
+    def _iter_remote_sources(
+        self, node: typing.Any, name: typing.Optional[str] = None, parent: typing.Optional[raw_nodes.RawNode] = None
+    ) -> typing.Iterator[typing.Tuple[URI, typing.Optional[str]]]:
+        """iterate over the remote sources (and their expected SHA-256 digest) that transform() resolves"""
+        if isinstance(node, URI):
+            if not self._keep_uri(name, parent):
+                source: typing.Any = node
+            else:
+                return
+        elif isinstance(node, raw_nodes.ImportableSourceFile):
+            source = node.source_file
+        elif isinstance(node, raw_nodes.RawNode):
+            for n, value in iter_fields(node):
+                yield from self._iter_remote_sources(value, name=n, parent=node)
+
+            return
+        elif isinstance(node, list):
+            for value in node:
+                yield from self._iter_remote_sources(value, name=name, parent=parent)
+
+            return
+        elif isinstance(node, dict):
+            for value in node.values():
+                yield from self._iter_remote_sources(value, name=name, parent=parent)
+
+            return
+        else:
+            return
+
+        remote_uri = self._get_remote_uri(source)
+        if remote_uri is not None:
+            yield remote_uri, self._get_expected_sha256(name, parent)
+
+    def _get_remote_uri(self, source: typing.Any) -> typing.Optional[URI]:
+        if isinstance(source, URI):
+            uri: typing.Any = source
+        elif isinstance(source, pathlib.PurePath) and not source.is_absolute() and isinstance(self.root, URI):
+            uri = self.root / source
+        else:
+            return None
+
+        return uri if isinstance(uri, URI) and uri.scheme in ("http", "https") else None
+
+    def _resolve(self, source: typing.Any, sha256: typing.Optional[str]) -> pathlib.Path:
+        remote_uri = self._get_remote_uri(source)
+        download = (
+            None if remote_uri is None or self._downloads is None else self._downloads.get((str(remote_uri), sha256))
+        )
+        if download is None:
+            return _resolve_source(source, root_path=self.root, sha256=sha256)
+        else:
+            return download.result()
+
+    def _keep_uri(self, name: typing.Optional[str], parent: typing.Optional[raw_nodes.RawNode]) -> bool:
+        return self.uri_only_if_in_package and (
+            (name is None or parent is None) or name not in parent._include_in_package
+        )
 
     def transform_URI(
         self,
@@ -333,19 +436,38 @@ class UriNodeTransformer(NodeTransformerKnownParent, RelativePathTransformer):
         parent: typing.Optional[raw_nodes.RawNode] = None,
         **kwargs,
     ) -> typing.Union[URI, pathlib.Path]:
-        if self.uri_only_if_in_package and ((name is None or parent is None) or name not in parent._include_in_package):
+        if self._keep_uri(name, parent):
             return node
         else:
-            local_path = _resolve_source(node, root_path=self.root)
-            return local_path
+            return self._resolve(node, self._get_expected_sha256(name, parent))
 
     def transform_ImportableSourceFile(
-        self, node: raw_nodes.ImportableSourceFile, **kwargs
+        self,
+        node: raw_nodes.ImportableSourceFile,
+        *,
+        name: typing.Optional[str] = None,
+        parent: typing.Optional[raw_nodes.RawNode] = None,
+        **kwargs,
     ) -> raw_nodes.ResolvedImportableSourceFile:
         return raw_nodes.ResolvedImportableSourceFile(
-            source_file=_resolve_source(node.source_file, self.root), callable_name=node.callable_name
+            source_file=self._resolve(node.source_file, self._get_expected_sha256(name, parent)),
+            callable_name=node.callable_name,
         )
 
+    @staticmethod
+    def _get_expected_sha256(
+        name: typing.Optional[str], parent: typing.Optional[raw_nodes.RawNode]
+    ) -> typing.Optional[str]:
+        """get the declared SHA-256 digest of a file, e.g. 'sha256' for 'source' or 'architecture_sha256'"""
+        if name == "source":
+            sha256 = getattr(parent, "sha256", missing)
+        elif name == "architecture":
+            sha256 = getattr(parent, "architecture_sha256", missing)
+        else:
+            sha256 = missing
+
+        return sha256 if isinstance(sha256, str) else None
+
     def transform_ImportableModule(self, node: raw_nodes.ImportableModule, **kwargs) -> raw_nodes.LocalImportableModule:
         r = self.root if isinstance(self.root, pathlib.Path) else pathlib.Path()
         return raw_nodes.LocalImportableModule(**dataclasses.asdict(node), root_path=r)
@@ -17,6 +17,8 @@ from urllib.request import url2pathname
 from marshmallow import missing
 from marshmallow.utils import _Missing
 
+from ._zip_path import ZipPath
+
 try:
     from typing import get_args, get_origin
 except ImportError:
@@ -129,8 +131,8 @@ class ResourceDescription(RawNode):
     name: str = missing
     type: str = missing
     version: Union[_Missing, packaging.version.Version] = missing
-    root_path: Union[pathlib.Path, URI] = pathlib.Path()  # note: `root_path` is not officially part of the spec,
-    #                                                    but any RDF has it as it is the folder containing the rdf.yaml
+    root_path: Union[pathlib.Path, URI, ZipPath] = pathlib.Path()  # note: `root_path` is not officially part of
+    #                                      the spec, but any RDF has it as it is the folder containing the rdf.yaml
 
 
 @dataclass
@@ -187,7 +189,7 @@ class ImportableSourceFile(RawNode):
     _include_in_package = ("source_file",)
 
     callable_name: str = missing
-    source_file: Union[URI, pathlib.Path] = missing
+    source_file: Union[URI, pathlib.Path, ZipPath] = missing
 
     def __str__(self):
         return f"{self.source_file}:{self.callable_name}"
@@ -1,2 +1,2 @@
 from ._docs import get_ref_url, resolve_bioimageio_descrcription, snake_case_to_camel_case
-from ._various import is_valid_orcid_id
+from ._various import get_sha256, is_valid_orcid_id
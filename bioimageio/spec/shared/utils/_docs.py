@@ -29,6 +29,7 @@ def get_ref_url(type_: Literal["class", "function"], name: str, github_file_url:
     # https://github.com/bioimage-io/bioimage.io/issues/216#issuecomment-1012422194
     try:
         import requests  # not available in pyodide
+        from bioimageio.spec.shared._http import get_session
     except Exception:
         warnings.warn(f"Could not reslove {github_file_url} because requests library is not available.")
         return "URL NOT RESOLVED"
@@ -37,7 +38,7 @@ def get_ref_url(type_: Literal["class", "function"], name: str, github_file_url:
     look_for = {"class": ast.ClassDef, "function": ast.FunctionDef}[type_]
     raw_github_file_url = github_file_url.replace("github.com", "raw.githubusercontent.com").replace("/blob/", "/")
     try:
-        code = requests.get(raw_github_file_url).text
+        code = get_session().get(raw_github_file_url).text
     except requests.RequestException as e:
         warnings.warn(f"Could not resolve {github_file_url} due to {e}. Please check your internet connection.")
         return "URL NOT RESOLVED"
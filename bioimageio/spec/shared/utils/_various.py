@@ -1,3 +1,14 @@
+import os
+from typing import Union
+
+
+def get_sha256(path: Union[os.PathLike, str]) -> str:
+    """get the SHA-256 digest of a local file (memoized, see `bioimageio.spec.shared._hashing.get_sha256s`)"""
+    from .._hashing import get_sha256s
+
+    return next(iter(get_sha256s([path]).values()))
+
+
 def is_valid_orcid_id(orcid_id: str):
     """adapted from stdnum.iso7064.mod_11_2.checksum()"""
     check = 0
@@ -0,0 +1,86 @@
+import json
+import sys
+import tempfile
+import timeit
+from argparse import ArgumentParser
+from pathlib import Path
+
+from bioimageio.spec.shared import RDF_PARSERS, parse_rdf, yaml
+from bioimageio.spec.shared._rdf_parsers import get_rdf_parser
+
+
+def parse_args():
+    p = ArgumentParser(description="Compare the RDF parser backends (see bioimageio.spec.shared.RDF_PARSERS).")
+    p.add_argument("--example_specs", type=Path, default=Path(__file__).parent / "../example_specs")
+    p.add_argument("--n_collection_entries", type=int, default=10_000)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+    return args
+
+
+def write_synthetic_collection(folder: Path, n_entries: int) -> dict:
+    """write a collection RDF with `n_entries` entries as yaml and as json"""
+    collection = dict(
+        format_version="0.2.3",
+        type="collection",
+        name="synthetic collection",
+        description=f"a collection with {n_entries} entries",
+        authors=[{"name": "bioimage.io"}],
+        cite=[{"text": "bioimage.io", "doi": "10.1101/2022.06.07.495102"}],
+        documentation="README.md",
+        license="MIT",
+        collection=[
+            dict(
+                id=f"entry_{i}",
+                type="model",
+                name=f"model {i}",
+                description="a synthetic model entry",
+                rdf_source=f"https://example.com/models/{i}/rdf.yaml",
+                tags=["segmentation", "2d", "unet"],
+                covers=[f"https://example.com/models/{i}/cover.png"],
+                versions=[f"{i}.1", f"{i}.0"],
+            )
+            for i in range(n_entries)
+        ],
+    )
+    assert yaml is not None
+    yaml.dump(collection, folder / "collection.yaml")
+    (folder / "collection.json").write_text(json.dumps(collection), encoding="utf-8")
+    return collection
+
+
+def benchmark(name: str, sources, repeat: int) -> None:
+    print(f"{name}:")
+    for parser in RDF_PARSERS:
+        try:
+            get_rdf_parser(parser)
+        except ValueError as e:
+            print(f"  {parser:>8}: skipped ({e})")
+            continue
+
+        try:
+            duration = min(timeit.repeat(lambda: [parse_rdf(src, parser) for src in sources], number=1, repeat=repeat))
+        except ValueError:  # e.g. yaml parsed by the json backend
+            print(f"  {parser:>8}: not applicable")
+        else:
+            print(f"  {parser:>8}: {duration * 1000:10.1f} ms")
+
+
+def main(example_specs: Path, n_collection_entries: int, repeat: int):
+    rdfs = sorted(example_specs.glob("**/*.yaml"))
+    benchmark(f"{len(rdfs)} yaml files in {example_specs}", [p.read_bytes() for p in rdfs], repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_collection(Path(tmp), n_collection_entries)
+        for suffix in ("yaml", "json"):
+            path = Path(tmp) / f"collection.{suffix}"
+            benchmark(
+                f"synthetic collection with {n_collection_entries} entries ({suffix})", [path.read_bytes()], repeat
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(main(args.example_specs, args.n_collection_entries, args.repeat))
@@ -1,4 +1,11 @@
+import hashlib
 import pathlib
+import re
+import threading
+import time
+from functools import partial
+from io import BytesIO
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -111,3 +118,139 @@ def dataset_rdf():
 @pytest.fixture
 def upsamle_model_rdf():
     return pathlib.Path(__file__).parent / "../example_specs/models/upsample_test_model/rdf.yaml"
+
+
+class LocalHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """serves files from a directory with ETag validators and records all requests"""
+
+    def __init__(self, *args, state: "LocalHTTPServer", **kwargs):
+        self.state = state
+        self.etag = None
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        self.state.requests.append((self.command, self.path, dict(self.headers)))
+        if self.state.delay:
+            with self.state.lock:
+                self.state.active += 1
+                self.state.max_active = max(self.state.max_active, self.state.active)
+
+            time.sleep(self.state.delay)
+            with self.state.lock:
+                self.state.active -= 1
+
+        if self.path in self.state.statuses:
+            self.send_error(self.state.statuses[self.path])
+            return None
+
+        if self.path in self.state.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.state.redirects[self.path])
+            self.end_headers()
+            return None
+
+        path = pathlib.Path(self.translate_path(self.path))
+        if path.is_file():
+            stat = path.stat()
+            self.etag = '"' + hashlib.md5(f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == self.etag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+
+            byte_range = re.match(r"^bytes=(\d*)-(\d*)$", self.headers.get("Range", ""))
+            if_range = self.headers.get("If-Range")
+            if self.state.range_requests and byte_range and if_range in (None, self.etag):
+                first, last = byte_range.groups()
+                if first:
+                    start, end = int(first), min(int(last) + 1 if last else stat.st_size, stat.st_size)
+                else:  # suffix range
+                    start, end = max(0, stat.st_size - int(last)), stat.st_size
+
+                if start >= end:
+                    self.send_error(416)
+                    return None
+
+                with path.open("rb") as f:
+                    f.seek(start)
+                    content = f.read(end - start)
+
+                self.send_response(206)
+                self.send_header("Content-Type", self.guess_type(str(path)))
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{stat.st_size}")
+                self.send_header("Content-Length", str(end - start))
+                self.end_headers()
+                return BytesIO(content)
+
+        return super().send_head()
+
+    def copyfile(self, source, outputfile):
+        with self.state.lock:
+            drop_after = self.state.drop_after.pop(0) if self.state.drop_after else None
+
+        if drop_after is None:
+            content = source.read()
+        else:  # simulate a dropped connection
+            content = source.read(drop_after)
+            self.close_connection = True
+
+        outputfile.write(content)
+        outputfile.flush()
+        with self.state.lock:
+            self.state.bytes_sent += len(content)
+
+    def end_headers(self):
+        if self.etag is not None:
+            self.send_header("ETag", self.etag)
+
+        super().end_headers()
+
+
+class LocalHTTPServer:
+    def __init__(self, root: pathlib.Path):
+        self.root = root
+        self.requests: list = []
+        self.delay = 0.0  # latency of each request in seconds
+        self.active = 0  # requests currently delayed
+        self.max_active = 0  # maximum number of concurrently delayed requests
+        self.range_requests = True  # support range requests ('Range' and 'If-Range' headers)
+        self.drop_after: list = []  # drop the connection of the next responses after sending the given number of bytes
+        self.redirects: dict = {}  # redirect requests of these paths to the given locations
+        self.statuses: dict = {}  # respond to requests of these paths with the given (error) status codes
+        self.bytes_sent = 0  # number of sent content bytes
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(LocalHTTPRequestHandler, directory=str(root), state=self)
+        )
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """local HTTP server serving files written to `http_server.root`"""
+    root = tmp_path / "http_server_root"
+    root.mkdir()
+    with LocalHTTPServer(root) as server:
+        yield server
+
+
+@pytest.fixture
+def bioimageio_cache_path(tmp_path, monkeypatch):
+    """use an empty download cache"""
+    from bioimageio.spec.shared import _cache
+
+    cache_path = tmp_path / "bioimageio_cache"
+    monkeypatch.setattr(_cache, "BIOIMAGEIO_CACHE_PATH", cache_path)
+    return cache_path
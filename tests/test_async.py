@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import shutil
+import threading
+import time
+import zipfile
+
+import pytest
+
+from bioimageio.spec import (
+    aload_raw_resource_description,
+    avalidate,
+    load_raw_resource_description,
+    serialize_raw_resource_description_to_dict,
+)
+from bioimageio.spec.shared import ZipPath, _resolve_source, aresolve_source
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+def test_aload_raw_resource_description(unet2d_nuclei_broad_base_path, http_server, bioimageio_cache_path):
+    shutil.copy(unet2d_nuclei_broad_base_path / "rdf.yaml", http_server.root / "rdf.yaml")
+    url = f"{http_server.url}/rdf.yaml"
+
+    raw_rd = asyncio.run(aload_raw_resource_description(url))
+    assert raw_rd.root_path == URI(f"{http_server.url}/")
+    expected = load_raw_resource_description(url)
+    assert serialize_raw_resource_description_to_dict(raw_rd) == serialize_raw_resource_description_to_dict(expected)
+
+
+def test_avalidate(dataset_rdf, http_server, bioimageio_cache_path):
+    shutil.copy(dataset_rdf, http_server.root / "rdf.yaml")
+    url = f"{http_server.url}/rdf.yaml"
+
+    async def validate_all():
+        return await asyncio.gather(
+            avalidate(url), avalidate(dataset_rdf), avalidate(f"{http_server.url}/missing.yaml")
+        )
+
+    remote_summary, local_summary, missing_summary = asyncio.run(validate_all())
+    assert remote_summary["status"] == "passed", remote_summary["error"]
+    assert remote_summary["source_name"] == f"{url}..."
+    assert local_summary["status"] == "passed", local_summary["error"]
+    assert missing_summary["status"] == "failed"
+
+
+def test_aresolve_source_list(http_server, bioimageio_cache_path):
+    n_files = 8
+    for i in range(n_files):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    http_server.delay = 0.5
+    t0 = time.perf_counter()
+    paths = asyncio.run(aresolve_source([URI(f"{http_server.url}/file{i}.txt") for i in range(n_files)]))
+    assert time.perf_counter() - t0 < n_files * http_server.delay / 2
+    assert [p.read_text() for p in paths] == [f"content {i}" for i in range(n_files)]
+
+
+def test_avalidate_does_not_block_the_event_loop(unet2d_nuclei_broad_base_path, monkeypatch):
+    from bioimageio.spec import commands, io_
+
+    threads = []
+
+    def record_thread(func):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(commands, "validate", record_thread(commands.validate))
+    monkeypatch.setattr(io_, "load_raw_resource_description", record_thread(io_.load_raw_resource_description))
+
+    async def load_and_validate():
+        return await asyncio.gather(
+            aload_raw_resource_description(unet2d_nuclei_broad_base_path / "rdf.yaml"),
+            avalidate(unet2d_nuclei_broad_base_path / "rdf.yaml"),
+        )
+
+    raw_rd, summary = asyncio.run(load_and_validate())
+    assert summary["status"] == "passed", summary["error"]
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_aresolve_source_with_aiohttp(http_server, bioimageio_cache_path, monkeypatch):
+    pytest.importorskip("aiohttp")
+
+    def blocking_download(*args, **kwargs):
+        raise AssertionError("blocking download")
+
+    monkeypatch.setattr(_resolve_source, "_fetch_url", blocking_download)
+    content = bytes(range(256)) * 400
+    (http_server.root / "weights.pt").write_bytes(content)
+    http_server.drop_after = [10_000]
+
+    async def resolve_concurrently():
+        url = URI(f"{http_server.url}/weights.pt")
+        return await asyncio.gather(aresolve_source(url), aresolve_source(url))
+
+    path, same_path = asyncio.run(resolve_concurrently())
+    assert path == same_path
+    assert path.read_bytes() == content
+    assert path.parent.name == hashlib.sha256(content).hexdigest()
+    # the interrupted download is resumed; both calls share it
+    assert [h.get("Range", "")[:6] for _, _, h in http_server.requests] == ["", "bytes="]
+    assert not list((bioimageio_cache_path / "tmp").glob("*.part*"))
+
+
+def test_aresolve_source_list_checks_sha256(http_server, bioimageio_cache_path):
+    for i in range(2):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    urls = [URI(f"{http_server.url}/file{i}.txt") for i in range(2)]
+    digests = [hashlib.sha256(b"content 0").hexdigest(), hashlib.sha256(b"unexpected").hexdigest()]
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        asyncio.run(aresolve_source(urls, sha256=digests))
+
+
+def test_aresolve_source_in_package(tmp_path):
+    package_path = tmp_path / "package.zip"
+    with zipfile.ZipFile(package_path, "w") as zf:
+        zf.writestr("x/readme.md", "read me")
+
+    root = ZipPath(package_path)
+    assert asyncio.run(aresolve_source(root / "x/readme.md")).read_text() == "read me"
+    assert asyncio.run(aresolve_source("x/readme.md", root_path=root)).read_text() == "read me"
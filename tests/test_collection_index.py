@@ -0,0 +1,53 @@
+import json
+
+from bioimageio.spec.shared._collection_index import CollectionIndex
+
+COLLECTION = {
+    "collection": [
+        {
+            "id": "10.5281/zenodo.5764892",
+            "nickname": "impartial-shrimp",
+            "type": "model",
+            "rdf_source": "https://zenodo.org/api/files/1/5764893/rdf.yaml",
+            "versions": ["5764893", "5764891"],
+        },
+        {"id": "ilastik/covid_if_training_data", "type": "dataset", "rdf_source": "https://example.com/rdf.yaml"},
+    ]
+}
+
+
+def test_collection_index_lookup(tmp_path):
+    index = CollectionIndex(tmp_path / "index.sqlite", "https://example.com/collection.json")
+    index.update(COLLECTION)
+    assert index["impartial-shrimp"] == ("model", "https://zenodo.org/api/files/1/5764893/rdf.yaml")
+    assert index["10.5281/zenodo.5764892/5764891"] == ("model", "https://zenodo.org/api/files/1/5764891/rdf.yaml")
+    assert index.get("ilastik/covid_if_training_data") == ("dataset", "https://example.com/rdf.yaml")
+    assert index.get("unknown") is None
+    assert len(index) == 5
+
+    # index persists across instances (processes)
+    reopened = CollectionIndex(tmp_path / "index.sqlite", "https://example.com/collection.json")
+    assert dict(reopened) == dict(index)
+
+
+def test_collection_index_conditional_refresh(tmp_path, http_server):
+    (http_server.root / "collection.json").write_text(json.dumps(COLLECTION))
+    url = f"{http_server.url}/collection.json"
+
+    index = CollectionIndex(tmp_path / "index.sqlite", url)
+    assert index.refresh() is None
+    assert "impartial-shrimp" in index
+    assert "If-None-Match" not in http_server.requests[-1][2]
+
+    # an unchanged collection is revalidated, but not downloaded again
+    index = CollectionIndex(tmp_path / "index.sqlite", url)
+    assert index.refresh() is None
+    assert "If-None-Match" in http_server.requests[-1][2]
+    assert len(index) == 5
+
+
+def test_collection_index_refresh_error_keeps_entries(tmp_path, http_server):
+    index = CollectionIndex(tmp_path / "index.sqlite", f"{http_server.url}/missing.json")
+    index.update(COLLECTION)
+    assert index.refresh() is not None
+    assert "impartial-shrimp" in index
@@ -0,0 +1,212 @@
+import json
+import multiprocessing
+import os
+import pathlib
+import socket
+import threading
+import time
+
+from bioimageio.spec.shared import _cache, _resolve_source, resolve_source
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+def test_resolve_source_list_downloads_concurrently(http_server, bioimageio_cache_path):
+    n_files = 8
+    for i in range(n_files):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    http_server.delay = 0.5
+    t0 = time.perf_counter()
+    paths = resolve_source([URI(f"{http_server.url}/file{i}.txt") for i in range(n_files)])
+    duration = time.perf_counter() - t0
+
+    assert [p.read_text() for p in paths] == [f"content {i}" for i in range(n_files)]
+    assert http_server.max_active > 1
+    assert duration < n_files * http_server.delay / 2
+
+
+def test_resolve_source_list_limits_downloads_per_host(http_server, bioimageio_cache_path, monkeypatch):
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_MAX_DOWNLOADS_PER_HOST", 2)
+    monkeypatch.setattr(_resolve_source, "_host_semaphores", {})
+    for i in range(6):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    http_server.delay = 0.2
+    resolve_source([URI(f"{http_server.url}/file{i}.txt") for i in range(6)])
+    assert http_server.max_active == 2
+
+
+def test_resolve_source_list_deduplicates_downloads(http_server, bioimageio_cache_path):
+    (http_server.root / "weights.pt").write_bytes(b"weights")
+    http_server.delay = 0.2
+    progress = []
+
+    class Pbar:
+        def __init__(self, total, **kwargs):
+            pass
+
+        def update(self, n):
+            progress.append(n)
+
+        def close(self):
+            pass
+
+    paths = resolve_source([URI(f"{http_server.url}/weights.pt")] * 5, pbar=Pbar)
+    assert len(set(paths)) == 1
+    assert len([r for r in http_server.requests if r[0] == "GET"]) == 1
+    assert sum(progress) == len(b"weights")
+
+
+def test_concurrent_downloads_are_shared_for_the_same_cache_policy_only(
+    http_server, bioimageio_cache_path, monkeypatch
+):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from bioimageio.spec.shared import CachePolicy
+
+    (http_server.root / "rdf.yaml").write_text("name: original")
+    uri = URI(f"{http_server.url}/rdf.yaml")
+    resolve_source(uri)
+    (http_server.root / "rdf.yaml").write_text("name: updated")
+
+    fetch_url = _resolve_source._fetch_url
+    policies = []
+    release = threading.Event()
+
+    def slow_fetch_url(*args, cache_policy=None, **kwargs):
+        policies.append(cache_policy)
+        if len(policies) == 1:
+            release.wait(5)
+
+        return fetch_url(*args, cache_policy=cache_policy, **kwargs)
+
+    monkeypatch.setattr(_resolve_source, "_fetch_url", slow_fetch_url)
+    with ThreadPoolExecutor(2) as executor:
+        executor.submit(resolve_source, uri)  # cache hit in flight
+        while not policies:
+            time.sleep(0.01)
+
+        revalidated = executor.submit(resolve_source, uri, cache_policy=CachePolicy(revalidate=True))
+        try:
+            assert revalidated.result(timeout=3).read_text() == "name: updated"  # not joined with the cache hit
+        finally:
+            release.set()
+
+    assert policies == [None, CachePolicy(revalidate=True)]
+
+
+def test_uri_node_transformer_downloads_concurrently(http_server, bioimageio_cache_path):
+    from bioimageio.spec.shared.node_transformer import UriNodeTransformer
+
+    for i in range(4):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    http_server.delay = 0.5
+    uris = [URI(f"{http_server.url}/file{i}.txt") for i in range(4)]
+    transformed = UriNodeTransformer(root_path=pathlib.Path()).transform({"files": uris, "first": uris[0]})
+    assert [p.read_text() for p in transformed["files"]] == [f"content {i}" for i in range(4)]
+    assert transformed["first"] == transformed["files"][0]
+    assert http_server.max_active > 1
+    assert len([r for r in http_server.requests if r[0] == "GET"]) == 4
+
+
+def test_package_content_is_downloaded_concurrently(http_server, bioimageio_cache_path):
+    from bioimageio.spec.io_ import get_resource_package_content_wo_rdf, load_raw_resource_description
+
+    for i in range(4):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    raw_rd = load_raw_resource_description(
+        {
+            "format_version": "0.2.3",
+            "type": "rdf",
+            "name": "test",
+            "description": "test",
+            "authors": [{"name": "me"}],
+            "cite": [{"text": "x", "url": "https://example.com"}],
+            "attachments": {"files": [f"{http_server.url}/file{i}.txt" for i in range(4)]},
+        }
+    )
+    http_server.delay = 0.5
+    _, content = get_resource_package_content_wo_rdf(raw_rd, download_remote=True)
+    assert {name: path.read_text() for name, path in content.items()} == {
+        f"file{i}.txt": f"content {i}" for i in range(4)
+    }
+    assert http_server.max_active > 1
+
+
+def _resolve_in_process(url: str, cache_path: str) -> str:
+    from bioimageio.spec.shared import _cache
+
+    _cache.BIOIMAGEIO_CACHE_PATH = pathlib.Path(cache_path)
+    return str(resolve_source(URI(url)))
+
+
+def test_concurrent_processes_download_once(http_server, bioimageio_cache_path):
+    content = os.urandom(1 << 20)
+    (http_server.root / "weights.pt").write_bytes(content)
+    http_server.delay = 0.2
+    n_processes = 8
+    with multiprocessing.get_context("spawn").Pool(n_processes) as pool:
+        paths = pool.starmap(
+            _resolve_in_process, [(f"{http_server.url}/weights.pt", str(bioimageio_cache_path))] * n_processes
+        )
+
+    assert len(set(paths)) == 1
+    assert pathlib.Path(paths[0]).read_bytes() == content
+    assert len([r for r in http_server.requests if r[0] == "GET"]) == 1
+    assert not list((bioimageio_cache_path / "locks").iterdir())
+    assert not list((bioimageio_cache_path / "tmp").glob("*.part"))
+
+
+def _hold_lock(cache_path: str):
+    _cache.BIOIMAGEIO_CACHE_PATH = pathlib.Path(cache_path)
+    with _cache.lock("held"):
+        os._exit(1)  # die without releasing the lock
+
+
+def test_lock_of_dead_process_is_stale(bioimageio_cache_path):
+    process = multiprocessing.get_context("spawn").Process(target=_hold_lock, args=(str(bioimageio_cache_path),))
+    process.start()
+    process.join()
+    assert (bioimageio_cache_path / "locks" / "held.lock").exists()
+
+    t0 = time.perf_counter()
+    with _cache.lock("held"):
+        pass
+
+    assert time.perf_counter() - t0 < 5
+
+
+def test_lock_without_heartbeat_is_stale(bioimageio_cache_path):
+    # a lock of a process on another host that was not refreshed
+    lock_path = bioimageio_cache_path / "locks" / "held.lock"
+    lock_path.parent.mkdir(parents=True)
+    lock_path.write_text(json.dumps(dict(token="token", pid=1, host=f"not-{socket.gethostname()}")))
+
+    t0 = time.perf_counter()
+    with _cache.lock("held", stale_after=0.5):
+        pass
+
+    assert 0.5 < time.perf_counter() - t0 < 5
+
+
+def test_held_lock_is_not_stale(bioimageio_cache_path):
+    events = []
+
+    def hold():
+        with _cache.lock("held", stale_after=0.2):
+            events.append("acquired")
+            time.sleep(1)  # longer than stale_after, but refreshed by the heartbeat
+            events.append("released")
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    while not events:
+        time.sleep(0.01)
+
+    with _cache.lock("held", stale_after=0.2):
+        events.append("acquired again")
+
+    holder.join()
+    assert events == ["acquired", "released", "acquired again"]
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from bioimageio.spec.shared import _resolve_source
+
+
+@pytest.fixture
+def zenodo(http_server, bioimageio_cache_path, monkeypatch):
+    """local stand-in of the Zenodo records API with a concept record 100 and its latest version record 102"""
+    monkeypatch.setattr(_resolve_source, "get_bioimageio_collection_entries", lambda: {})
+    monkeypatch.setattr(_resolve_source, "_ZENODO_RECORD_APIS", {"10.5281/zenodo.": f"{http_server.url}/api/records"})
+    records = http_server.root / "api" / "records"
+    records.mkdir(parents=True)
+    for record_id in ("100", "102"):  # the concept record id resolves to the latest version
+        (records / record_id).write_text(
+            json.dumps(
+                {
+                    "id": 102,
+                    "conceptrecid": "100",
+                    "files": [{"key": "rdf.yaml", "links": {"self": f"{http_server.url}/files/102/rdf.yaml"}}],
+                }
+            )
+        )
+
+    return http_server
+
+
+def count_api_requests(http_server):
+    return len([r for r in http_server.requests if r[1].startswith("/api/records/")])
+
+
+@pytest.mark.parametrize("doi", ["10.5281/zenodo.102", "10.5281/zenodo.100/102"])
+def test_versioned_doi_is_cached_indefinitely(zenodo, doi, monkeypatch):
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_DOI_CACHE_TTL", 0)
+    expected = f"{zenodo.url}/files/102/rdf.yaml"
+    assert _resolve_source._resolve_rdf_source_id(doi, doi) == expected
+    assert _resolve_source._resolve_rdf_source_id(doi, doi) == expected
+    assert count_api_requests(zenodo) == 1
+
+
+def test_concept_doi_is_cached_with_ttl(zenodo, monkeypatch):
+    doi = "10.5281/zenodo.100"
+    expected = f"{zenodo.url}/files/102/rdf.yaml"
+    assert _resolve_source._resolve_rdf_source_id(doi, doi) == expected
+    assert _resolve_source._resolve_rdf_source_id(doi, doi) == expected
+    assert count_api_requests(zenodo) == 1
+
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_DOI_CACHE_TTL", 0)  # expired
+    assert _resolve_source._resolve_rdf_source_id(doi, doi) == expected
+    assert count_api_requests(zenodo) == 2
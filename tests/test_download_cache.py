@@ -0,0 +1,172 @@
+import hashlib
+
+from bioimageio.spec.shared import resolve_source
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+def test_download_is_cached_by_content(http_server, bioimageio_cache_path):
+    content = b"weights" * 1000
+    digest = hashlib.sha256(content).hexdigest()
+    (http_server.root / "weights.pt").write_bytes(content)
+    (http_server.root / "mirror").mkdir()
+    (http_server.root / "mirror" / "weights.pt").write_bytes(content)
+
+    path = resolve_source(URI(f"{http_server.url}/weights.pt"))
+    assert path.read_bytes() == content
+    assert path.parent.name == digest
+    assert bioimageio_cache_path / "blobs" in path.parents
+
+    # cache hit
+    n_requests = len(http_server.requests)
+    assert resolve_source(URI(f"{http_server.url}/weights.pt"), sha256=digest) == path
+    assert len(http_server.requests) == n_requests
+
+    # identical content from another url is stored only once
+    mirrored = resolve_source(URI(f"{http_server.url}/mirror/weights.pt"))
+    assert len(http_server.requests) == n_requests + 1
+    assert mirrored == path
+    assert len(list((bioimageio_cache_path / "blobs").glob("*/*"))) == 1
+
+
+def test_download_cache_detects_invalid_entries(http_server, bioimageio_cache_path):
+    content = b"weights" * 1000
+    (http_server.root / "weights.pt").write_bytes(content)
+    url = URI(f"{http_server.url}/weights.pt")
+    path = resolve_source(url)
+
+    # truncated blob
+    path.write_bytes(content[:10])
+    n_requests = len(http_server.requests)
+    assert resolve_source(url).read_bytes() == content
+    assert len(http_server.requests) == n_requests + 1
+
+    # cached digest does not match expected digest
+    new_content = b"updated weights"
+    (http_server.root / "weights.pt").write_bytes(new_content)
+    new_path = resolve_source(url, sha256=hashlib.sha256(new_content).hexdigest())
+    assert new_path.read_bytes() == new_content
+    assert len(http_server.requests) == n_requests + 2
+
+
+def test_evict_cache(http_server, bioimageio_cache_path):
+    import os
+    import time
+
+    from bioimageio.spec.shared import evict_cache
+
+    paths = []
+    for i in range(4):
+        (http_server.root / f"file{i}.bin").write_bytes(bytes([i]) * 1000)
+        paths.append(resolve_source(URI(f"{http_server.url}/file{i}.bin")))
+
+    package = bioimageio_cache_path / "extracted_packages" / "some_package"
+    package.mkdir(parents=True)
+    (package / "rdf.yaml").write_bytes(b"x" * 1000)
+
+    # set last access: file0 (oldest), package, file1, file2, file3 (in use)
+    now = time.time()
+    for age, p in zip([500, 400, 300, 200], [paths[0].parent, package, paths[1].parent, paths[2].parent]):
+        os.utime(p, (now - age, now - age))
+
+    with paths[0].open("rb") as f:
+        assert evict_cache(max_bytes=3500) == [paths[0].parent, package]
+        assert f.read() == bytes([0]) * 1000  # opened files remain readable
+
+    assert not paths[0].exists()
+    assert evict_cache(max_entries=1) == [paths[1].parent, paths[2].parent]  # recently used file3 is kept
+    assert paths[3].exists()
+    assert evict_cache(max_entries=1, min_age=0) == []
+
+    # evicted downloads are downloaded again
+    assert resolve_source(URI(f"{http_server.url}/file0.bin")).read_bytes() == bytes([0]) * 1000
+
+
+def test_evict_cache_if_needed_tallies_additions(http_server, bioimageio_cache_path, monkeypatch):
+    from bioimageio.spec.shared import _cache
+
+    monkeypatch.setattr(_cache, "BIOIMAGEIO_CACHE_MAX_BYTES", 3500)
+    scans = []
+    iter_cache_entries = _cache.iter_cache_entries
+    monkeypatch.setattr(_cache, "iter_cache_entries", lambda: scans.append(1) or iter_cache_entries())
+    monkeypatch.setattr(_cache, "_MIN_SCAN_INTERVAL", 0)
+    paths = []
+    for i in range(4):
+        (http_server.root / f"file{i}.bin").write_bytes(bytes([i]) * 1000)
+        paths.append(resolve_source(URI(f"{http_server.url}/file{i}.bin")))
+
+    assert len(scans) == 2  # initial scan and scan when the tally exceeds the byte budget (all entries are recent)
+    _cache.evict_cache_if_needed(0)
+    assert len(scans) == 3  # still over budget
+
+
+def test_pinned_cache_entries_are_not_evicted(http_server, bioimageio_cache_path):
+    import os
+    import time
+
+    from bioimageio.spec.shared import _cache
+
+    paths = []
+    for i in range(2):
+        (http_server.root / f"file{i}.bin").write_bytes(bytes([i]) * 1000)
+        paths.append(resolve_source(URI(f"{http_server.url}/file{i}.bin")))
+
+    now = time.time()
+    for p in paths:
+        os.utime(p.parent, (now - 500, now - 500))
+
+    with _cache.in_use(paths[0]):
+        assert _cache.evict_cache(max_entries=1) == [paths[1].parent]
+
+    assert paths[0].exists()
+
+
+def test_cached_rdf_is_revalidated(http_server, bioimageio_cache_path):
+    from bioimageio.spec.shared import resolve_rdf_source
+
+    (http_server.root / "rdf.yaml").write_text("name: original\n")
+    url = f"{http_server.url}/rdf.yaml"
+    assert resolve_rdf_source(url).data == {"name": "original"}
+
+    # unchanged
+    assert resolve_rdf_source(url).data == {"name": "original"}
+    assert "If-None-Match" in http_server.requests[-1][2]
+
+    # updated upstream
+    (http_server.root / "rdf.yaml").write_text("name: updated rdf\n")
+    assert resolve_rdf_source(url).data == {"name": "updated rdf"}
+
+
+def test_cache_policy(http_server, bioimageio_cache_path):
+    import pytest
+
+    from bioimageio.spec.shared import CachePolicy
+    from bioimageio.spec.shared.common import CacheWarning
+
+    (http_server.root / "file.txt").write_text("content")
+    uri = URI(f"{http_server.url}/file.txt")
+    with pytest.raises(RuntimeError):
+        resolve_source(uri, cache_policy=CachePolicy(offline=True))
+
+    path = resolve_source(uri)
+    n_requests = len(http_server.requests)
+    assert resolve_source(uri, cache_policy=CachePolicy(max_age=3600)) == path
+    assert resolve_source(uri, cache_policy=CachePolicy(offline=True, revalidate=True)) == path
+    assert len(http_server.requests) == n_requests
+
+    assert resolve_source(uri, cache_policy=CachePolicy(max_age=0)) == path
+    assert resolve_source(uri, cache_policy=CachePolicy(revalidate=True)) == path
+    assert len(http_server.requests) == n_requests + 2
+
+    # string sources
+    (http_server.root / "file.txt").write_text("updated content")
+    assert resolve_source(str(uri), cache_policy=CachePolicy(offline=True)).read_text() == "content"
+    assert len(http_server.requests) == n_requests + 2
+    path = resolve_source(str(uri), cache_policy=CachePolicy(revalidate=True))
+    assert path.read_text() == "updated content"
+    assert len(http_server.requests) == n_requests + 3
+
+    # serve stale content if server is not reachable
+    http_server.server.shutdown()
+    http_server.server.server_close()
+    with pytest.warns(CacheWarning, match="Failed to revalidate"):
+        assert resolve_source(uri, cache_policy=CachePolicy(revalidate=True)) == path
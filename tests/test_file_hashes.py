@@ -0,0 +1,51 @@
+import hashlib
+import shutil
+
+from bioimageio.spec.commands import validate
+from bioimageio.spec.shared import _hashing
+
+
+def test_get_sha256s_memoizes_digests(tmp_path, bioimageio_cache_path, monkeypatch):
+    contents = {tmp_path / f"file{i}.bin": bytes([i]) * (1000 * i) for i in range(8)}
+    for path, content in contents.items():
+        path.write_bytes(content)
+
+    hashed = []
+    compute_sha256 = _hashing.compute_sha256
+
+    def counting_compute_sha256(path):
+        hashed.append(path)
+        return compute_sha256(path)
+
+    monkeypatch.setattr(_hashing, "compute_sha256", counting_compute_sha256)
+    monkeypatch.setattr(_hashing, "MMAP_THRESHOLD", 4000)  # hash some files memory mapped
+    expected = {path: hashlib.sha256(content).hexdigest() for path, content in contents.items()}
+    assert _hashing.get_sha256s(contents) == expected
+    assert len(hashed) == len(contents)
+
+    # unchanged files are not hashed again, not even by another process (persistent cache)
+    monkeypatch.setattr(_hashing, "_file_hash_caches", {})
+    assert _hashing.get_sha256s(contents) == expected
+    assert len(hashed) == len(contents)
+
+    # changed files are hashed again
+    changed = tmp_path / "file1.bin"
+    changed.write_bytes(b"changed content")
+    assert _hashing.get_sha256s([changed]) == {changed: hashlib.sha256(b"changed content").hexdigest()}
+    assert hashed[-1] == changed
+
+
+def test_validate_check_file_hashes(unet2d_nuclei_broad_base_path, tmp_path, bioimageio_cache_path):
+    model_dir = tmp_path / "model"
+    shutil.copytree(unet2d_nuclei_broad_base_path, model_dir)
+    summary = validate(model_dir / "rdf.yaml")
+    assert summary["status"] == "passed", summary["error"]
+
+    summary = validate(model_dir / "rdf.yaml", check_file_hashes=True)
+    assert summary["status"] == "failed"
+    assert list(summary["error"]["weights"]) == ["onnx"]  # example weights.onnx does not match its sha256
+    assert "sha256" in summary["error"]["weights"]["onnx"]
+
+    (model_dir / "unet2d.py").write_text("# modified")
+    summary = validate(model_dir / "rdf.yaml", check_file_hashes=True)
+    assert "architecture_sha256" in summary["error"]["weights"]["pytorch_state_dict"]
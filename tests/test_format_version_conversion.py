@@ -1,3 +1,4 @@
+from copy import deepcopy
 from dataclasses import asdict
 from typing import Tuple
 
@@ -46,6 +47,25 @@ def test_model_format_version_conversion(unet2d_nuclei_broad_before_latest, unet
         assert item == expected[key]
 
 
+def test_conversion_copies_on_write(unet2d_nuclei_broad_before_latest):
+    from bioimageio.spec.model.converters import maybe_convert
+    from bioimageio.spec.shared._copy_on_write import count_copies
+
+    old_model_data = yaml.load(unet2d_nuclei_broad_before_latest)
+    old_model_data.setdefault("config", {})["large"] = {"data": [{"i": i} for i in range(10_000)]}
+    expected = deepcopy(old_model_data)
+    expected_converted = maybe_convert(deepcopy(old_model_data))
+
+    with count_copies() as count:
+        converted = maybe_convert(old_model_data)
+        schema.Model().load(converted)
+
+    assert converted == expected_converted
+    assert old_model_data == expected  # input is not modified
+    assert converted["config"]["large"] is old_model_data["config"]["large"]  # untouched subtrees are shared
+    assert count.copies <= 40 and count.items < 1_000, count  # independent of the size of config
+
+
 # todo: break forward compatibility on major version difference?
 @pytest.mark.parametrize("v_diff", [(0, 0, 1), (0, 1, 0), (1, 0, 0), (0, 1, 1)])
 def test_forward_compatible(v_diff: Tuple[int, int, int], unet2d_nuclei_broad_latest):
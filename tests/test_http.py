@@ -0,0 +1,42 @@
+import pytest
+
+from bioimageio.spec.shared import create_session, get_session, resolve_source, set_session, source_available
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+@pytest.fixture
+def session():
+    """inject a fresh session and restore the previous one afterwards"""
+    session = create_session(retries=0)
+    previous = set_session(session)
+    yield session
+    set_session(previous)
+
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
+
+
+def test_injected_session_is_used(http_server, bioimageio_cache_path, session):
+    requested = []
+    original_request = session.request
+
+    def request(method, url, *args, **kwargs):
+        requested.append((method, url))
+        return original_request(method, url, *args, **kwargs)
+
+    session.request = request
+    (http_server.root / "file.txt").write_text("content")
+    url = f"{http_server.url}/file.txt"
+    assert source_available(URI(url), root_path=bioimageio_cache_path)
+    assert resolve_source(URI(url)).read_text() == "content"
+    assert requested == [("HEAD", url), ("GET", url)]
+
+
+def test_session_default_timeout(http_server, bioimageio_cache_path):
+    import requests
+
+    (http_server.root / "file.txt").write_text("content")
+    http_server.delay = 1.0
+    with pytest.raises(requests.RequestException, match="timed out"):
+        create_session(timeout=0.1, retries=0).get(f"{http_server.url}/file.txt")
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+
+NO_NETWORK_IMPORT = """
+import socket
+import time
+
+network_calls = []
+
+
+def no_network(*args, **kwargs):
+    network_calls.append(args)
+    raise OSError("network access at import time")
+
+
+socket.socket.connect = no_network
+socket.create_connection = no_network
+socket.getaddrinfo = no_network
+
+t0 = time.perf_counter()
+import bioimageio.spec
+
+print(len(network_calls), time.perf_counter() - t0)
+"""
+
+
+def test_import_without_network_access():
+    ret = subprocess.run([sys.executable, "-c", NO_NETWORK_IMPORT], stdout=subprocess.PIPE, encoding="utf-8")
+    assert ret.returncode == 0
+    n_network_calls, import_time = ret.stdout.split()
+    assert int(n_network_calls) == 0
+    print(f"import bioimageio.spec took {float(import_time):.3f}s")
+
+
+def test_collection_is_fetched_lazily():
+    from bioimageio.spec.shared import _resolve_source
+
+    entries = _resolve_source.get_bioimageio_collection_entries()
+    assert entries is _resolve_source.get_bioimageio_collection_entries()  # memoized
+    assert _resolve_source.BIOIMAGEIO_COLLECTION_ENTRIES is entries  # deprecated module level constant
+
+
+def test_failed_site_config_fetch_is_retried(monkeypatch):
+    from bioimageio.spec.shared import _resolve_source
+
+    results = [(None, "transient network error"), ({"tag_categories": {}}, None)]
+    monkeypatch.setattr(_resolve_source, "_resolve_json_from_url", lambda *args, **kwargs: results.pop(0))
+    _resolve_source.get_bioimageio_site_config.cache_clear()
+    try:
+        assert _resolve_source.get_bioimageio_site_config() == (None, "transient network error")
+        assert _resolve_source.get_bioimageio_site_config() == (None, "transient network error")  # not retried yet
+        monkeypatch.setattr(_resolve_source, "_FAILED_FETCH_RETRY_INTERVAL", 0)
+        assert _resolve_source.get_bioimageio_site_config() == ({"tag_categories": {}}, None)  # retried
+        assert _resolve_source.get_bioimageio_site_config() == ({"tag_categories": {}}, None)  # memoized
+    finally:
+        _resolve_source.get_bioimageio_site_config.cache_clear()
+
+
+def get_import_times(statement: str) -> dict:
+    """import times (cumulative, in µs) of all modules imported by `statement` as reported by `python -X importtime`"""
+    ret = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], stderr=subprocess.PIPE, encoding="utf-8"
+    )
+    assert ret.returncode == 0, ret.stderr
+    import_times = {}
+    for line in ret.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative)
+
+    return import_times
+
+
+def test_import_time_budget():
+    import_times = get_import_times("import bioimageio.spec")
+    assert not any(name.startswith("bioimageio.spec.") and name != "bioimageio.spec.v" for name in import_times)
+    assert "marshmallow" not in import_times
+    assert import_times["bioimageio.spec"] < 200_000  # generous budget of 0.2s
+
+
+def test_general_rdf_import_does_not_load_model_schemas():
+    import_times = get_import_times(
+        "from bioimageio.spec import load_raw_resource_description; "
+        "load_raw_resource_description({'format_version': '0.2.3', 'type': 'rdf', 'name': 'test', "
+        "'description': 'test', 'authors': [{'name': 'me'}], 'cite': [{'text': 'x', 'url': 'https://example.com'}]})"
+    )
+    assert "bioimageio.spec.rdf.v0_2.schema" in import_times
+    assert not any(name.startswith("bioimageio.spec.model") for name in import_times)
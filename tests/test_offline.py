@@ -0,0 +1,97 @@
+import json
+import time
+
+import pytest
+
+from bioimageio.spec.shared import (
+    OfflineError,
+    _cache,
+    _resolve_source,
+    get_session,
+    resolve_rdf_source,
+    resolve_source,
+    set_offline,
+    sources_available,
+)
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+@pytest.fixture
+def offline():
+    previous = set_offline(True)
+    yield
+    set_offline(previous)
+
+
+@pytest.fixture
+def mirror_path(tmp_path, monkeypatch):
+    """use an empty mirror directory"""
+    mirror_path = tmp_path / "mirror"
+    mirror_path.mkdir()
+    monkeypatch.setattr(_cache, "BIOIMAGEIO_MIRROR_PATH", mirror_path)
+    return mirror_path
+
+
+def test_no_network_access_offline(offline):
+    with pytest.raises(OfflineError):
+        get_session()
+
+
+def test_resolve_cached_source_offline(http_server, bioimageio_cache_path):
+    (http_server.root / "file.txt").write_text("content")
+    url = URI(f"{http_server.url}/file.txt")
+    path = resolve_source(url)
+
+    set_offline(True)
+    try:
+        assert resolve_source(url) == path
+        with pytest.raises(RuntimeError):
+            resolve_source(URI(f"{http_server.url}/missing.txt"))
+    finally:
+        set_offline(False)
+
+    assert len(http_server.requests) == 1
+
+
+def test_resolve_mirrored_source_offline(offline, mirror_path, bioimageio_cache_path):
+    (mirror_path / "example.com" / "files").mkdir(parents=True)
+    (mirror_path / "example.com" / "files" / "file.txt").write_text("content")
+
+    t0 = time.perf_counter()
+    assert resolve_source(URI("https://example.com/files/file.txt")).read_text() == "content"
+    assert sources_available([URI("https://example.com/files/file.txt"), URI("https://example.com/missing.txt")]) == [
+        True,
+        False,
+    ]
+    assert time.perf_counter() - t0 < 1  # no (timing out) network access
+
+
+def test_resolve_doi_offline(offline, mirror_path, bioimageio_cache_path, unet2d_nuclei_broad_base_path, monkeypatch):
+    monkeypatch.setattr(_resolve_source, "get_bioimageio_collection_entries", lambda: {})
+    (mirror_path / "zenodo.org" / "files").mkdir(parents=True)
+    (mirror_path / "zenodo.org" / "files" / "rdf.yaml").write_bytes(
+        (unet2d_nuclei_broad_base_path / "rdf.yaml").read_bytes()
+    )
+    # an expired resolution of a concept doi is used offline
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_DOI_CACHE_TTL", 0)
+    _cache.set_resolved_doi("10.5281/zenodo.100", "https://zenodo.org/files/rdf.yaml", immutable=False)
+
+    data, _, root = resolve_rdf_source("10.5281/zenodo.100")
+    assert data["name"] == "UNet 2D Nuclei Broad"
+
+
+def test_collection_index_offline(offline, mirror_path, bioimageio_cache_path):
+    collection_path = mirror_path / "bioimage-io.github.io" / "collection-bioimage-io" / "collection.json"
+    collection_path.parent.mkdir(parents=True)
+    collection_path.write_text(
+        json.dumps({"collection": [{"id": "10.5281/zenodo.100", "type": "model", "rdf_source": "https://x/rdf.yaml"}]})
+    )
+    _resolve_source.get_bioimageio_collection.cache_clear()
+    _resolve_source.get_bioimageio_collection_entries.cache_clear()
+    try:
+        entries = _resolve_source.get_bioimageio_collection_entries()
+        assert entries is not None
+        assert entries["10.5281/zenodo.100"] == ("model", "https://x/rdf.yaml")
+    finally:
+        _resolve_source.get_bioimageio_collection.cache_clear()
+        _resolve_source.get_bioimageio_collection_entries.cache_clear()
@@ -0,0 +1,114 @@
+import pytest
+from marshmallow import missing
+
+from bioimageio.spec import io_
+from bioimageio.spec.shared import MemoInfo, yaml
+from bioimageio.spec.shared.common import ValidationWarning
+
+
+@pytest.fixture
+def rd_memo():
+    previous = io_.set_rd_memo_size(4)
+    io_.clear_rd_memo()
+    yield
+    io_.set_rd_memo_size(previous)
+    io_.clear_rd_memo()
+
+
+def test_memoized_rdf_file(rd_memo, unet2d_nuclei_broad_base_path):
+    rdf_path = unet2d_nuclei_broad_base_path / "rdf.yaml"
+    first = io_.load_raw_resource_description(rdf_path)
+    assert io_.get_rd_memo_info() == MemoInfo(hits=0, misses=1, maxsize=4, currsize=1)
+
+    first.name = "modified"  # callers cannot corrupt the memo
+    second = io_.load_raw_resource_description(rdf_path)
+    assert second.name == "UNet 2D Nuclei Broad"
+    assert second is not first
+    second.inputs[0].name = "modified"
+    assert io_.load_raw_resource_description(rdf_path).inputs[0].name == "raw"
+    assert io_.get_rd_memo_info() == MemoInfo(hits=2, misses=1, maxsize=4, currsize=1)
+
+
+def test_memo_hits_reemit_warnings(rd_memo, unet2d_nuclei_broad_base_path):
+    from bioimageio.spec import validate
+
+    rdf_path = unet2d_nuclei_broad_base_path / "rdf.yaml"
+    first = validate(rdf_path)
+    assert first["warnings"]
+    second = validate(rdf_path)
+    assert io_.get_rd_memo_info().hits == 1
+    assert second["warnings"] == first["warnings"]
+
+
+def test_memo_key(rd_memo, unet2d_nuclei_broad_base_path, tmp_path):
+    data = yaml.load(unet2d_nuclei_broad_base_path / "rdf.yaml")
+    data["root_path"] = unet2d_nuclei_broad_base_path
+    io_.load_raw_resource_description(data)
+    io_.load_raw_resource_description(dict(data))  # equal content
+    assert io_.get_rd_memo_info().hits == 1
+
+    io_.load_raw_resource_description(data, update_to_format="latest")
+    data["name"] = "changed"
+    assert io_.load_raw_resource_description(data).name == "changed"
+    assert io_.get_rd_memo_info().misses == 3
+
+    rdf_path = tmp_path / "rdf.yaml"
+    data.pop("root_path")
+    yaml.dump(data, rdf_path)
+    assert io_.load_raw_resource_description(rdf_path).name == "changed"
+    data["name"] = "changed again"
+    yaml.dump(data, rdf_path)
+    assert io_.load_raw_resource_description(rdf_path).name == "changed again"
+    assert io_.get_rd_memo_info() == MemoInfo(hits=1, misses=5, maxsize=4, currsize=4)
+
+
+def test_memo_disabled(unet2d_nuclei_broad_base_path):
+    previous = io_.set_rd_memo_size(0)
+    try:
+        io_.load_raw_resource_description(unet2d_nuclei_broad_base_path / "rdf.yaml")
+        io_.load_raw_resource_description(unet2d_nuclei_broad_base_path / "rdf.yaml")
+        assert io_.get_rd_memo_info().currsize == 0
+    finally:
+        io_.set_rd_memo_size(previous)
+
+
+@pytest.fixture
+def rd_disk_cache(bioimageio_cache_path, monkeypatch):
+    from bioimageio.spec.shared import _raw_rd_cache
+
+    monkeypatch.setattr(_raw_rd_cache, "BIOIMAGEIO_RD_DISK_CACHE", True)
+    monkeypatch.setattr(_raw_rd_cache, "_purged", False)
+    io_.clear_rd_memo()
+    yield _raw_rd_cache
+    io_.clear_rd_memo()
+
+
+def test_rd_disk_cache(rd_disk_cache, unet2d_nuclei_broad_base_path, monkeypatch):
+    rdf_path = unet2d_nuclei_broad_base_path / "rdf.yaml"
+    expected = io_.load_raw_resource_description(rdf_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("RDF is resolved and parsed again")
+
+    # a warm start skips parsing, conversion and validation, but still emits the validation warnings
+    with monkeypatch.context() as m, pytest.warns(ValidationWarning, match="pytorch_version"):
+        m.setattr(io_, "resolve_rdf_source_and_type", fail)
+        m.setattr(io_, "get_schema", fail)
+        cached = io_.load_raw_resource_description(rdf_path)
+
+    assert cached == expected
+    assert cached.run_mode is missing  # marshmallow.missing is not copied
+
+
+def test_rd_disk_cache_invalidated_by_spec_version(
+    rd_disk_cache, bioimageio_cache_path, unet2d_nuclei_broad_base_path, monkeypatch
+):
+    rdf_path = unet2d_nuclei_broad_base_path / "rdf.yaml"
+    io_.load_raw_resource_description(rdf_path)
+    assert [p.name for p in (bioimageio_cache_path / "raw_rds").iterdir()] == [rd_disk_cache.__version__]
+
+    monkeypatch.setattr(rd_disk_cache, "__version__", "0.0.0")
+    monkeypatch.setattr(rd_disk_cache, "_purged", False)
+    assert rd_disk_cache.get(io_._get_rd_memo_key(rdf_path, None, True, None)) is None
+    io_.load_raw_resource_description(rdf_path)
+    assert [p.name for p in (bioimageio_cache_path / "raw_rds").iterdir()] == ["0.0.0"]
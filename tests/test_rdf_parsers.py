@@ -0,0 +1,74 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from bioimageio.spec.shared import RDF_PARSERS, _rdf_parsers, parse_rdf, yaml
+
+EXAMPLE_SPECS = Path(__file__).parent / "../example_specs"
+
+
+@pytest.mark.parametrize("parser", [p for p in RDF_PARSERS if p != "json"])
+def test_parsers_agree_on_example_specs(parser):
+    for rdf in EXAMPLE_SPECS.glob("**/*.yaml"):
+        assert parse_rdf(rdf, parser) == yaml.load(rdf), rdf
+
+
+def test_libyaml_resolves_scalars_like_ruamel():
+    content = "\n".join(
+        f"k{i}: {v}"
+        for i, v in enumerate(["yes", "on", "No", "true", "010", "0o10", "0x1f", "-0x1f", "1_000", "1e3", "1:20", "~"])
+    )
+    assert parse_rdf(content, "libyaml") == parse_rdf(content, "ruamel")
+    assert parse_rdf(content, "libyaml")["k0"] == "yes"
+
+
+def test_auto_parser_detects_json(unet2d_nuclei_broad_base_path):
+    data = yaml.load(unet2d_nuclei_broad_base_path / "rdf.yaml")
+    content = json.dumps(data, default=str).encode("utf-8")
+    assert parse_rdf(content, "auto") == parse_rdf(content, "json") == json.loads(content)
+    assert parse_rdf("{a: 1}", "auto") == {"a": 1}  # yaml flow mapping
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError):
+        parse_rdf("a: 1", "unknown")
+
+
+def test_default_parser(monkeypatch):
+    monkeypatch.setattr(_rdf_parsers, "BIOIMAGEIO_RDF_PARSER", "json")
+    with pytest.raises(ValueError):
+        parse_rdf("a: 1")
+
+
+@pytest.mark.parametrize("parser", RDF_PARSERS)
+def test_load_json_rdf(parser, unet2d_nuclei_broad_base_path, tmp_path):
+    from bioimageio.spec import load_raw_resource_description
+
+    package_path = tmp_path / "package"
+    shutil.copytree(unet2d_nuclei_broad_base_path, package_path)
+    data = yaml.load(package_path / "rdf.yaml")
+    rdf_path = package_path / "rdf.json"
+    rdf_path.write_text(json.dumps(data, default=str), encoding="utf-8")
+
+    raw_rd = load_raw_resource_description(rdf_path, rdf_parser=parser)
+    assert raw_rd.name == "UNet 2D Nuclei Broad"
+
+
+@pytest.mark.parametrize("parser", RDF_PARSERS)
+@pytest.mark.parametrize(
+    "content", ["a: 1\nb: 2\na: 3\n", "a:\n  b: 1\n  b: 1\n", '{"a": 1, "b": {"c": 1, "c": 2}}', "- {a: 1, a: 2}"]
+)
+def test_parsers_reject_duplicate_keys(parser, content):
+    if parser == "json" and not content.startswith("{"):
+        pytest.skip("not json")
+
+    with pytest.raises(Exception, match="duplicate key"):
+        parse_rdf(content, parser)
+
+
+@pytest.mark.parametrize("parser", [p for p in RDF_PARSERS if p != "json"])
+def test_parsers_accept_merge_keys(parser):
+    content = "base: &base\n  a: 1\n  b: 2\nderived:\n  <<: *base\n  b: 3\n"
+    assert parse_rdf(content, parser) == {"base": {"a": 1, "b": 2}, "derived": {"a": 1, "b": 3}}
@@ -0,0 +1,174 @@
+import zipfile
+
+import pytest
+
+from bioimageio.spec import load_raw_resource_description
+from bioimageio.spec.commands import validate
+from bioimageio.spec.shared import ZipPath, resolve_rdf_source, resolve_source
+from bioimageio.spec.shared._remote_file import RangeRequestsNotSupported, RemoteFile
+
+
+@pytest.fixture
+def remote_package(unet2d_nuclei_broad_base_path, http_server):
+    package_path = http_server.root / "package.zip"
+    with zipfile.ZipFile(package_path, "w") as zf:
+        for name in [
+            "rdf.yaml",
+            "README.md",
+            "cover0.png",
+            "environment.yaml",
+            "test_input.npy",
+            "test_output.npy",
+            "unet2d.py",
+            "weights.onnx",
+            "weights.pt",
+        ]:
+            zf.write(unet2d_nuclei_broad_base_path / name, name)
+
+    return f"{http_server.url}/package.zip", package_path.stat().st_size
+
+
+def test_remote_file(http_server):
+    content = bytes(range(256)) * 1024
+    (http_server.root / "file.bin").write_bytes(content)
+    f = RemoteFile(f"{http_server.url}/file.bin", block_size=1024)
+    assert f.size == len(content)
+    assert f.read(10) == content[:10]
+    f.seek(-100, 2)
+    assert f.read() == content[-100:]
+    f.seek(100_000)
+    assert f.read(5000) == content[100_000:105_000]
+    assert f.n_bytes_received < len(content) / 2
+
+
+def test_remote_file_changed_on_server(http_server):
+    content = bytes(range(256)) * 1024
+    (http_server.root / "file.bin").write_bytes(content)
+    f = RemoteFile(f"{http_server.url}/file.bin", block_size=1024)
+    (http_server.root / "file.bin").write_bytes(content[::-1] + b"changed")
+    n_bytes_received = f.n_bytes_received
+    with pytest.raises(IOError):
+        f.read(10)
+
+    assert f.n_bytes_received == n_bytes_received  # the full content of the changed file is not read
+
+
+def test_remote_file_without_range_requests(http_server):
+    (http_server.root / "file.bin").write_bytes(b"content")
+    http_server.range_requests = False
+    with pytest.raises(RangeRequestsNotSupported):
+        RemoteFile(f"{http_server.url}/file.bin")
+
+
+def test_resolve_rdf_source_of_remote_package(remote_package, http_server, bioimageio_cache_path):
+    url, package_size = remote_package
+    data, _, root = resolve_rdf_source(url)
+    assert data["name"] == "UNet 2D Nuclei Broad"
+    assert isinstance(root, ZipPath)
+    assert all("Range" in headers for _, _, headers in http_server.requests)
+    assert http_server.bytes_sent < package_size / 10
+
+
+def test_validate_remote_package(remote_package, http_server, bioimageio_cache_path):
+    url, package_size = remote_package
+    summary = validate(url)
+    assert summary["error"] is None, summary["error"]
+    assert http_server.bytes_sent < package_size / 10
+
+
+def test_resolve_member_of_remote_package(
+    remote_package, unet2d_nuclei_broad_base_path, http_server, bioimageio_cache_path
+):
+    url, package_size = remote_package
+    raw_rd = load_raw_resource_description(url, extract_package=False)
+    assert isinstance(raw_rd.root_path, ZipPath)
+    local_path = resolve_source(raw_rd.documentation)
+    assert local_path.read_text() == (unet2d_nuclei_broad_base_path / "README.md").read_text()
+    assert http_server.bytes_sent < package_size / 10
+
+
+def test_load_remote_package_extracts_it(
+    remote_package, unet2d_nuclei_broad_base_path, http_server, bioimageio_cache_path
+):
+    url, package_size = remote_package
+    raw_rd = load_raw_resource_description(url)
+    assert raw_rd.root_path.is_dir()
+    assert raw_rd.weights["onnx"].source.read_bytes() == (unet2d_nuclei_broad_base_path / "weights.onnx").read_bytes()
+
+
+def test_remote_package_without_range_requests(remote_package, http_server, bioimageio_cache_path):
+    url, package_size = remote_package
+    http_server.range_requests = False
+    data, _, root = resolve_rdf_source(url)
+    assert data["name"] == "UNet 2D Nuclei Broad"
+    assert zipfile.is_zipfile(root)  # downloaded package
+    assert http_server.bytes_sent >= package_size
+
+
+def test_aresolve_rdf_source_of_remote_package(remote_package, http_server, bioimageio_cache_path):
+    import asyncio
+
+    from bioimageio.spec.shared import aresolve_rdf_source
+
+    url, package_size = remote_package
+    data, _, root = asyncio.run(aresolve_rdf_source(url))
+    assert data["name"] == "UNet 2D Nuclei Broad"
+    assert isinstance(root, ZipPath)
+    assert http_server.bytes_sent < package_size / 10
+
+
+def test_extract_remote_package_for_weights_priority_order(remote_package, http_server, bioimageio_cache_path):
+    url, _ = remote_package
+    raw_rd = load_raw_resource_description(url, weights_priority_order=["onnx"])
+    assert raw_rd.weights["onnx"].source.exists()
+    assert not raw_rd.weights["torchscript"].source.exists()
+
+    # besides the tail of the package (central directory) no bytes of the unused weights were requested
+    with zipfile.ZipFile(http_server.root / "package.zip") as zf:
+        torchscript_offset = zf.getinfo("weights.pt").header_offset
+
+    ranges = [headers["Range"] for _, _, headers in http_server.requests]
+    assert ranges[0].startswith("bytes=-")
+    assert all(int(r[len("bytes=") :].split("-")[0]) < torchscript_offset for r in ranges[1:])
+
+
+def test_extract_remote_package_completely(remote_package, http_server, bioimageio_cache_path):
+    from bioimageio.spec.io_ import extract_resource_package
+
+    url, package_size = remote_package
+    raw_rd = load_raw_resource_description(url)
+    assert raw_rd.weights["torchscript"].source.exists()
+    assert raw_rd.weights["onnx"].source.exists()
+
+    # the package is downloaded with a single request into the download cache (instead of many range requests)
+    assert [h.get("Range") for _, _, h in http_server.requests].count(None) == 1
+    assert http_server.bytes_sent < 2 * package_size
+    n_requests = len(http_server.requests)
+    assert extract_resource_package(url)[2] == raw_rd.root_path
+    assert len(http_server.requests) == n_requests + 1
+    assert "If-None-Match" in http_server.requests[-1][2]  # the cached package is revalidated only
+
+
+def test_aload_remote_package_downloads_it_without_blocking(
+    remote_package, unet2d_nuclei_broad_base_path, http_server, bioimageio_cache_path, monkeypatch
+):
+    import asyncio
+
+    from bioimageio.spec import aload_raw_resource_description
+    from bioimageio.spec.shared import _resolve_source
+
+    pytest.importorskip("aiohttp")
+    fetch_url = _resolve_source._fetch_url
+    blocking_requests = []
+
+    def record_blocking_requests(uri, *args, **kwargs):
+        blocking_requests.append(str(uri))
+        return fetch_url(uri, *args, **kwargs)
+
+    monkeypatch.setattr(_resolve_source, "_fetch_url", record_blocking_requests)
+    url, package_size = remote_package
+    raw_rd = asyncio.run(aload_raw_resource_description(url))
+    assert raw_rd.weights["onnx"].source.read_bytes() == (unet2d_nuclei_broad_base_path / "weights.onnx").read_bytes()
+    assert [h.get("Range") for _, _, h in http_server.requests].count(None) == 1
+    assert http_server.bytes_sent < 2 * package_size
+    assert url not in blocking_requests  # the package is downloaded with aiohttp and extracted from the download
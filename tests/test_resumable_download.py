@@ -0,0 +1,85 @@
+import hashlib
+
+import pytest
+
+from bioimageio.spec.shared import _cache, _resolve_source, resolve_source
+from bioimageio.spec.shared.raw_nodes import URI
+
+CONTENT = bytes(range(256)) * 400
+
+
+@pytest.fixture
+def weights_url(http_server):
+    (http_server.root / "weights.pt").write_bytes(CONTENT)
+    return f"{http_server.url}/weights.pt"
+
+
+def get_range_starts(http_server):
+    return [int(r[2]["Range"][len("bytes=") : -1]) for r in http_server.requests if "Range" in r[2]]
+
+
+def test_interrupted_download_is_resumed(http_server, bioimageio_cache_path, weights_url):
+    http_server.drop_after = [10_000, 20_000]
+    path = resolve_source(URI(weights_url))
+    assert path.read_bytes() == CONTENT
+    assert path.parent.name == hashlib.sha256(CONTENT).hexdigest()
+    first, second = get_range_starts(http_server)  # (received bytes may not all have been written)
+    assert 0 < first <= 10_000 < second <= first + 20_000
+    assert not list((bioimageio_cache_path / "tmp").glob("*.part*"))
+
+
+def test_partial_download_is_kept_for_later(http_server, bioimageio_cache_path, weights_url, monkeypatch):
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_HTTP_RETRIES", 0)
+    http_server.drop_after = [10_000]
+    with pytest.raises(RuntimeError):
+        resolve_source(URI(weights_url))
+
+    part_path = _cache.get_partial_path(weights_url)
+    n_partial = part_path.stat().st_size
+    assert 0 < n_partial <= 10_000
+    assert part_path.read_bytes() == CONTENT[:n_partial]
+
+    assert resolve_source(URI(weights_url)).read_bytes() == CONTENT
+    assert get_range_starts(http_server) == [n_partial]
+    assert not part_path.exists()
+
+
+def test_resume_falls_back_to_full_download(http_server, bioimageio_cache_path, weights_url, tmp_path):
+    http_server.range_requests = False
+    http_server.drop_after = [10_000]
+    output = tmp_path / "output" / "weights.pt"
+    assert resolve_source(URI(weights_url), output=output).read_bytes() == CONTENT
+    assert len(get_range_starts(http_server)) == 1  # ignored by the server
+    assert not output.with_suffix(".pt.part").exists()
+
+
+def test_changed_content_is_downloaded_completely(http_server, bioimageio_cache_path, weights_url, monkeypatch):
+    monkeypatch.setattr(_resolve_source, "BIOIMAGEIO_HTTP_RETRIES", 0)
+    http_server.drop_after = [10_000]
+    with pytest.raises(RuntimeError):
+        resolve_source(URI(weights_url))
+
+    new_content = CONTENT[::-1]
+    (http_server.root / "weights.pt").write_bytes(new_content)  # new ETag -> 'If-Range' does not match
+    assert resolve_source(URI(weights_url)).read_bytes() == new_content
+
+
+def test_responses_are_released(http_server, bioimageio_cache_path, weights_url, monkeypatch):
+    from bioimageio.spec.shared import CachePolicy
+
+    resolve_source(URI(weights_url))
+    session = _resolve_source.get_session()
+    responses = []
+    get = session.get
+
+    def recording_get(*args, **kwargs):
+        responses.append(get(*args, **kwargs))
+        return responses[-1]
+
+    monkeypatch.setattr(session, "get", recording_get)
+    resolve_source(URI(weights_url), cache_policy=CachePolicy(revalidate=True))  # 304
+    with pytest.raises(RuntimeError):
+        resolve_source(URI(f"{http_server.url}/missing.pt"))  # 404
+
+    assert [r.status_code for r in responses] == [304, 404]
+    assert all(r.raw._connection is None for r in responses)  # connections are returned to the pool
@@ -0,0 +1,61 @@
+import os
+import pathlib
+import time
+
+from bioimageio.spec.shared import yaml
+from bioimageio.spec.shared.common import clear_schema_registry, get_schema
+
+# increase to e.g. 1000 for a more meaningful benchmark
+N_REPEATS = int(os.getenv("BIOIMAGEIO_BENCHMARK_REPEATS", 10))
+
+
+def test_schema_registry_reuses_instances():
+    from bioimageio.spec.model.v0_4.schema import Model
+
+    schema = get_schema("model", "0.4.8")
+    assert isinstance(schema, Model)
+    assert get_schema("model", "0.4.0") is schema
+    assert get_schema("application", "0.2.3") is get_schema("rdf", "0.2.0")
+
+    clear_schema_registry()
+    assert get_schema("model", "0.4.8") is not schema
+
+
+def test_schema_registry_benchmark():
+    from bioimageio.spec import load_raw_resource_description, serialize_raw_resource_description_to_dict
+
+    assert yaml is not None
+    example_models = pathlib.Path(__file__).parent / "../example_specs/models"
+    rdfs = []
+    for rdf_path in sorted(example_models.glob("*/rdf.yaml")):
+        data = yaml.load(rdf_path)
+        data["root_path"] = rdf_path.parent
+        rdfs.append(data)
+
+    def load_all(reset_registry: bool):
+        loaded = []
+        for _ in range(N_REPEATS):
+            for data in rdfs:
+                if reset_registry:
+                    clear_schema_registry()
+
+                loaded.append(load_raw_resource_description(data))
+
+        return loaded
+
+    t0 = time.perf_counter()
+    fresh = load_all(reset_registry=True)
+    t_fresh = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    shared = load_all(reset_registry=False)
+    t_shared = time.perf_counter() - t0
+
+    n_calls = N_REPEATS * len(rdfs)
+    print(
+        f"\nloading {n_calls} model RDFs: {t_fresh / n_calls * 1000:.2f}ms per call with fresh schemas, "
+        f"{t_shared / n_calls * 1000:.2f}ms per call with shared schemas"
+    )
+    assert [serialize_raw_resource_description_to_dict(rd) for rd in fresh] == [
+        serialize_raw_resource_description_to_dict(rd) for rd in shared
+    ]
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from bioimageio.spec.shared import _resolve_source, sources_available
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+@pytest.fixture(autouse=True)
+def url_status_cache(monkeypatch):
+    monkeypatch.setattr(_resolve_source, "_url_status_cache", {})
+
+
+def test_sources_available_local(tmp_path):
+    (tmp_path / "cover.png").write_bytes(b"png")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "README.md").write_text("docs")
+    assert sources_available(
+        ["cover.png", tmp_path / "docs" / "README.md", "missing.png", URI((tmp_path / "cover.png").as_uri())],
+        root_path=tmp_path,
+    ) == [True, True, False, True]
+
+
+def test_sources_available_remote_concurrently(http_server):
+    n_files = 8
+    for i in range(n_files):
+        (http_server.root / f"file{i}.txt").write_text(f"content {i}")
+
+    http_server.delay = 0.5
+    sources = [URI(f"{http_server.url}/file{i}.txt") for i in range(n_files)] + [f"{http_server.url}/missing.txt"]
+    t0 = time.perf_counter()
+    assert sources_available(sources, root_path=http_server.root) == [True] * n_files + [False]
+    assert time.perf_counter() - t0 < (n_files + 1) * http_server.delay / 2
+    assert http_server.max_active > 1
+    assert all(r[0] == "HEAD" for r in http_server.requests)
+
+
+def test_sources_available_memoizes_status_and_redirects(http_server):
+    (http_server.root / "file.txt").write_text("content")
+    http_server.redirects["/a"] = "/b"
+    http_server.redirects["/b"] = "/file.txt"
+    http_server.redirects["/c"] = "/b"
+    assert sources_available([f"{http_server.url}/a", f"{http_server.url}/a"]) == [True, True]
+    assert [r[1] for r in http_server.requests] == ["/a", "/b", "/file.txt"]
+
+    # the redirect chain of /c joins the known chain of /a
+    assert sources_available([f"{http_server.url}/c", f"{http_server.url}/file.txt", f"{http_server.url}/a"]) == [
+        True,
+        True,
+        True,
+    ]
+    assert [r[1] for r in http_server.requests] == ["/a", "/b", "/file.txt", "/c"]
+
+
+def test_sources_available_does_not_memoize_transient_errors(http_server):
+    (http_server.root / "file.txt").write_text("content")
+    http_server.statuses["/file.txt"] = 408
+    assert sources_available([f"{http_server.url}/file.txt"]) == [False]
+
+    del http_server.statuses["/file.txt"]
+    assert sources_available([f"{http_server.url}/file.txt"]) == [True]
+    assert len(http_server.requests) == 2
+
+
+def test_sources_available_unreachable():
+    assert sources_available(["http://127.0.0.1:1/file.txt"]) == [False]
@@ -0,0 +1,48 @@
+import hashlib
+import shutil
+
+import pytest
+
+from bioimageio.spec import load_raw_resource_description
+from bioimageio.spec.model.utils import verify_model_files
+from bioimageio.spec.shared import resolve_source, yaml
+from bioimageio.spec.shared.raw_nodes import URI
+
+
+@pytest.fixture
+def model_with_remote_weights(unet2d_nuclei_broad_base_path, http_server, tmp_path):
+    model_dir = tmp_path / "model"
+    shutil.copytree(unet2d_nuclei_broad_base_path, model_dir)
+    weights_content = b"pytorch state dict"
+    (http_server.root / "weights.torch").write_bytes(weights_content)
+    data = yaml.load(model_dir / "rdf.yaml")
+    data["weights"]["pytorch_state_dict"]["source"] = f"{http_server.url}/weights.torch"
+    data["weights"]["pytorch_state_dict"]["sha256"] = hashlib.sha256(weights_content).hexdigest()
+    data["weights"]["onnx"]["sha256"] = hashlib.sha256((model_dir / "weights.onnx").read_bytes()).hexdigest()
+    yaml.dump(data, model_dir / "rdf.yaml")
+    return model_dir / "rdf.yaml"
+
+
+def test_download_with_unexpected_sha256_is_rejected(http_server, bioimageio_cache_path):
+    (http_server.root / "weights.pt").write_bytes(b"weights")
+    url = URI(f"{http_server.url}/weights.pt")
+    with pytest.raises(RuntimeError, match="expected"):
+        resolve_source(url, sha256=hashlib.sha256(b"other weights").hexdigest())
+
+    assert not list(bioimageio_cache_path.glob("blobs/*/*"))
+    assert resolve_source(url, sha256=hashlib.sha256(b"weights").hexdigest()).read_bytes() == b"weights"
+
+
+def test_verify_model_files(model_with_remote_weights, bioimageio_cache_path):
+    raw_model = load_raw_resource_description(model_with_remote_weights)
+    verify_model_files(raw_model)
+
+    (model_with_remote_weights.parent / "weights.pt").write_bytes(b"corrupted")
+    (model_with_remote_weights.parent / "unet2d.py").write_text("# modified")
+    with pytest.raises(ValueError) as e:
+        verify_model_files(raw_model)
+
+    assert "weights.torchscript.source" in str(e.value)
+    assert "weights.pytorch_state_dict.architecture" in str(e.value)
+    assert "weights.pytorch_state_dict.source" not in str(e.value)
+    assert "weights.onnx.source" not in str(e.value)
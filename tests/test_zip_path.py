@@ -0,0 +1,190 @@
+import hashlib
+import multiprocessing
+import pathlib
+import zipfile
+
+import pytest
+
+from bioimageio.spec import load_raw_resource_description, serialize_raw_resource_description_to_dict
+from bioimageio.spec.commands import validate
+from bioimageio.spec.shared import ZipPath, resolve_source, source_available, sources_available, yaml
+
+
+def write_model_package(package_path, base_path, update_weights=None):
+    """zip the unet2d_nuclei_broad model with its weights in a 'weights' folder"""
+    data = yaml.load(base_path / "rdf.yaml")
+    weights = data["weights"]
+    for wf in ("onnx", "torchscript"):
+        weights[wf]["sha256"] = hashlib.sha256((base_path / weights[wf]["source"]).read_bytes()).hexdigest()
+        weights[wf]["source"] = f"weights/{weights[wf]['source']}"
+
+    weights["pytorch_state_dict"]["architecture_sha256"] = hashlib.sha256(
+        (base_path / "unet2d.py").read_bytes()
+    ).hexdigest()
+    for wf, update in (update_weights or {}).items():
+        weights[wf].update(update)
+
+    with zipfile.ZipFile(package_path, "w") as zf:
+        with zf.open("rdf.yaml", "w") as f:
+            yaml.dump(data, f)
+
+        for name in ["README.md", "cover0.png", "environment.yaml", "test_input.npy", "test_output.npy", "unet2d.py"]:
+            zf.write(base_path / name, name)
+
+        zf.write(base_path / "weights.onnx", "weights/weights.onnx")
+        zf.write(base_path / "weights.pt", "weights/weights.pt")
+
+    return package_path
+
+
+@pytest.fixture
+def model_package(unet2d_nuclei_broad_base_path, tmp_path):
+    return write_model_package(tmp_path / "package.zip", unet2d_nuclei_broad_base_path)
+
+
+def test_zip_path(model_package):
+    root = ZipPath(model_package)
+    assert root.is_dir()
+    assert (root / "weights").is_dir()  # implicit directory
+    assert (root / "weights" / "weights.onnx").is_file()
+    assert (root / "weights/weights.onnx").parent == root / "weights"
+    assert (root / "weights/weights.onnx").suffix == ".onnx"
+    assert not (root / "missing.npy").exists()
+    with pytest.raises(FileNotFoundError):
+        (root / "missing.npy").read_bytes()
+
+    with pytest.raises(ValueError):
+        (root / "README.md").open("w")
+
+
+def test_load_package_without_extraction(model_package, unet2d_nuclei_broad_base_path, bioimageio_cache_path):
+    raw_rd = load_raw_resource_description(model_package, extract_package=False)
+    assert isinstance(raw_rd.root_path, ZipPath)
+    onnx_source = raw_rd.weights["onnx"].source
+    assert isinstance(onnx_source, ZipPath)
+    assert onnx_source.read_bytes() == (unet2d_nuclei_broad_base_path / "weights.onnx").read_bytes()
+    assert not (bioimageio_cache_path / "extracted_packages").exists()
+
+    # relative paths are restored on serialization
+    serialized = serialize_raw_resource_description_to_dict(raw_rd, convert_absolute_paths=True)
+    assert serialized["weights"]["onnx"]["source"] == "weights/weights.onnx"
+    assert serialized["test_inputs"] == ["test_input.npy"]
+
+
+def test_resolve_source_materializes_single_member(model_package, unet2d_nuclei_broad_base_path, bioimageio_cache_path):
+    raw_rd = load_raw_resource_description(model_package, extract_package=False)
+    local_path = resolve_source(raw_rd.test_inputs[0])
+    assert local_path.read_bytes() == (unet2d_nuclei_broad_base_path / "test_input.npy").read_bytes()
+    extracted = [p.name for p in (bioimageio_cache_path / "extracted_packages").glob("*/**/*") if p.is_file()]
+    assert extracted == ["test_input.npy"]
+
+    # relative paths are resolved against the virtual root
+    assert resolve_source("test_input.npy", root_path=raw_rd.root_path) == local_path
+
+
+def test_sources_available_in_package(model_package):
+    root = ZipPath(model_package)
+    assert source_available(root / "cover0.png", root_path=root)
+    assert sources_available(["cover0.png", "weights/weights.pt", "missing.png"], root_path=root) == [True, True, False]
+
+
+def test_validate_package_without_extraction(model_package, bioimageio_cache_path):
+    summary = validate(model_package, check_file_hashes=True)
+    assert summary["error"] is None, summary["error"]
+    assert not (bioimageio_cache_path / "extracted_packages").exists()
+
+
+def test_validate_package_with_unexpected_sha256(unet2d_nuclei_broad_base_path, tmp_path, bioimageio_cache_path):
+    package_path = write_model_package(
+        tmp_path / "package.zip", unet2d_nuclei_broad_base_path, update_weights={"onnx": {"sha256": "0" * 64}}
+    )
+    summary = validate(package_path, check_file_hashes=True)
+    assert list(summary["error"]["weights"]) == ["onnx"]
+
+
+def test_extract_package_for_weights_priority_order(
+    model_package, unet2d_nuclei_broad_base_path, bioimageio_cache_path
+):
+    raw_rd = load_raw_resource_description(model_package, weights_priority_order=["onnx"])
+    extracted = sorted(p.relative_to(raw_rd.root_path).as_posix() for p in raw_rd.root_path.glob("**/*") if p.is_file())
+    assert extracted == [
+        "README.md",
+        "cover0.png",
+        "rdf.yaml",
+        "test_input.npy",
+        "test_output.npy",
+        "weights/weights.onnx",
+    ]
+
+    # other weights are extracted when they are resolved
+    torchscript_source = raw_rd.weights["torchscript"].source
+    assert not torchscript_source.exists()
+    local_path = resolve_source(torchscript_source)
+    assert local_path == torchscript_source
+    assert local_path.read_bytes() == (unet2d_nuclei_broad_base_path / "weights.pt").read_bytes()
+
+
+def test_lazily_extracted_package_is_kept_open_while_in_use(model_package, bioimageio_cache_path):
+    import gc
+
+    from bioimageio.spec.io_ import clear_rd_memo, set_rd_memo_size
+    from bioimageio.spec.shared import _zip_path
+
+    previous_memo_size = set_rd_memo_size(8)
+    try:
+        raw_rd = load_raw_resource_description(model_package, weights_priority_order=["onnx"])
+        memo_hit = load_raw_resource_description(model_package, weights_priority_order=["onnx"])
+        root = raw_rd.root_path
+        torchscript_source = raw_rd.weights["torchscript"].source
+        del raw_rd
+        gc.collect()
+        assert resolve_source(memo_hit.weights["torchscript"].source).exists()
+
+        del memo_hit
+        clear_rd_memo()
+        gc.collect()
+        assert root not in _zip_path._lazily_extracted_packages
+        assert _zip_path.get_package_member(torchscript_source) is None
+    finally:
+        set_rd_memo_size(previous_memo_size)
+
+
+def test_extract_package_completely(model_package, bioimageio_cache_path):
+    raw_rd = load_raw_resource_description(model_package)
+    assert raw_rd.weights["torchscript"].source.exists()
+    assert (raw_rd.root_path / "unet2d.py").exists()
+
+
+def test_extracted_packages_are_keyed_by_content(unet2d_nuclei_broad_base_path, tmp_path, bioimageio_cache_path):
+    package_path = write_model_package(tmp_path / "package.zip", unet2d_nuclei_broad_base_path)
+    extracted = load_raw_resource_description(package_path).root_path
+
+    # identical content at another path is extracted only once
+    copied_package_path = tmp_path / "copy.zip"
+    copied_package_path.write_bytes(package_path.read_bytes())
+    assert load_raw_resource_description(copied_package_path).root_path == extracted
+
+    # changed content at the same path is extracted anew
+    write_model_package(package_path, unet2d_nuclei_broad_base_path, update_weights={"onnx": {"opset_version": 11}})
+    raw_rd = load_raw_resource_description(package_path)
+    assert raw_rd.root_path != extracted
+    assert raw_rd.weights["onnx"].opset_version == 11
+
+
+def _extract_in_process(package_path: str, cache_path: str):
+    from bioimageio.spec.shared import _cache
+
+    _cache.BIOIMAGEIO_CACHE_PATH = pathlib.Path(cache_path)
+    raw_rd = load_raw_resource_description(package_path)
+    return str(raw_rd.root_path), (raw_rd.root_path / "weights/weights.onnx").stat().st_ino
+
+
+def test_concurrent_processes_extract_package_once(model_package, bioimageio_cache_path):
+    n_processes = 4
+    with multiprocessing.get_context("spawn").Pool(n_processes) as pool:
+        results = pool.starmap(_extract_in_process, [(str(model_package), str(bioimageio_cache_path))] * n_processes)
+
+    assert len(set(results)) == 1  # same extraction directory and the same (not replaced) files
+    assert len(list((bioimageio_cache_path / "extracted_packages").iterdir())) == 1
+    assert not list((bioimageio_cache_path / "locks").iterdir())
+    assert not list((bioimageio_cache_path / "tmp").iterdir())